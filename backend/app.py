@@ -1,3 +1,4 @@
+import logging
 from flask import Flask
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
@@ -7,6 +8,17 @@ from routes.society_routes import society_bp
 from routes.form_routes import form_bp
 from routes.application_routes import application_bp
 from routes.admin_routes import admin_bp
+from routes.health_routes import health_bp
+from utils.json_provider import FastJSONProvider
+from utils.structured_logging import init_logging
+from utils.compression import init_compression
+from utils.assets import init_assets
+from utils.metrics import init_metrics
+from utils.profiler import init_profiler
+from utils.slow_queries import init_slow_query_log
+from utils.sampling_profiler import init_sampling_profiler
+from utils.tracing import init_tracing
+from utils.events import init_events
 
 app = Flask(__name__, 
             template_folder='../frontend/templates',
@@ -16,6 +28,36 @@ app = Flask(__name__,
 app.config['JWT_SECRET_KEY'] = 'your-secret-key-change-in-production'
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 86400  # 24 hours
 
+# JSON-lines logging through a background queue, with request ids (LOG_* config)
+init_logging(app)
+
+# Serialise datetimes/dates/Decimals natively (ISO-8601) in one pass
+app.json = FastJSONProvider(app)
+
+# gzip/brotli/zstd for large responses (COMPRESS_* config), pre-compressed static files
+init_compression(app)
+
+# asset_url() for templates: fingerprinted URLs from the asset build manifest
+init_assets(app)
+
+# Prometheus-style metrics at /metrics (request latency, queries, connections, caches)
+init_metrics(app)
+
+# Per-request SQL profile + N+1 detection (QUERY_PROFILER / COLLEXO_QUERY_PROFILER=1)
+init_profiler(app)
+
+# Log + EXPLAIN statements slower than SLOW_QUERY_MS (COLLEXO_SLOW_QUERY_MS, default 200)
+init_slow_query_log(app)
+
+# cProfile/tracemalloc for sampled or signed (X-Collexo-Profile) requests, written to PROFILE_DIR
+init_sampling_profiler(app)
+
+# Spans for requests, auth, controllers, models and SQL (TRACING / COLLEXO_TRACING = memory|file)
+init_tracing(app)
+
+# Pub/sub behind the SSE streams (EVENTS_BACKEND / COLLEXO_EVENTS_BACKEND = local or a redis:// URL)
+init_events(app)
+
 # Initialize extensions
 jwt = JWTManager(app)
 CORS(app, resources={
@@ -30,12 +72,17 @@ CORS(app, resources={
 # Initialize database (creates DB, tables, and seeds data if needed)
 init_database()
 
+# Pick up report jobs queued before a restart
+from utils.job_runner import job_runner
+job_runner.resume_queued()
+
 # Register blueprints
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(society_bp, url_prefix='/api/societies')
 app.register_blueprint(form_bp, url_prefix='/api/forms')
 app.register_blueprint(application_bp, url_prefix='/api/applications')
 app.register_blueprint(admin_bp, url_prefix='/api/admin')
+app.register_blueprint(health_bp)
 
 # Root route
 @app.route('/')
@@ -78,10 +125,6 @@ def admin_dashboard():
     return render_template('admin/dashboard.html')
 
 if __name__ == '__main__':
-    print("=" * 60)
-    print("🚀 ColleXo Backend Starting...")
-    print("=" * 60)
-    print("📍 Server: http://localhost:5000")
-    print("📊 Database: MySQL (localhost:3306)")
-    print("=" * 60)
+    logging.getLogger(__name__).info("ColleXo backend starting", extra={
+        'server': 'http://localhost:5000', 'database': 'MySQL (localhost:3306)'})
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,40 @@
+import statistics
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.db import DB_CONFIG
+import mysql.connector
+
+BENCH_DB_NAME = 'collexo_bench'
+
+def scratch_connection():
+    """Connect to a throwaway benchmark database (created if missing)"""
+    connection = mysql.connector.connect(**DB_CONFIG)
+    cursor = connection.cursor()
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS {BENCH_DB_NAME}")
+    cursor.execute(f"USE {BENCH_DB_NAME}")
+    cursor.close()
+    return connection
+
+def measure(fn, repeat):
+    """Call fn repeat times and return per-call latencies in milliseconds"""
+    latencies = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def summarize(latencies):
+    """Return mean/p50/p95 of a latency list (ms)"""
+    ordered = sorted(latencies)
+    return {
+        'mean': statistics.fmean(ordered),
+        'p50': ordered[len(ordered) // 2],
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    }
+
+def print_row(label, stats, unit='ms'):
+    """Print one aligned result line"""
+    print(f"  {label:<32} mean {stats['mean']:8.3f}{unit}   p50 {stats['p50']:8.3f}{unit}   p95 {stats['p95']:8.3f}{unit}")
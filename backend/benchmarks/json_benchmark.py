@@ -0,0 +1,76 @@
+"""
+Serialisation cost of a 1,000-row application listing: the old per-row
+.isoformat() loop + Flask's default encoder vs FastJSONProvider.
+
+Usage: python benchmarks/json_benchmark.py [--rows 1000] [--repeat 200]
+Needs no database.
+"""
+import argparse
+import copy
+import json
+import random
+import sys
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from bench_utils import measure, summarize, print_row
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from utils.json_provider import FastJSONProvider, orjson
+
+def make_rows(count):
+    """Rows shaped like Application.get_by_society results"""
+    now = datetime.now()
+    return [{
+        'application_id': i,
+        'user_id': random.randint(1, 5000),
+        'society_id': 3,
+        'form_id': 7,
+        'application_date': date.today() - timedelta(days=i % 30),
+        'status': random.choice(['pending', 'shortlisted', 'accepted', 'rejected']),
+        'submitted_at': now - timedelta(minutes=i * 7),
+        'user_name': f'Student {i}',
+        'user_email': f'student{i}@college.edu',
+        'form_title': 'Tech Club Recruitment 2025'
+    } for i in range(count)]
+
+def run(row_count, repeat):
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+    rows = make_rows(row_count)
+    stats = {'total': Decimal(row_count), 'pending': Decimal(row_count // 4)}
+
+    def legacy(i):
+        # Old controller path: copy rows, convert dates per row, then encode
+        applications = copy.copy(rows)
+        converted = []
+        for app_row in applications:
+            app_row = dict(app_row)
+            app_row['application_date'] = app_row['application_date'].isoformat()
+            app_row['submitted_at'] = app_row['submitted_at'].isoformat()
+            converted.append(app_row)
+        payload = {'applications': converted, 'statistics': {k: int(v) for k, v in stats.items()}}
+        default_provider.dumps(payload).encode('utf-8')
+
+    def stdlib_fallback(i):
+        payload = {'applications': rows, 'statistics': stats}
+        json.dumps(payload, default=FastJSONProvider.default).encode('utf-8')
+
+    def fast(i):
+        payload = {'applications': rows, 'statistics': stats}
+        fast_provider.dumps_bytes(payload)
+
+    print(f"\nSerialising {row_count} application rows ({repeat} runs each, orjson={'yes' if orjson else 'no'})")
+    print("=" * 60)
+    print_row("per-row isoformat + default", summarize(measure(legacy, repeat)))
+    print_row("stdlib fallback (no loop)", summarize(measure(stdlib_fallback, repeat)))
+    print_row("FastJSONProvider", summarize(measure(fast, repeat)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
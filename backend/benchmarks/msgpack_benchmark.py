@@ -0,0 +1,47 @@
+"""
+Payload size and encode/decode cost of an application listing as JSON
+(FastJSONProvider) vs MessagePack (utils.responses.pack).
+
+Usage: python benchmarks/msgpack_benchmark.py [--rows 1000] [--repeat 200]
+Needs no database.
+"""
+import argparse
+import gzip
+import json
+import sys
+import os
+from decimal import Decimal
+from bench_utils import measure, summarize, print_row
+from json_benchmark import make_rows
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flask import Flask
+from utils.json_provider import FastJSONProvider, orjson
+from utils.responses import pack, msgpack
+
+def run(row_count, repeat):
+    provider = FastJSONProvider(Flask(__name__))
+    payload = {
+        'applications': make_rows(row_count),
+        'statistics': {'total': Decimal(row_count), 'pending': Decimal(row_count // 4)},
+        'pagination': {'page': 1, 'per_page': row_count, 'total': row_count, 'pages': 1}
+    }
+
+    json_body = provider.dumps_bytes(payload)
+    msgpack_body = pack(payload)
+    assert msgpack.unpackb(msgpack_body) == json.loads(json_body), 'schemas differ'
+
+    print(f"\nEncoding {row_count} application rows ({repeat} runs each, orjson={'yes' if orjson else 'no'})")
+    print("=" * 60)
+    print(f"  {'JSON bytes':<32} {len(json_body):10d}   gzip {len(gzip.compress(json_body)):10d}")
+    print(f"  {'MessagePack bytes':<32} {len(msgpack_body):10d}   gzip {len(gzip.compress(msgpack_body)):10d}")
+    print_row("JSON encode", summarize(measure(lambda i: provider.dumps_bytes(payload), repeat)))
+    print_row("MessagePack encode", summarize(measure(lambda i: pack(payload), repeat)))
+    print_row("JSON decode", summarize(measure(lambda i: provider.loads(json_body), repeat)))
+    print_row("MessagePack decode", summarize(measure(lambda i: msgpack.unpackb(msgpack_body), repeat)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,140 @@
+"""
+Compare EAV (application_responses rows) and JSON (applications.responses_json)
+storage for application answers: row counts, insert latency and read latency.
+
+Usage: python benchmarks/response_storage_benchmark.py [--applications 2000] [--questions 20]
+Runs against the scratch database defined in bench_utils (never the app database).
+"""
+import argparse
+import json
+import random
+from datetime import date
+from bench_utils import scratch_connection, measure, summarize, print_row
+
+def setup_tables(cursor, question_count):
+    """Recreate the benchmark tables with one form of question_count questions"""
+    cursor.execute("DROP TABLE IF EXISTS bench_responses")
+    cursor.execute("DROP TABLE IF EXISTS bench_applications")
+    cursor.execute("DROP TABLE IF EXISTS bench_questions")
+    cursor.execute("""
+        CREATE TABLE bench_questions (
+            question_id INT AUTO_INCREMENT PRIMARY KEY,
+            form_id INT NOT NULL,
+            question_text TEXT NOT NULL,
+            question_type VARCHAR(20) DEFAULT 'text',
+            order_index INT DEFAULT 0,
+            INDEX (form_id)
+        ) ENGINE=InnoDB
+    """)
+    cursor.execute("""
+        CREATE TABLE bench_applications (
+            application_id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT NOT NULL,
+            form_id INT NOT NULL,
+            application_date DATE NOT NULL,
+            status VARCHAR(20) DEFAULT 'pending',
+            responses_json JSON NULL
+        ) ENGINE=InnoDB
+    """)
+    cursor.execute("""
+        CREATE TABLE bench_responses (
+            response_id INT AUTO_INCREMENT PRIMARY KEY,
+            application_id INT NOT NULL,
+            question_id INT NOT NULL,
+            response_text TEXT,
+            INDEX (application_id)
+        ) ENGINE=InnoDB
+    """)
+    cursor.executemany(
+        "INSERT INTO bench_questions (form_id, question_text, order_index) VALUES (1, %s, %s)",
+        [(f"Question {i}?", i) for i in range(question_count)]
+    )
+    cursor.execute("SELECT question_id FROM bench_questions ORDER BY question_id")
+    return [row[0] for row in cursor.fetchall()]
+
+def make_answers(question_ids):
+    """Random answers of realistic length"""
+    return {qid: "lorem ipsum " * random.randint(1, 20) for qid in question_ids}
+
+def run(application_count, question_count):
+    connection = scratch_connection()
+    cursor = connection.cursor()
+    question_ids = setup_tables(cursor, question_count)
+    connection.commit()
+    answers = [make_answers(question_ids) for _ in range(application_count)]
+
+    def insert_eav(i):
+        cursor.execute(
+            "INSERT INTO bench_applications (user_id, form_id, application_date) VALUES (%s, 1, %s)",
+            (i, date.today()))
+        application_id = cursor.lastrowid
+        cursor.executemany(
+            "INSERT INTO bench_responses (application_id, question_id, response_text) VALUES (%s, %s, %s)",
+            [(application_id, qid, text) for qid, text in answers[i].items()])
+        connection.commit()
+
+    def insert_json(i):
+        document = {str(qid): text for qid, text in answers[i].items()}
+        cursor.execute(
+            "INSERT INTO bench_applications (user_id, form_id, application_date, responses_json) VALUES (%s, 1, %s, %s)",
+            (i, date.today(), json.dumps(document)))
+        connection.commit()
+
+    eav_insert = measure(insert_eav, application_count)
+    eav_ids = list(range(1, application_count + 1))
+    json_insert = measure(insert_json, application_count)
+    json_ids = list(range(application_count + 1, 2 * application_count + 1))
+
+    cursor.execute("SELECT COUNT(*) FROM bench_responses")
+    eav_rows = application_count + cursor.fetchone()[0]
+    json_rows = application_count
+
+    read_cursor = connection.cursor(dictionary=True)
+
+    def read_eav(i):
+        application_id = random.choice(eav_ids)
+        read_cursor.execute("SELECT * FROM bench_applications WHERE application_id = %s", (application_id,))
+        read_cursor.fetchone()
+        read_cursor.execute("""
+            SELECT r.*, q.question_text, q.question_type
+            FROM bench_responses r
+            JOIN bench_questions q ON r.question_id = q.question_id
+            WHERE r.application_id = %s
+            ORDER BY q.order_index, q.question_id
+        """, (application_id,))
+        read_cursor.fetchall()
+
+    def read_json(i):
+        application_id = random.choice(json_ids)
+        read_cursor.execute("SELECT * FROM bench_applications WHERE application_id = %s", (application_id,))
+        row = read_cursor.fetchone()
+        document = json.loads(row['responses_json'])
+        read_cursor.execute("""
+            SELECT question_id, question_text, question_type FROM bench_questions
+            WHERE form_id = 1 ORDER BY order_index, question_id
+        """)
+        [(q, document.get(str(q['question_id']))) for q in read_cursor.fetchall()]
+
+    reads = min(application_count, 2000)
+    eav_read = measure(read_eav, reads)
+    json_read = measure(read_json, reads)
+
+    print(f"\n{application_count} applications x {question_count} questions")
+    print("=" * 60)
+    print(f"  rows stored (EAV)                {eav_rows}")
+    print(f"  rows stored (JSON)               {json_rows}")
+    print_row("insert per application (EAV)", summarize(eav_insert))
+    print_row("insert per application (JSON)", summarize(json_insert))
+    print_row("detail read (EAV)", summarize(eav_read))
+    print_row("detail read (JSON)", summarize(json_read))
+
+    read_cursor.close()
+    cursor.close()
+    connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--applications', type=int, default=2000)
+    parser.add_argument('--questions', type=int, default=20)
+    args = parser.parse_args()
+    run(args.applications, args.questions)
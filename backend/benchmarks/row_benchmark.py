@@ -0,0 +1,116 @@
+"""
+Memory and throughput of list reads: dictionary cursors vs typed row objects
+(utils.rows), including JSON encoding of the result.
+
+Usage: python benchmarks/row_benchmark.py [--rows 100000] [--repeat 5] [--no-db]
+Without --no-db it loads rows shaped like Application.get_by_society into
+the scratch database; --no-db builds the cursor tuples in memory instead.
+"""
+import argparse
+import gc
+import random
+import sys
+import os
+import tracemalloc
+from datetime import date, datetime, timedelta
+from itertools import starmap
+from bench_utils import scratch_connection, measure, summarize, print_row
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flask import Flask
+from utils.json_provider import FastJSONProvider
+from utils.rows import row_class, fetch_rows
+
+COLUMNS = ('application_id', 'user_id', 'society_id', 'form_id', 'application_date',
+           'status', 'submitted_at', 'user_name', 'user_email', 'form_title')
+
+def make_tuples(count):
+    now = datetime.now()
+    statuses = ['pending', 'shortlisted', 'accepted', 'rejected']
+    return [(
+        i, random.randint(1, 5000), 3, 7,
+        date.today() - timedelta(days=i % 30),
+        random.choice(statuses),
+        now - timedelta(minutes=i * 7),
+        f'Student {i}', f'student{i}@college.edu', 'Tech Club Recruitment 2025'
+    ) for i in range(count)]
+
+def setup_table(connection, count):
+    cursor = connection.cursor()
+    cursor.execute("DROP TABLE IF EXISTS row_bench")
+    cursor.execute("""
+        CREATE TABLE row_bench (
+            application_id INT PRIMARY KEY, user_id INT, society_id INT, form_id INT,
+            application_date DATE, status VARCHAR(20), submitted_at DATETIME,
+            user_name VARCHAR(255), user_email VARCHAR(255), form_title VARCHAR(255)
+        )
+    """)
+    rows = make_tuples(count)
+    for start in range(0, count, 5000):
+        cursor.executemany(
+            f"INSERT INTO row_bench VALUES ({', '.join(['%s'] * len(COLUMNS))})",
+            rows[start:start + 5000]
+        )
+    connection.commit()
+    cursor.close()
+
+def peak_memory(fn):
+    """Peak traced allocation (MB) while fn builds and holds its result"""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak / (1024 * 1024)
+
+def run(row_count, repeat, use_db):
+    provider = FastJSONProvider(Flask(__name__))
+
+    if use_db:
+        connection = scratch_connection()
+        setup_table(connection, row_count)
+
+        def read_dicts():
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute("SELECT * FROM row_bench")
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+
+        def read_rows():
+            cursor = connection.cursor()
+            cursor.execute("SELECT * FROM row_bench")
+            rows = fetch_rows(cursor)
+            cursor.close()
+            return rows
+    else:
+        tuples = make_tuples(row_count)
+        row_type = row_class(COLUMNS)
+
+        def read_dicts():
+            # What the dictionary cursor does per row
+            return [dict(zip(COLUMNS, row)) for row in tuples]
+
+        def read_rows():
+            return list(starmap(row_type, tuples))
+
+    print(f"\nReading {row_count} rows ({'MySQL' if use_db else 'in-memory tuples'}, {repeat} runs each)")
+    print("=" * 60)
+    print_row("dict rows: read", summarize(measure(lambda i: read_dicts(), repeat)))
+    print_row("typed rows: read", summarize(measure(lambda i: read_rows(), repeat)))
+    print_row("dict rows: read + JSON", summarize(measure(lambda i: provider.dumps_bytes(read_dicts()), repeat)))
+    print_row("typed rows: read + JSON", summarize(measure(lambda i: provider.dumps_bytes(read_rows()), repeat)))
+    print(f"  {'peak memory, dict rows':<32} {peak_memory(read_dicts):8.1f}MB")
+    print(f"  {'peak memory, typed rows':<32} {peak_memory(read_rows):8.1f}MB")
+
+    if use_db:
+        connection.cursor().execute("DROP TABLE IF EXISTS row_bench")
+        connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-db', action='store_true')
+    args = parser.parse_args()
+    run(args.rows, args.repeat, not args.no_db)
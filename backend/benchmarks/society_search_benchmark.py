@@ -0,0 +1,99 @@
+"""
+Latency of the society browse search (FULLTEXT, BOOLEAN MODE with prefix
+matching) at 10k societies, compared with a LIKE '%term%' scan.
+
+Usage: python benchmarks/society_search_benchmark.py [--societies 10000] [--queries 500]
+Runs against the scratch database defined in bench_utils (never the app database).
+"""
+import argparse
+import random
+import sys
+import os
+from bench_utils import scratch_connection, measure, summarize, print_row
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.search import build_search_query
+
+WORDS = ['robotics', 'debate', 'drama', 'music', 'coding', 'chess', 'dance', 'photography',
+         'literature', 'finance', 'quiz', 'astronomy', 'design', 'football', 'cricket',
+         'environment', 'volunteering', 'film', 'poetry', 'entrepreneurship', 'ai', 'gaming']
+CATEGORIES = ['Technical', 'Cultural', 'Sports', 'Literary', 'Social']
+QUERIES = ['robotics', 'debat', 'music dance', 'photo', 'chess club', 'entrepreneur']
+
+def setup_table(cursor, society_count):
+    """Recreate the societies table with the production indexes and fill it"""
+    cursor.execute("DROP TABLE IF EXISTS societies")
+    cursor.execute("""
+        CREATE TABLE societies (
+            society_id INT AUTO_INCREMENT PRIMARY KEY,
+            society_name VARCHAR(255) UNIQUE NOT NULL,
+            tagline VARCHAR(500),
+            description TEXT,
+            category VARCHAR(100),
+            admission_open BOOLEAN DEFAULT TRUE,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FULLTEXT INDEX ft_societies_search (society_name, tagline, description),
+            FULLTEXT INDEX ft_societies_name (society_name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+    rows = []
+    for i in range(society_count):
+        name = f"{random.choice(WORDS).title()} {random.choice(WORDS).title()} Society {i}"
+        tagline = ' '.join(random.sample(WORDS, 3))
+        description = ' '.join(random.choice(WORDS) for _ in range(40))
+        rows.append((name, tagline, description, random.choice(CATEGORIES), random.random() < 0.5))
+    cursor.executemany("""
+        INSERT INTO societies (society_name, tagline, description, category, admission_open)
+        VALUES (%s, %s, %s, %s, %s)
+    """, rows)
+
+def run(society_count, query_count):
+    connection = scratch_connection()
+    cursor = connection.cursor()
+    setup_table(cursor, society_count)
+    connection.commit()
+
+    def fulltext(i, category=None):
+        query = build_search_query(QUERIES[i % len(QUERIES)])
+        where = "MATCH(society_name, tagline, description) AGAINST (%s IN BOOLEAN MODE)"
+        params = [query]
+        if category:
+            where += " AND category = %s"
+            params.append(category)
+        cursor.execute(f"SELECT COUNT(*) FROM societies WHERE {where}", params)
+        cursor.fetchone()
+        cursor.execute(f"""
+            SELECT society_id, society_name,
+                   (MATCH(society_name) AGAINST (%s IN BOOLEAN MODE) * 2 +
+                    MATCH(society_name, tagline, description) AGAINST (%s IN BOOLEAN MODE)) as relevance
+            FROM societies WHERE {where}
+            ORDER BY relevance DESC, created_at DESC
+            LIMIT 10 OFFSET 0
+        """, [query, query] + params)
+        cursor.fetchall()
+
+    def like_scan(i):
+        term = f"%{QUERIES[i % len(QUERIES)].split()[0]}%"
+        where = "(society_name LIKE %s OR tagline LIKE %s OR description LIKE %s)"
+        cursor.execute(f"SELECT COUNT(*) FROM societies WHERE {where}", (term, term, term))
+        cursor.fetchone()
+        cursor.execute(f"""
+            SELECT society_id, society_name FROM societies WHERE {where}
+            ORDER BY created_at DESC LIMIT 10 OFFSET 0
+        """, (term, term, term))
+        cursor.fetchall()
+
+    print(f"\nSociety search at {society_count} societies ({query_count} queries each)")
+    print("=" * 60)
+    print_row("FULLTEXT search", summarize(measure(fulltext, query_count)))
+    print_row("FULLTEXT search + category", summarize(measure(lambda i: fulltext(i, 'Technical'), query_count)))
+    print_row("LIKE scan (baseline)", summarize(measure(like_scan, query_count)))
+
+    cursor.close()
+    connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--societies', type=int, default=10000)
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+    run(args.societies, args.queries)
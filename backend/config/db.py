@@ -1,7 +1,14 @@
+import logging
+import os
+import time
 import mysql.connector
 from mysql.connector import Error
 import bcrypt
 from datetime import datetime, timedelta
+from utils.instrumentation import InstrumentedConnection
+from utils.metrics import DB_CONNECT_LATENCY, DB_CONNECT_ERRORS
+
+logger = logging.getLogger(__name__)
 
 DB_CONFIG = {
     'host': 'localhost',
@@ -11,21 +18,76 @@ DB_CONFIG = {
 
 DB_NAME = 'collexo'
 
+# How application answers are stored:
+#   'eav'  - one application_responses row per answer (default)
+#   'json' - a single applications.responses_json document keyed by question_id
+#            (requires migrations/add_responses_json.py)
+# Reads always understand both layouts.
+RESPONSE_STORAGE = os.environ.get('COLLEXO_RESPONSE_STORAGE', 'eav')
+
+# Tables (and migration-added columns) the code relies on: everything
+# create_tables() makes plus what the migrations add. There is no schema
+# version table, so readiness checks compare this against information_schema.
+REQUIRED_SCHEMA = {
+    'users': (),
+    'societies': (),
+    'forms': (),
+    'form_questions': (),
+    # responses_search_text: FULLTEXT column over JSON answers (migrations/add_search_indexes.py)
+    'applications': ('status_changed_at',) + (
+        ('responses_json', 'responses_search_text') if RESPONSE_STORAGE == 'json' else ()),
+    'application_responses': (),
+    'application_rollups': (),
+    'application_status_history': (),
+    'application_transition_stats': (),
+    'report_jobs': ('heartbeat_at',),
+}
+
+# Migration that adds each table/column create_tables() doesn't (or didn't always) make
+SCHEMA_MIGRATIONS = {
+    'form_questions': 'migrations/add_questions_responses.py',
+    'application_responses': 'migrations/add_questions_responses.py',
+    'applications.status_changed_at': 'migrations/add_status_history.py',
+    'applications.responses_json': 'migrations/add_responses_json.py',
+    'applications.responses_search_text': 'migrations/add_search_indexes.py',
+    'report_jobs.heartbeat_at': 'migrations/add_report_job_heartbeat.py',
+}
+
+def schema_columns(cursor):
+    """{(table, column)} of the REQUIRED_SCHEMA tables that exist"""
+    placeholders = ', '.join(['%s'] * len(REQUIRED_SCHEMA))
+    cursor.execute(f"""
+        SELECT table_name, column_name FROM information_schema.columns
+        WHERE table_schema = %s AND table_name IN ({placeholders})
+    """, [DB_NAME] + list(REQUIRED_SCHEMA))
+    return {(table, column) for table, column in cursor.fetchall()}
+
+def missing_schema(columns):
+    """Required tables and 'table.column's absent from columns"""
+    tables = {table for table, _ in columns}
+    missing = [table for table in REQUIRED_SCHEMA if table not in tables]
+    missing += [f'{table}.{column}' for table, required in REQUIRED_SCHEMA.items() if table in tables
+                for column in required if (table, column) not in columns]
+    return missing
+
 def get_connection(include_db=True):
-    """Get MySQL connection with dictionary cursor"""
+    """Get MySQL connection (instrumented: statements are timed and reported to query hooks)"""
     try:
         config = DB_CONFIG.copy()
         if include_db:
             config['database'] = DB_NAME
+        start = time.perf_counter()
         connection = mysql.connector.connect(**config)
-        return connection
+        DB_CONNECT_LATENCY.observe(time.perf_counter() - start)
+        return InstrumentedConnection(connection)
     except Error as e:
-        print(f"Error connecting to MySQL: {e}")
+        DB_CONNECT_ERRORS.inc()
+        logger.error("Error connecting to MySQL: %s", e)
         return None
 
 def init_database():
     """Initialize database, tables, and seed data"""
-    print("\n🔧 Initializing Database...")
+    logger.info("Initializing database")
     
     # Step 1: Create database if not exists
     connection = get_connection(include_db=False)
@@ -33,10 +95,10 @@ def init_database():
         cursor = connection.cursor()
         try:
             cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}")
-            print(f"✅ Database '{DB_NAME}' ready")
+            logger.info("Database %s ready", DB_NAME)
             connection.commit()
         except Error as e:
-            print(f"❌ Error creating database: {e}")
+            logger.error("Error creating database: %s", e)
         finally:
             cursor.close()
             connection.close()
@@ -47,7 +109,40 @@ def init_database():
     # Step 3: Seed initial data
     seed_data()
     
-    print("✅ Database initialization complete!\n")
+    # Step 4: Refuse to start on an existing database missing a migration (writes would fail one by one)
+    verify_schema()
+    
+    logger.info("Database initialization complete")
+
+def verify_schema():
+    """
+    Raise when a column added by a migration is missing from an existing
+    table: the code writes it unconditionally. Missing tables are logged
+    (and fail /readyz) but don't stop a fresh install from starting.
+    """
+    connection = get_connection()
+    if not connection:
+        return
+    
+    cursor = connection.cursor()
+    try:
+        missing = missing_schema(schema_columns(cursor))
+    except Error as e:
+        logger.error("Error checking database schema: %s", e)
+        return
+    finally:
+        cursor.close()
+        connection.close()
+    
+    if missing:
+        migrations = sorted({SCHEMA_MIGRATIONS[name] for name in missing if name in SCHEMA_MIGRATIONS})
+        message = f"Database schema is missing {', '.join(missing)}"
+        if migrations:
+            message += f"; run {', '.join(migrations)}"
+        if any('.' in name for name in missing):
+            logger.critical(message)
+            raise RuntimeError(message)
+        logger.error(message)
 
 def create_tables():
     """Create all required tables in correct order (respecting foreign keys)"""
@@ -69,10 +164,11 @@ def create_tables():
                 user_email VARCHAR(255) UNIQUE NOT NULL,
                 user_password VARCHAR(255) NOT NULL,
                 user_role ENUM('student', 'societyHead', 'admin') NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FULLTEXT INDEX ft_users_name_email (user_name, user_email)
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
         """)
-        print(f"✅ Table 'users' ready")
+        logger.debug("Table %s ready", 'users')
         
         # Create societies table (depends on users)
         cursor.execute("""
@@ -88,10 +184,12 @@ def create_tables():
                 admission_deadline DATE,
                 society_head_id INT,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FULLTEXT INDEX ft_societies_search (society_name, tagline, description),
+                FULLTEXT INDEX ft_societies_name (society_name),
                 FOREIGN KEY (society_head_id) REFERENCES users(user_id) ON DELETE SET NULL
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
         """)
-        print(f"✅ Table 'societies' ready")
+        logger.debug("Table %s ready", 'societies')
         
         # Create forms table (depends on societies)
         cursor.execute("""
@@ -105,7 +203,7 @@ def create_tables():
                 FOREIGN KEY (society_id) REFERENCES societies(society_id) ON DELETE CASCADE
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
         """)
-        print(f"✅ Table 'forms' ready")
+        logger.debug("Table %s ready", 'forms')
         
         # Create applications table (depends on users, societies, and forms)
         cursor.execute("""
@@ -117,16 +215,93 @@ def create_tables():
                 application_date DATE NOT NULL,
                 status ENUM('pending', 'shortlisted', 'accepted', 'rejected') DEFAULT 'pending',
                 submitted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                status_changed_at DATETIME NULL,
                 FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
                 FOREIGN KEY (society_id) REFERENCES societies(society_id) ON DELETE CASCADE,
                 FOREIGN KEY (form_id) REFERENCES forms(form_id) ON DELETE CASCADE
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
         """)
-        print(f"✅ Table 'applications' ready")
+        logger.debug("Table %s ready", 'applications')
+        
+        # Create per-hour/per-day submission rollups (depends on societies and forms)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS application_rollups (
+                society_id INT NOT NULL,
+                form_id INT NOT NULL,
+                granularity ENUM('hour', 'day') NOT NULL,
+                bucket_start DATETIME NOT NULL,
+                status ENUM('pending', 'shortlisted', 'accepted', 'rejected') NOT NULL,
+                application_count INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (society_id, granularity, bucket_start, form_id, status),
+                INDEX idx_rollups_form (form_id, granularity, bucket_start),
+                FOREIGN KEY (society_id) REFERENCES societies(society_id) ON DELETE CASCADE,
+                FOREIGN KEY (form_id) REFERENCES forms(form_id) ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """)
+        logger.debug("Table %s ready", 'application_rollups')
+        
+        # Create append-only status transition log (depends on applications)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS application_status_history (
+                history_id INT AUTO_INCREMENT PRIMARY KEY,
+                application_id INT NOT NULL,
+                society_id INT NOT NULL,
+                form_id INT NOT NULL,
+                from_status ENUM('pending', 'shortlisted', 'accepted', 'rejected') NOT NULL,
+                to_status ENUM('pending', 'shortlisted', 'accepted', 'rejected') NOT NULL,
+                changed_by INT NULL,
+                seconds_in_previous INT NOT NULL DEFAULT 0,
+                changed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                INDEX idx_history_application (application_id, changed_at),
+                INDEX idx_history_society (society_id, form_id, changed_at),
+                FOREIGN KEY (application_id) REFERENCES applications(application_id) ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """)
+        logger.debug("Table %s ready", 'application_status_history')
+        
+        # Create per-transition aggregates for funnel/latency analytics
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS application_transition_stats (
+                society_id INT NOT NULL,
+                form_id INT NOT NULL,
+                from_status ENUM('pending', 'shortlisted', 'accepted', 'rejected') NOT NULL,
+                to_status ENUM('pending', 'shortlisted', 'accepted', 'rejected') NOT NULL,
+                transition_count INT NOT NULL DEFAULT 0,
+                total_seconds BIGINT NOT NULL DEFAULT 0,
+                max_seconds INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (society_id, form_id, from_status, to_status),
+                FOREIGN KEY (society_id) REFERENCES societies(society_id) ON DELETE CASCADE,
+                FOREIGN KEY (form_id) REFERENCES forms(form_id) ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """)
+        logger.debug("Table %s ready", 'application_transition_stats')
+        
+        # Create background report job table (depends on users)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS report_jobs (
+                job_id INT AUTO_INCREMENT PRIMARY KEY,
+                report_type VARCHAR(50) NOT NULL,
+                params TEXT,
+                status ENUM('queued', 'running', 'completed', 'failed', 'cancelled') DEFAULT 'queued',
+                progress TINYINT UNSIGNED DEFAULT 0,
+                cancel_requested BOOLEAN DEFAULT FALSE,
+                requested_by INT NULL,
+                result_path VARCHAR(500) NULL,
+                row_count INT NULL,
+                error TEXT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                started_at DATETIME NULL,
+                heartbeat_at DATETIME NULL,
+                finished_at DATETIME NULL,
+                INDEX idx_report_jobs_status (status, created_at),
+                FOREIGN KEY (requested_by) REFERENCES users(user_id) ON DELETE SET NULL
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """)
+        logger.debug("Table %s ready", 'report_jobs')
         
         connection.commit()
     except Error as e:
-        print(f"❌ Error creating tables: {e}")
+        logger.error("Error creating tables: %s", e)
         connection.rollback()
     finally:
         cursor.close()
@@ -146,10 +321,10 @@ def seed_data():
         user_count = cursor.fetchone()[0]
         
         if user_count > 0:
-            print("ℹ️  Seed data already exists, skipping...")
+            logger.info("Seed data already exists, skipping")
             return
         
-        print("📝 Seeding initial data...")
+        logger.info("Seeding initial data")
         
         # Hash passwords
         admin_password = bcrypt.hashpw('admin123'.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
@@ -182,7 +357,7 @@ def seed_data():
             VALUES (%s, %s, %s, %s)
         """, ('Test Student', 'student@collexo.com', student_password, 'student'))
         
-        print("  ✅ Created 4 users (1 admin, 2 society heads, 1 student)")
+        logger.info("Created 4 users (1 admin, 2 society heads, 1 student)")
         
         # Insert sample societies
         deadline_1 = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
@@ -206,7 +381,7 @@ def seed_data():
               'Cultural', '/static/images/drama-society.png', 32, True, deadline_2, society_head_2_id))
         drama_society_id = cursor.lastrowid
         
-        print("  ✅ Created 2 societies")
+        logger.info("Created 2 societies")
         
         # Insert sample recruitment form
         cursor.execute("""
@@ -214,13 +389,13 @@ def seed_data():
             VALUES (%s, %s, %s, %s)
         """, (tech_club_id, 'Tech Club Recruitment 2025', 'published', datetime.now()))
         
-        print("  ✅ Created 1 recruitment form")
+        logger.info("Created 1 recruitment form")
         
         connection.commit()
-        print("✅ Seed data inserted successfully!")
+        logger.info("Seed data inserted")
         
     except Error as e:
-        print(f"❌ Error seeding data: {e}")
+        logger.error("Error seeding data: %s", e)
         connection.rollback()
     finally:
         cursor.close()
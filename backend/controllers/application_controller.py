@@ -1,8 +1,14 @@
-from models.application import Application
+import logging
+from config.db import get_connection
+from models.application import Application, APPLICATION_COLUMNS, VALID_STATUSES
 from models.form import Form
 from models.society import Society
 from models.user import User
+from utils.tracing import traced_class
 
+logger = logging.getLogger(__name__)
+
+@traced_class
 class ApplicationController:
     @staticmethod
     def create_application(data, user_id):
@@ -40,7 +46,7 @@ class ApplicationController:
             }, 201
             
         except Exception as e:
-            print(f"Create application error: {e}")
+            logger.exception("Create application error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -49,12 +55,6 @@ class ApplicationController:
         try:
             applications, total = Application.get_by_user(user_id, page, per_page)
             
-            for app in applications:
-                if app.get('application_date'):
-                    app['application_date'] = app['application_date'].isoformat()
-                if app.get('submitted_at'):
-                    app['submitted_at'] = app['submitted_at'].isoformat()
-            
             return {
                 'applications': applications,
                 'pagination': {
@@ -66,7 +66,7 @@ class ApplicationController:
             }, 200
             
         except Exception as e:
-            print(f"Get my applications error: {e}")
+            logger.exception("Get my applications error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -83,12 +83,6 @@ class ApplicationController:
             
             applications, total = Application.get_by_society(society_id, page, per_page, status)
             
-            for app in applications:
-                if app.get('application_date'):
-                    app['application_date'] = app['application_date'].isoformat()
-                if app.get('submitted_at'):
-                    app['submitted_at'] = app['submitted_at'].isoformat()
-            
             stats = Application.get_statistics(society_id)
             
             return {
@@ -103,7 +97,7 @@ class ApplicationController:
             }, 200
             
         except Exception as e:
-            print(f"Get society applications error: {e}")
+            logger.exception("Get society applications error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -123,15 +117,10 @@ class ApplicationController:
                 if not society or society['society_head_id'] != user_id:
                     return {'error': 'Unauthorized to view this application'}, 403
             
-            if application.get('application_date'):
-                application['application_date'] = application['application_date'].isoformat()
-            if application.get('submitted_at'):
-                application['submitted_at'] = application['submitted_at'].isoformat()
-            
             return {'application': application}, 200
             
         except Exception as e:
-            print(f"Get application error: {e}")
+            logger.exception("Get application error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -143,8 +132,7 @@ class ApplicationController:
             if not new_status:
                 return {'error': 'Status is required'}, 400
             
-            valid_statuses = ['pending', 'shortlisted', 'accepted', 'rejected']
-            if new_status not in valid_statuses:
+            if new_status not in VALID_STATUSES:
                 return {'error': 'Invalid status'}, 400
             
             application = Application.get_by_id(application_id)
@@ -159,7 +147,7 @@ class ApplicationController:
             elif user_role != 'admin':
                 return {'error': 'Unauthorized to update applications'}, 403
             
-            success = Application.update_status(application_id, new_status)
+            success = Application.update_status(application_id, new_status, user_id)
             
             if not success:
                 return {'error': 'Failed to update application status'}, 500
@@ -172,14 +160,14 @@ class ApplicationController:
             }, 200
             
         except Exception as e:
-            print(f"Update application status error: {e}")
+            logger.exception("Update application status error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
     def get_all_applications(page=1, per_page=20):
         """Get all applications (admin only)"""
         try:
-            connection = Application.get_by_society.__globals__['get_connection']()
+            connection = get_connection()
             if not connection:
                 return {'error': 'Database connection failed'}, 500
             
@@ -190,8 +178,8 @@ class ApplicationController:
             
             offset = (page - 1) * per_page
             
-            cursor.execute("""
-                SELECT a.*,
+            cursor.execute(f"""
+                SELECT {APPLICATION_COLUMNS},
                        u.user_name, u.user_email,
                        s.society_name,
                        f.title as form_title
@@ -205,12 +193,6 @@ class ApplicationController:
             
             applications = cursor.fetchall()
             
-            for app in applications:
-                if app.get('application_date'):
-                    app['application_date'] = app['application_date'].isoformat()
-                if app.get('submitted_at'):
-                    app['submitted_at'] = app['submitted_at'].isoformat()
-            
             cursor.close()
             connection.close()
             
@@ -225,5 +207,5 @@ class ApplicationController:
             }, 200
             
         except Exception as e:
-            print(f"Get all applications error: {e}")
+            logger.exception("Get all applications error")
             return {'error': 'Internal server error'}, 500
@@ -1,7 +1,12 @@
+import logging
 from models.user import User
 from flask_jwt_extended import create_access_token
 from datetime import timedelta
+from utils.tracing import traced_class
 
+logger = logging.getLogger(__name__)
+
+@traced_class
 class AuthController:
     @staticmethod
     def register(data):
@@ -51,7 +56,7 @@ class AuthController:
             }, 201
             
         except Exception as e:
-            print(f"Registration error: {e}")
+            logger.exception("Registration error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -93,7 +98,7 @@ class AuthController:
             }, 200
             
         except Exception as e:
-            print(f"Login error: {e}")
+            logger.exception("Login error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -111,10 +116,10 @@ class AuthController:
                     'user_name': user['user_name'],
                     'user_email': user['user_email'],
                     'user_role': user['user_role'],
-                    'created_at': user['created_at'].isoformat() if user['created_at'] else None
+                    'created_at': user['created_at']
                 }
             }, 200
             
         except Exception as e:
-            print(f"Get profile error: {e}")
+            logger.exception("Get profile error")
             return {'error': 'Internal server error'}, 500
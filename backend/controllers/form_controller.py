@@ -1,6 +1,11 @@
+import logging
 from models.form import Form
 from models.society import Society
+from utils.tracing import traced_class
 
+logger = logging.getLogger(__name__)
+
+@traced_class
 class FormController:
     @staticmethod
     def get_all_forms(page=1, per_page=10):
@@ -8,12 +13,6 @@ class FormController:
         try:
             forms, total = Form.get_published(page, per_page)
             
-            for form in forms:
-                if form.get('created_at'):
-                    form['created_at'] = form['created_at'].isoformat()
-                if form.get('published_at'):
-                    form['published_at'] = form['published_at'].isoformat()
-            
             return {
                 'forms': forms,
                 'pagination': {
@@ -25,7 +24,7 @@ class FormController:
             }, 200
             
         except Exception as e:
-            print(f"Get forms error: {e}")
+            logger.exception("Get forms error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -37,15 +36,10 @@ class FormController:
             if not form:
                 return {'error': 'Form not found'}, 404
             
-            if form.get('created_at'):
-                form['created_at'] = form['created_at'].isoformat()
-            if form.get('published_at'):
-                form['published_at'] = form['published_at'].isoformat()
-            
             return {'form': form}, 200
             
         except Exception as e:
-            print(f"Get form error: {e}")
+            logger.exception("Get form error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -62,16 +56,10 @@ class FormController:
             
             forms = Form.get_by_society(society_id)
             
-            for form in forms:
-                if form.get('created_at'):
-                    form['created_at'] = form['created_at'].isoformat()
-                if form.get('published_at'):
-                    form['published_at'] = form['published_at'].isoformat()
-            
             return {'forms': forms}, 200
             
         except Exception as e:
-            print(f"Get society forms error: {e}")
+            logger.exception("Get society forms error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -107,7 +95,7 @@ class FormController:
             }, 201
             
         except Exception as e:
-            print(f"Create form error: {e}")
+            logger.exception("Create form error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -150,7 +138,7 @@ class FormController:
             }, 200
             
         except Exception as e:
-            print(f"Update form error: {e}")
+            logger.exception("Update form error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -175,5 +163,5 @@ class FormController:
             return {'message': 'Form deleted successfully'}, 200
             
         except Exception as e:
-            print(f"Delete form error: {e}")
+            logger.exception("Delete form error")
             return {'error': 'Internal server error'}, 500
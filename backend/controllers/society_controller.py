@@ -1,6 +1,11 @@
+import logging
 from models.society import Society
 from models.user import User
+from utils.tracing import traced_class
 
+logger = logging.getLogger(__name__)
+
+@traced_class
 class SocietyController:
     @staticmethod
     def get_all_societies(page=1, per_page=10, category=None, admission_open=None):
@@ -8,12 +13,6 @@ class SocietyController:
         try:
             societies, total = Society.get_all(page, per_page, category, admission_open)
             
-            for society in societies:
-                if society.get('created_at'):
-                    society['created_at'] = society['created_at'].isoformat()
-                if society.get('admission_deadline'):
-                    society['admission_deadline'] = society['admission_deadline'].isoformat()
-            
             return {
                 'societies': societies,
                 'pagination': {
@@ -25,7 +24,7 @@ class SocietyController:
             }, 200
             
         except Exception as e:
-            print(f"Get societies error: {e}")
+            logger.exception("Get societies error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -37,15 +36,10 @@ class SocietyController:
             if not society:
                 return {'error': 'Society not found'}, 404
             
-            if society.get('created_at'):
-                society['created_at'] = society['created_at'].isoformat()
-            if society.get('admission_deadline'):
-                society['admission_deadline'] = society['admission_deadline'].isoformat()
-            
             return {'society': society}, 200
             
         except Exception as e:
-            print(f"Get society error: {e}")
+            logger.exception("Get society error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -57,15 +51,10 @@ class SocietyController:
             if not society:
                 return {'error': 'No society found for this user'}, 404
             
-            if society.get('created_at'):
-                society['created_at'] = society['created_at'].isoformat()
-            if society.get('admission_deadline'):
-                society['admission_deadline'] = society['admission_deadline'].isoformat()
-            
             return {'society': society}, 200
             
         except Exception as e:
-            print(f"Get my society error: {e}")
+            logger.exception("Get my society error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -101,7 +90,7 @@ class SocietyController:
             }, 201
             
         except Exception as e:
-            print(f"Create society error: {e}")
+            logger.exception("Create society error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -142,7 +131,7 @@ class SocietyController:
             }, 200
             
         except Exception as e:
-            print(f"Update society error: {e}")
+            logger.exception("Update society error")
             return {'error': 'Internal server error'}, 500
     
     @staticmethod
@@ -165,5 +154,5 @@ class SocietyController:
             return {'message': 'Society deleted successfully'}, 200
             
         except Exception as e:
-            print(f"Delete society error: {e}")
+            logger.exception("Delete society error")
             return {'error': 'Internal server error'}, 500
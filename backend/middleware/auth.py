@@ -1,21 +1,29 @@
 from functools import wraps
-from flask import jsonify
+from flask import g
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
 from models.user import User
+from models.access import Access
+from utils.responses import respond
+from utils.tracing import span
 
 def jwt_required_custom(fn):
     """Decorator to require JWT authentication"""
     @wraps(fn)
     def wrapper(*args, **kwargs):
         try:
-            verify_jwt_in_request()
+            with span('auth.jwt_required'):
+                verify_jwt_in_request()
             return fn(*args, **kwargs)
         except Exception as e:
-            return jsonify({'error': 'Invalid or missing token', 'message': str(e)}), 401
+            return respond({'error': 'Invalid or missing token', 'message': str(e)}), 401
     return wrapper
 
-def role_required(*allowed_roles):
-    """Decorator to require specific user roles"""
+def role_required(*allowed_roles, locations=None):
+    """
+    Decorator to require specific user roles. locations overrides where the
+    token is read from, e.g. ('headers', 'query_string') for EventSource
+    streams, which cannot send an Authorization header.
+    """
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
@@ -25,19 +33,66 @@ def role_required(*allowed_roles):
                 return fn(*args, **kwargs)
             
             try:
-                verify_jwt_in_request()
-                user_id = int(get_jwt_identity())
-                user = User.get_by_id(user_id)
+                with span('auth.role_required', roles=','.join(allowed_roles)):
+                    verify_jwt_in_request(locations=locations)
+                    user_id = int(get_jwt_identity())
+                    user = User.get_by_id(user_id)
                 
                 if not user:
-                    return jsonify({'error': 'User not found'}), 404
+                    return respond({'error': 'User not found'}), 404
                 
                 if user['user_role'] not in allowed_roles:
-                    return jsonify({'error': 'Access denied', 'message': f'Required role: {", ".join(allowed_roles)}'}), 403
+                    return respond({'error': 'Access denied', 'message': f'Required role: {", ".join(allowed_roles)}'}), 403
                 
                 return fn(*args, **kwargs)
             except Exception as e:
-                return jsonify({'error': 'Authentication error', 'message': str(e)}), 401
+                return respond({'error': 'Authentication error', 'message': str(e)}), 401
+        return wrapper
+    return decorator
+
+def society_access_required(resource, roles=('societyHead', 'admin'), allow_owner=False,
+                            message='You are not authorized to access this resource', locations=None):
+    """
+    Decorator requiring the caller to manage the society that owns the
+    <resource>_id URL parameter (resource: society, form or application).
+    Admins pass when allowed by roles; with allow_owner the user who owns
+    the resource (an application's applicant) passes too. Role and ownership
+    come from a single query, and the result is left on g.access.
+    locations overrides where the token is read from, as for role_required.
+    """
+    param = f'{resource}_id'
+    not_found = f'{resource.capitalize()} not found'
+    
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            from flask import request
+            # Skip JWT verification for OPTIONS requests (CORS preflight)
+            if request.method == 'OPTIONS':
+                return fn(*args, **kwargs)
+            
+            with span('auth.society_access_required', resource=resource):
+                try:
+                    verify_jwt_in_request(locations=locations)
+                    user_id = int(get_jwt_identity())
+                except Exception as e:
+                    return respond({'error': 'Authentication error', 'message': str(e)}), 401
+                
+                access = Access.resolve(user_id, resource, kwargs[param])
+            if not access:
+                return respond({'error': 'User not found'}), 404
+            
+            if not allow_owner and access['user_role'] not in roles:
+                return respond({'error': 'Access denied', 'message': f'Required role: {", ".join(roles)}'}), 403
+            
+            if access['society_id'] is None:
+                return respond({'error': not_found}), 404
+            
+            if not Access.can_manage(access, user_id, roles, allow_owner):
+                return respond({'error': message}), 403
+            
+            g.access = dict(access, user_id=user_id)
+            return fn(*args, **kwargs)
         return wrapper
     return decorator
 
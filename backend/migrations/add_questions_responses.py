@@ -38,6 +38,7 @@ def migrate():
                 question_id INT NOT NULL,
                 response_text TEXT,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FULLTEXT INDEX ft_responses_text (response_text),
                 FOREIGN KEY (application_id) REFERENCES applications(application_id) ON DELETE CASCADE,
                 FOREIGN KEY (question_id) REFERENCES form_questions(question_id) ON DELETE CASCADE
             )
@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.db import get_connection, DB_NAME
+
+def migrate():
+    """Add report_jobs.heartbeat_at (last progress write of a running job)"""
+    connection = get_connection()
+    if not connection:
+        print("Failed to connect to database")
+        return False
+    
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = 'report_jobs' AND column_name = 'heartbeat_at'
+        """, (DB_NAME,))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("ALTER TABLE report_jobs ADD COLUMN heartbeat_at DATETIME NULL AFTER started_at")
+            print("✓ Added report_jobs.heartbeat_at column")
+        else:
+            print("✓ report_jobs.heartbeat_at already exists")
+        
+        connection.commit()
+        print("\n✅ Migration completed successfully!")
+        return True
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        connection.rollback()
+        return False
+    finally:
+        cursor.close()
+        connection.close()
+
+if __name__ == "__main__":
+    print("Starting migration: Adding report job heartbeats...")
+    print("=" * 60)
+    migrate()
@@ -0,0 +1,82 @@
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.db import get_connection, DB_NAME
+
+def column_exists(cursor, table, column):
+    """Check information_schema for an existing column"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = %s AND table_name = %s AND column_name = %s
+    """, (DB_NAME, table, column))
+    return cursor.fetchone()[0] > 0
+
+def migrate(backfill=False, index_questions=()):
+    """Add applications.responses_json and optional generated columns for hot questions"""
+    connection = get_connection()
+    if not connection:
+        print("Failed to connect to database")
+        return False
+
+    cursor = connection.cursor()
+
+    try:
+        if not column_exists(cursor, 'applications', 'responses_json'):
+            cursor.execute("ALTER TABLE applications ADD COLUMN responses_json JSON NULL")
+            print("✓ Added applications.responses_json column")
+        else:
+            print("✓ applications.responses_json already exists")
+
+        if backfill:
+            # Copy EAV answers into the JSON document for applications that don't have one yet
+            cursor.execute("""
+                UPDATE applications a
+                JOIN (
+                    SELECT application_id,
+                           JSON_OBJECTAGG(CAST(question_id AS CHAR), response_text) AS document
+                    FROM application_responses
+                    GROUP BY application_id
+                ) r ON r.application_id = a.application_id
+                SET a.responses_json = r.document
+                WHERE a.responses_json IS NULL
+            """)
+            print(f"✓ Backfilled responses_json for {cursor.rowcount} applications")
+
+        for question_id in index_questions:
+            column = f"resp_q{int(question_id)}"
+            if column_exists(cursor, 'applications', column):
+                print(f"✓ Generated column {column} already exists")
+                continue
+            # Virtual generated column + secondary index for frequently filtered answers
+            cursor.execute(f"""
+                ALTER TABLE applications
+                ADD COLUMN {column} VARCHAR(255)
+                    GENERATED ALWAYS AS (JSON_UNQUOTE(JSON_EXTRACT(responses_json, '$."{int(question_id)}"'))) VIRTUAL,
+                ADD INDEX idx_{column} (form_id, {column})
+            """)
+            print(f"✓ Added generated column {column} with index")
+
+        connection.commit()
+        print("\n✅ Migration completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        connection.rollback()
+        return False
+    finally:
+        cursor.close()
+        connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Store application responses as a JSON document")
+    parser.add_argument('--backfill', action='store_true',
+                        help='copy existing application_responses rows into responses_json')
+    parser.add_argument('--index-question', type=int, action='append', default=[],
+                        metavar='QUESTION_ID', help='add an indexed generated column for a question')
+    args = parser.parse_args()
+
+    print("Starting migration: Adding JSON response storage...")
+    print("=" * 60)
+    migrate(args.backfill, args.index_question)
@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.db import get_connection, DB_NAME
+
+# (table, index name, columns)
+FULLTEXT_INDEXES = [
+    ('societies', 'ft_societies_search', 'society_name, tagline, description'),
+    ('societies', 'ft_societies_name', 'society_name'),
+    ('application_responses', 'ft_responses_text', 'response_text'),
+    ('users', 'ft_users_name_email', 'user_name, user_email'),
+]
+
+def column_exists(cursor, table, column):
+    """Check information_schema for an existing column"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = %s AND table_name = %s AND column_name = %s
+    """, (DB_NAME, table, column))
+    return cursor.fetchone()[0] > 0
+
+def index_exists(cursor, table, index_name):
+    """Check information_schema for an existing index"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = %s AND table_name = %s AND index_name = %s
+    """, (DB_NAME, table, index_name))
+    return cursor.fetchone()[0] > 0
+
+def migrate():
+    """Add FULLTEXT indexes used by the search endpoints"""
+    connection = get_connection()
+    if not connection:
+        print("Failed to connect to database")
+        return False
+    
+    cursor = connection.cursor()
+    
+    try:
+        for table, index_name, columns in FULLTEXT_INDEXES:
+            if index_exists(cursor, table, index_name):
+                print(f"✓ Index {index_name} already exists")
+                continue
+            cursor.execute(f"ALTER TABLE {table} ADD FULLTEXT INDEX {index_name} ({columns})")
+            print(f"✓ Created FULLTEXT index {index_name} on {table}({columns})")
+        
+        # JSON response storage: index the answer values through a stored generated column
+        if column_exists(cursor, 'applications', 'responses_json'):
+            if not column_exists(cursor, 'applications', 'responses_search_text'):
+                cursor.execute("""
+                    ALTER TABLE applications
+                    ADD COLUMN responses_search_text LONGTEXT
+                        GENERATED ALWAYS AS (JSON_UNQUOTE(JSON_EXTRACT(responses_json, '$.*'))) STORED
+                """)
+                print("✓ Added applications.responses_search_text column")
+            if not index_exists(cursor, 'applications', 'ft_applications_responses'):
+                cursor.execute("ALTER TABLE applications ADD FULLTEXT INDEX ft_applications_responses (responses_search_text)")
+                print("✓ Created FULLTEXT index ft_applications_responses on applications(responses_search_text)")
+        
+        connection.commit()
+        print("\n✅ Migration completed successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        connection.rollback()
+        return False
+    finally:
+        cursor.close()
+        connection.close()
+
+if __name__ == "__main__":
+    print("Starting migration: Adding full-text search indexes...")
+    print("=" * 60)
+    migrate()
@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.db import get_connection, create_tables, DB_NAME
+
+def migrate():
+    """Add applications.status_changed_at and the status history tables"""
+    connection = get_connection()
+    if not connection:
+        print("Failed to connect to database")
+        return False
+    
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = 'applications' AND column_name = 'status_changed_at'
+        """, (DB_NAME,))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("ALTER TABLE applications ADD COLUMN status_changed_at DATETIME NULL")
+            print("✓ Added applications.status_changed_at column")
+        else:
+            print("✓ applications.status_changed_at already exists")
+        
+        connection.commit()
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        connection.rollback()
+        return False
+    finally:
+        cursor.close()
+        connection.close()
+    
+    # History and aggregate tables use CREATE TABLE IF NOT EXISTS
+    create_tables()
+    print("\n✅ Migration completed successfully!")
+    return True
+
+if __name__ == "__main__":
+    print("Starting migration: Adding application status history...")
+    print("=" * 60)
+    migrate()
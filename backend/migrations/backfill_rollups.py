@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.db import get_connection, create_tables
+
+def backfill():
+    """Rebuild application_rollups from the applications table"""
+    connection = get_connection()
+    if not connection:
+        print("Failed to connect to database")
+        return False
+    
+    cursor = connection.cursor()
+    
+    try:
+        cursor.execute("DELETE FROM application_rollups")
+        
+        cursor.execute("""
+            INSERT INTO application_rollups (society_id, form_id, granularity, bucket_start, status, application_count)
+            SELECT society_id, form_id, 'day', TIMESTAMP(DATE(submitted_at)), status, COUNT(*)
+            FROM applications
+            GROUP BY society_id, form_id, DATE(submitted_at), status
+        """)
+        print(f"✓ Wrote {cursor.rowcount} daily buckets")
+        
+        cursor.execute("""
+            INSERT INTO application_rollups (society_id, form_id, granularity, bucket_start, status, application_count)
+            SELECT society_id, form_id, 'hour',
+                   TIMESTAMP(DATE(submitted_at), MAKETIME(HOUR(submitted_at), 0, 0)), status, COUNT(*)
+            FROM applications
+            GROUP BY society_id, form_id, DATE(submitted_at), HOUR(submitted_at), status
+        """)
+        print(f"✓ Wrote {cursor.rowcount} hourly buckets")
+        
+        connection.commit()
+        print("\n✅ Backfill completed successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Backfill failed: {e}")
+        connection.rollback()
+        return False
+    finally:
+        cursor.close()
+        connection.close()
+
+if __name__ == "__main__":
+    print("Backfilling application submission rollups...")
+    print("=" * 60)
+    create_tables()
+    backfill()
@@ -0,0 +1,89 @@
+import logging
+from config.db import get_connection
+from mysql.connector import Error
+from utils.tracing import traced_class
+
+logger = logging.getLogger(__name__)
+
+# resource -> JOINs resolving the resource id to the society that owns it
+# (every lookup is by primary key)
+RESOURCE_JOINS = {
+    'society': "LEFT JOIN societies s ON s.society_id = %s",
+    'form': """LEFT JOIN forms f ON f.form_id = %s
+               LEFT JOIN societies s ON s.society_id = f.society_id""",
+    'application': """LEFT JOIN applications a ON a.application_id = %s
+                      LEFT JOIN societies s ON s.society_id = a.society_id""",
+}
+# resource -> column identifying the user who owns the resource itself
+OWNER_COLUMNS = {'society': 'NULL', 'form': 'NULL', 'application': 'a.user_id'}
+
+@traced_class
+class Access:
+    @staticmethod
+    def resolve(user_id, resource, resource_id):
+        """
+        Resolve in one round trip the user's role and the society that owns a
+        society/form/application. Returns {'user_role', 'society_id',
+        'society_head_id', 'owner_id'}. society_id is None when the resource
+        doesn't exist, and None is returned when the user doesn't.
+        """
+        connection = get_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(f"""
+                SELECT u.user_role, s.society_id, s.society_head_id,
+                       {OWNER_COLUMNS[resource]} as owner_id
+                FROM users u
+                {RESOURCE_JOINS[resource]}
+                WHERE u.user_id = %s
+            """, (resource_id, user_id))
+            return cursor.fetchone()
+        except Error as e:
+            logger.error("Error resolving access: %s", e)
+            return None
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def resolve_applications(user_id, application_ids):
+        """
+        The user's role, how many of the applications exist, and how many of
+        those belong to a society the user heads, in one query.
+        """
+        connection = get_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor(dictionary=True)
+        try:
+            placeholders = ', '.join(['%s'] * len(application_ids))
+            cursor.execute(f"""
+                SELECT u.user_role,
+                       COUNT(a.application_id) as found,
+                       COALESCE(SUM(s.society_head_id = u.user_id), 0) as owned
+                FROM users u
+                LEFT JOIN applications a ON a.application_id IN ({placeholders})
+                LEFT JOIN societies s ON s.society_id = a.society_id
+                WHERE u.user_id = %s
+                GROUP BY u.user_id, u.user_role
+            """, list(application_ids) + [user_id])
+            return cursor.fetchone()
+        except Error as e:
+            logger.error("Error resolving access: %s", e)
+            return None
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def can_manage(access, user_id, roles=('societyHead', 'admin'), allow_owner=False):
+        """Decide from a resolve() result: resource owner, admin, or head of its society"""
+        if allow_owner and access['owner_id'] is not None and access['owner_id'] == user_id:
+            return True
+        if access['user_role'] not in roles:
+            return False
+        return access['user_role'] == 'admin' or access['society_head_id'] == user_id
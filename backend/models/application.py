@@ -1,7 +1,162 @@
-from config.db import get_connection
+import logging
+from config.db import get_connection, RESPONSE_STORAGE
 from mysql.connector import Error
-from datetime import date
+from datetime import date, timedelta
+from utils.search import (
+    build_search_query, search_tokens, compile_highlighter, highlight, SEARCH_SCHEMA_ERRNOS, SearchUnavailableError
+)
+from utils.cache import LocalCache
+from utils.form_validator import parse_options
+from utils.answer_stats import count_option_codes, codes_from_rows
+from utils.rows import fetch_rows
+from utils.projection import build_select
+from utils.tracing import traced_class
+from utils.events import Coalescer, broker
+import json
+import numpy as np
 
+logger = logging.getLogger(__name__)
+
+# Explicit column list so list queries never drag the responses_json document along
+APPLICATION_COLUMNS = """a.application_id, a.user_id, a.society_id, a.form_id,
+                       a.application_date, a.status, a.submitted_at"""
+
+# Projectable fields: name -> (select expression, join it needs)
+APPLICATION_FIELDS = {
+    'application_id': ('a.application_id', None),
+    'user_id': ('a.user_id', None),
+    'society_id': ('a.society_id', None),
+    'form_id': ('a.form_id', None),
+    'application_date': ('a.application_date', None),
+    'status': ('a.status', None),
+    'submitted_at': ('a.submitted_at', None),
+    'status_changed_at': ('a.status_changed_at', None),
+    'user_name': ('u.user_name', 'user'),
+    'user_email': ('u.user_email', 'user'),
+    'society_name': ('s.society_name', 'society'),
+    'logo_url': ('s.logo_url', 'society'),
+    'form_title': ('f.title', 'form'),
+}
+APPLICATION_JOINS = {
+    'user': 'JOIN users u ON a.user_id = u.user_id',
+    'society': 'JOIN societies s ON a.society_id = s.society_id',
+    'form': 'JOIN forms f ON a.form_id = f.form_id',
+}
+
+# Default (and allowed) shapes per endpoint
+_BASE_FIELDS = ['application_id', 'user_id', 'society_id', 'form_id', 'application_date', 'status', 'submitted_at']
+APPLICATION_DETAIL_FIELDS = _BASE_FIELDS + ['status_changed_at', 'user_name', 'user_email', 'society_name', 'form_title']
+APPLICATION_USER_LIST_FIELDS = _BASE_FIELDS + ['society_name', 'logo_url', 'form_title']
+APPLICATION_SOCIETY_LIST_FIELDS = _BASE_FIELDS + ['user_name', 'user_email', 'form_title']
+APPLICATION_FORM_LIST_FIELDS = _BASE_FIELDS + ['user_name', 'user_email']
+# Always returned by the detail endpoint: its access check and responses need them
+APPLICATION_REQUIRED_FIELDS = ['application_id', 'user_id', 'society_id', 'form_id']
+APPLICATION_RELATIONS = ['responses']
+
+VALID_STATUSES = ['pending', 'shortlisted', 'accepted', 'rejected']
+STATUS_FIELD_SQL = "FIELD(a.status, 'pending', 'shortlisted', 'accepted', 'rejected') - 1"
+STREAM_BATCH_SIZE = 5000
+
+# Select-question answer distributions keyed by form_id; dropped when the
+# form receives an application or one of its applications changes status.
+_distribution_cache = LocalCache('answer_distributions', ttl=300)
+
+# Adds `delta` per application to the hour and day rollup buckets (keyed by submitted_at).
+# A NULL status means "each application's current status".
+ROLLUP_UPSERT_SQL = """
+    INSERT INTO application_rollups (society_id, form_id, granularity, bucket_start, status, application_count)
+    SELECT a.society_id, a.form_id, g.granularity,
+           IF(g.granularity = 'day',
+              TIMESTAMP(DATE(a.submitted_at)),
+              TIMESTAMP(DATE(a.submitted_at), MAKETIME(HOUR(a.submitted_at), 0, 0))) AS bucket,
+           COALESCE(%s, a.status), %s * COUNT(*)
+    FROM applications a
+    CROSS JOIN (SELECT 'day' AS granularity UNION ALL SELECT 'hour') g
+    WHERE a.application_id IN ({placeholders})
+    GROUP BY a.society_id, a.form_id, g.granularity, bucket, a.status
+    ON DUPLICATE KEY UPDATE application_count = application_count + VALUES(application_count)
+"""
+
+def bump_rollups(cursor, application_ids, status, delta):
+    """Adjust the rollup counters for applications inside the caller's transaction"""
+    placeholders = ", ".join(["%s"] * len(application_ids))
+    cursor.execute(ROLLUP_UPSERT_SQL.format(placeholders=placeholders),
+                   [status, delta] + list(application_ids))
+
+def record_status_change(cursor, application_ids, status, changed_by=None):
+    """
+    Append status transitions for applications (locked by the caller) to the
+    history log and transition aggregates, then apply the new status. All
+    statements are set-based so a bulk change costs the same number of
+    round trips as a single one. Must run before the applications row changes.
+    """
+    placeholders = ", ".join(["%s"] * len(application_ids))
+    ids = list(application_ids)
+    seconds_sql = "TIMESTAMPDIFF(SECOND, COALESCE(status_changed_at, submitted_at), NOW())"
+    
+    cursor.execute(f"""
+        INSERT INTO application_status_history
+            (application_id, society_id, form_id, from_status, to_status, changed_by, seconds_in_previous)
+        SELECT application_id, society_id, form_id, status, %s, %s, {seconds_sql}
+        FROM applications
+        WHERE application_id IN ({placeholders})
+    """, [status, changed_by] + ids)
+    
+    cursor.execute(f"""
+        INSERT INTO application_transition_stats
+            (society_id, form_id, from_status, to_status, transition_count, total_seconds, max_seconds)
+        SELECT society_id, form_id, status, %s, COUNT(*), SUM({seconds_sql}), MAX({seconds_sql})
+        FROM applications
+        WHERE application_id IN ({placeholders})
+        GROUP BY society_id, form_id, status
+        ON DUPLICATE KEY UPDATE
+            transition_count = transition_count + VALUES(transition_count),
+            total_seconds = total_seconds + VALUES(total_seconds),
+            max_seconds = GREATEST(max_seconds, VALUES(max_seconds))
+    """, [status] + ids)
+    
+    # Move the applications between status buckets in the rollups
+    bump_rollups(cursor, ids, None, -1)
+    
+    cursor.execute(f"""
+        UPDATE applications
+        SET status = %s, status_changed_at = NOW()
+        WHERE application_id IN ({placeholders})
+    """, [status] + ids)
+    
+    bump_rollups(cursor, ids, status, 1)
+
+def load_responses_json(raw):
+    """Parse a responses_json column value into a dict keyed by question_id string"""
+    if raw is None:
+        return None
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode('utf-8')
+    if isinstance(raw, str):
+        return json.loads(raw)
+    return raw
+
+def publish_society_changes(society_id, changes, count):
+    """
+    Coalesced society feed: one event per window with the submissions,
+    status changes and deletions it saw (at most the first 50 of count)
+    and counters fetched once for every open dashboard.
+    """
+    statistics = Application.get_statistics(society_id) or {}
+    broker.publish(f'society:{society_id}', 'applications', {
+        'society_id': society_id,
+        'submitted': [change for change in changes if change['event'] == 'submitted'],
+        'status_changes': [change for change in changes if change['event'] == 'status'],
+        'deleted': [change['application_id'] for change in changes if change['event'] == 'deleted'],
+        'changes': count,
+        'truncated': count > len(changes),
+        'statistics': {key: int(value or 0) for key, value in statistics.items()},
+    })
+
+# Society dashboards: new, updated and deleted applications, batched per society
+_society_feed = Coalescer(publish_society_changes)
+
+@traced_class
 class Application:
     @staticmethod
     def create(user_id, society_id, form_id, responses=None):
@@ -31,16 +186,30 @@ class Application:
             
             # Insert responses if provided
             if responses:
-                for question_id, response_text in responses.items():
+                if RESPONSE_STORAGE == 'json':
+                    document = {str(int(question_id)): text for question_id, text in responses.items()}
                     cursor.execute("""
+                        UPDATE applications SET responses_json = %s
+                        WHERE application_id = %s
+                    """, (json.dumps(document), application_id))
+                else:
+                    cursor.executemany("""
                         INSERT INTO application_responses (application_id, question_id, response_text)
                         VALUES (%s, %s, %s)
-                    """, (application_id, int(question_id), response_text))
+                    """, [(application_id, int(question_id), text) for question_id, text in responses.items()])
+            
+            bump_rollups(cursor, [application_id], 'pending', 1)
             
             connection.commit()
-            return Application.get_by_id(application_id)
+            _distribution_cache.invalidate(int(form_id))
+            application = Application.get_by_id(application_id)
+            if application:
+                # The society list row, so open dashboards can insert it without refetching
+                _society_feed.add(int(society_id), dict(
+                    {field: application.get(field) for field in APPLICATION_SOCIETY_LIST_FIELDS}, event='submitted'))
+            return application
         except Error as e:
-            print(f"Error creating application: {e}")
+            logger.error("Error creating application: %s", e)
             connection.rollback()
             return None
         finally:
@@ -48,91 +217,118 @@ class Application:
             connection.close()
     
     @staticmethod
-    def get_by_id(application_id):
-        """Get application by ID with full details and responses"""
+    def get_by_id(application_id, fields=None, include=APPLICATION_RELATIONS):
+        """
+        Get application by ID with full details and responses. fields (from
+        APPLICATION_DETAIL_FIELDS, plus the required ones) narrows the columns;
+        leaving 'responses' out of include skips the answers entirely.
+        """
         connection = get_connection()
         if not connection:
             return None
         
         cursor = connection.cursor(dictionary=True)
         try:
-            cursor.execute("""
-                SELECT a.*,
-                       u.user_name, u.user_email,
-                       s.society_name,
-                       f.title as form_title
+            with_responses = 'responses' in include
+            columns, joins = build_select(APPLICATION_FIELDS, fields or APPLICATION_DETAIL_FIELDS, APPLICATION_JOINS)
+            cursor.execute(f"""
+                SELECT {columns}{', a.responses_json' if with_responses else ''}
                 FROM applications a
-                JOIN users u ON a.user_id = u.user_id
-                JOIN societies s ON a.society_id = s.society_id
-                JOIN forms f ON a.form_id = f.form_id
+                {joins}
                 WHERE a.application_id = %s
             """, (application_id,))
             application = cursor.fetchone()
             
-            if application:
-                # Get responses for this application
-                cursor.execute("""
-                    SELECT ar.*, fq.question_text, fq.question_type
-                    FROM application_responses ar
-                    JOIN form_questions fq ON ar.question_id = fq.question_id
-                    WHERE ar.application_id = %s
-                    ORDER BY fq.order_index, fq.question_id
-                """, (application_id,))
-                application['responses'] = cursor.fetchall()
+            if application and with_responses:
+                document = load_responses_json(application.pop('responses_json', None))
+                if document is not None:
+                    application['responses'] = Application._responses_from_document(
+                        cursor, application_id, application['form_id'], document)
+                else:
+                    # Legacy/EAV layout: one row per answer
+                    cursor.execute("""
+                        SELECT ar.*, fq.question_text, fq.question_type
+                        FROM application_responses ar
+                        JOIN form_questions fq ON ar.question_id = fq.question_id
+                        WHERE ar.application_id = %s
+                        ORDER BY fq.order_index, fq.question_id
+                    """, (application_id,))
+                    application['responses'] = cursor.fetchall()
             
             return application
         except Error as e:
-            print(f"Error fetching application: {e}")
+            logger.error("Error fetching application: %s", e)
             return None
         finally:
             cursor.close()
             connection.close()
     
     @staticmethod
-    def get_by_user(user_id, page=1, per_page=10):
-        """Get all applications by a user"""
+    def _responses_from_document(cursor, application_id, form_id, document):
+        """Expand a responses_json document into the same shape as EAV response rows"""
+        cursor.execute("""
+            SELECT question_id, question_text, question_type
+            FROM form_questions
+            WHERE form_id = %s
+            ORDER BY order_index, question_id
+        """, (form_id,))
+        
+        responses = []
+        for question in cursor.fetchall():
+            key = str(question['question_id'])
+            if key in document:
+                responses.append({
+                    'application_id': application_id,
+                    'question_id': question['question_id'],
+                    'response_text': document[key],
+                    'question_text': question['question_text'],
+                    'question_type': question['question_type']
+                })
+        return responses
+    
+    @staticmethod
+    def get_by_user(user_id, page=1, per_page=10, fields=None):
+        """Get all applications by a user (optionally only the given APPLICATION_USER_LIST_FIELDS)"""
         connection = get_connection()
         if not connection:
             return [], 0
         
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         try:
             # Get total count
             cursor.execute("SELECT COUNT(*) as total FROM applications WHERE user_id = %s", (user_id,))
-            total = cursor.fetchone()['total']
+            total = cursor.fetchone()[0]
             
             # Get paginated results
             offset = (page - 1) * per_page
             
-            cursor.execute("""
-                SELECT a.*,
-                       s.society_name, s.logo_url,
-                       f.title as form_title
+            columns, joins = build_select(APPLICATION_FIELDS, fields or APPLICATION_USER_LIST_FIELDS, APPLICATION_JOINS)
+            cursor.execute(f"""
+                SELECT {columns}
                 FROM applications a
-                JOIN societies s ON a.society_id = s.society_id
-                JOIN forms f ON a.form_id = f.form_id
+                {joins}
                 WHERE a.user_id = %s
                 ORDER BY a.submitted_at DESC
                 LIMIT %s OFFSET %s
             """, (user_id, per_page, offset))
             
-            applications = cursor.fetchall()
+            applications = fetch_rows(cursor)
             return applications, total
         except Error as e:
-            print(f"Error fetching user applications: {e}")
+            logger.error("Error fetching user applications: %s", e)
             return [], 0
         finally:
             cursor.close()
             connection.close()
     
     @staticmethod
-    def get_by_society(society_id, page=1, per_page=20, status=None):
-        """Get all applications for a society"""
+    def get_by_society(society_id, page=1, per_page=20, status=None, fields=None):
+        """Get all applications for a society (optionally only the given APPLICATION_SOCIETY_LIST_FIELDS)"""
         connection = get_connection()
         if not connection:
             return [], 0
         
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         try:
             # Build query with status filter
             where_clause = "a.society_id = %s"
@@ -144,41 +340,39 @@ class Application:
             
             # Get total count
             cursor.execute(f"SELECT COUNT(*) as total FROM applications a WHERE {where_clause}", params)
-            total = cursor.fetchone()['total']
+            total = cursor.fetchone()[0]
             
             # Get paginated results
             offset = (page - 1) * per_page
             params.extend([per_page, offset])
             
+            columns, joins = build_select(APPLICATION_FIELDS, fields or APPLICATION_SOCIETY_LIST_FIELDS, APPLICATION_JOINS)
             cursor.execute(f"""
-                SELECT a.*,
-                       u.user_name, u.user_email,
-                       f.title as form_title
+                SELECT {columns}
                 FROM applications a
-                JOIN users u ON a.user_id = u.user_id
-                JOIN forms f ON a.form_id = f.form_id
+                {joins}
                 WHERE {where_clause}
                 ORDER BY a.submitted_at DESC
                 LIMIT %s OFFSET %s
             """, params)
             
-            applications = cursor.fetchall()
+            applications = fetch_rows(cursor)
             return applications, total
         except Error as e:
-            print(f"Error fetching society applications: {e}")
+            logger.error("Error fetching society applications: %s", e)
             return [], 0
         finally:
             cursor.close()
             connection.close()
     
     @staticmethod
-    def get_by_form(form_id, page=1, per_page=20, status=None):
-        """Get all applications for a form"""
+    def get_by_form(form_id, page=1, per_page=20, status=None, fields=None):
+        """Get all applications for a form (optionally only the given APPLICATION_FORM_LIST_FIELDS)"""
         connection = get_connection()
         if not connection:
             return [], 0
         
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         try:
             # Build query with status filter
             where_clause = "a.form_id = %s"
@@ -190,59 +384,308 @@ class Application:
             
             # Get total count
             cursor.execute(f"SELECT COUNT(*) as total FROM applications a WHERE {where_clause}", params)
-            total = cursor.fetchone()['total']
+            total = cursor.fetchone()[0]
             
             # Get paginated results
             offset = (page - 1) * per_page
             params.extend([per_page, offset])
             
+            columns, joins = build_select(APPLICATION_FIELDS, fields or APPLICATION_FORM_LIST_FIELDS, APPLICATION_JOINS)
             cursor.execute(f"""
-                SELECT a.*,
-                       u.user_name, u.user_email
+                SELECT {columns}
                 FROM applications a
-                JOIN users u ON a.user_id = u.user_id
+                {joins}
                 WHERE {where_clause}
                 ORDER BY a.submitted_at DESC
                 LIMIT %s OFFSET %s
             """, params)
             
-            applications = cursor.fetchall()
+            applications = fetch_rows(cursor)
             return applications, total
         except Error as e:
-            print(f"Error fetching form applications: {e}")
+            logger.error("Error fetching form applications: %s", e)
             return [], 0
         finally:
             cursor.close()
             connection.close()
     
     @staticmethod
-    def update_status(application_id, status):
-        """Update application status"""
+    def search(society_id, search, status=None, question_id=None, after_id=None, per_page=20):
+        """
+        Full-text search over a society's applications: answer text, applicant
+        name and email. Keyset-paginated by application_id (newest first).
+        Returns (results, next_cursor), or (None, None) on error. Raises
+        SearchUnavailableError when the search column or indexes are missing
+        (migrations/add_search_indexes.py hasn't run).
+        """
+        search_query = build_search_query(search)
+        if not search_query:
+            return [], None
+        per_page = max(1, per_page)
+        
+        connection = get_connection()
+        if not connection:
+            return None, None
+        
+        cursor = connection.cursor(dictionary=True)
+        try:
+            where_clauses = ["a.society_id = %s"]
+            params = [society_id]
+            
+            if status:
+                where_clauses.append("a.status = %s")
+                params.append(status)
+            
+            if after_id:
+                where_clauses.append("a.application_id < %s")
+                params.append(after_id)
+            
+            # Answers stored as EAV rows (ft_responses_text index)
+            question_sql = " AND ar.question_id = %s" if question_id else ""
+            match_clauses = [f"""a.application_id IN (
+                        SELECT ar.application_id FROM application_responses ar
+                        WHERE MATCH(ar.response_text) AGAINST (%s IN BOOLEAN MODE){question_sql})"""]
+            match_params = [search_query] + ([question_id] if question_id else [])
+            
+            json_select = ""
+            if RESPONSE_STORAGE == 'json':
+                # Answers stored as a JSON document (ft_applications_responses index)
+                json_select = ", a.responses_json"
+                json_sql = "MATCH(a.responses_search_text) AGAINST (%s IN BOOLEAN MODE)"
+                match_params.append(search_query)
+                if question_id:
+                    json_sql += " AND JSON_EXTRACT(a.responses_json, %s) IS NOT NULL"
+                    match_params.append(f'$."{int(question_id)}"')
+                match_clauses.append(json_sql)
+            
+            if not question_id:
+                match_clauses.append("MATCH(u.user_name, u.user_email) AGAINST (%s IN BOOLEAN MODE)")
+                match_params.append(search_query)
+            
+            where_clauses.append("(" + " OR ".join(match_clauses) + ")")
+            params.extend(match_params)
+            
+            cursor.execute(f"""
+                SELECT {APPLICATION_COLUMNS},
+                       u.user_name, u.user_email{json_select}
+                FROM applications a
+                JOIN users u ON a.user_id = u.user_id
+                WHERE {' AND '.join(where_clauses)}
+                ORDER BY a.application_id DESC
+                LIMIT %s
+            """, params + [per_page + 1])
+            results = cursor.fetchall()
+            
+            next_cursor = None
+            if len(results) > per_page:
+                results = results[:per_page]
+                next_cursor = results[-1]['application_id']
+            
+            Application._attach_snippets(cursor, results, search_query, search_tokens(search), question_id)
+            return results, next_cursor
+        except Error as e:
+            logger.error("Error searching applications: %s", e)
+            if e.errno in SEARCH_SCHEMA_ERRNOS:
+                raise SearchUnavailableError(
+                    'Search indexes are missing; run migrations/add_search_indexes.py') from e
+            return None, None
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def _attach_snippets(cursor, results, search_query, tokens, question_id=None):
+        """Add highlighted answer/name snippets to a page of search results"""
+        if not results:
+            return
+        
+        pattern = compile_highlighter(tokens)
+        by_id = {}
+        for result in results:
+            result['matches'] = []
+            by_id[result['application_id']] = result
+            for field in ('user_name', 'user_email'):
+                snippet = highlight(result[field], pattern)
+                if snippet:
+                    result['matches'].append({'field': field, 'snippet': snippet})
+        
+        placeholders = ", ".join(["%s"] * len(by_id))
+        question_sql = " AND ar.question_id = %s" if question_id else ""
+        cursor.execute(f"""
+            SELECT ar.application_id, ar.question_id, ar.response_text, fq.question_text
+            FROM application_responses ar
+            JOIN form_questions fq ON ar.question_id = fq.question_id
+            WHERE ar.application_id IN ({placeholders})
+              AND MATCH(ar.response_text) AGAINST (%s IN BOOLEAN MODE){question_sql}
+            ORDER BY fq.order_index, fq.question_id
+        """, list(by_id) + [search_query] + ([question_id] if question_id else []))
+        answers = cursor.fetchall()
+        
+        # JSON layout: pull matching values out of each document
+        question_ids = set()
+        for result in results:
+            document = load_responses_json(result.pop('responses_json', None))
+            for key, text in (document or {}).items():
+                if question_id and key != str(question_id):
+                    continue
+                if isinstance(text, str) and pattern.search(text):
+                    answers.append({'application_id': result['application_id'],
+                                    'question_id': int(key), 'response_text': text})
+                    question_ids.add(int(key))
+        
+        if question_ids:
+            placeholders = ", ".join(["%s"] * len(question_ids))
+            cursor.execute(f"""
+                SELECT question_id, question_text FROM form_questions
+                WHERE question_id IN ({placeholders})
+            """, list(question_ids))
+            question_text = {row['question_id']: row['question_text'] for row in cursor.fetchall()}
+            for answer in answers:
+                answer.setdefault('question_text', question_text.get(answer['question_id']))
+        
+        for answer in answers:
+            snippet = highlight(answer['response_text'], pattern)
+            if snippet:
+                by_id[answer['application_id']]['matches'].append({
+                    'field': 'response',
+                    'question_id': answer['question_id'],
+                    'question_text': answer['question_text'],
+                    'snippet': snippet
+                })
+    
+    @staticmethod
+    def update_status(application_id, status, changed_by=None):
+        """Update application status and log the transition"""
+        if status not in VALID_STATUSES:
+            return False
+        
+        updated = Application.bulk_update_status([application_id], status, changed_by)
+        return updated is not None and (updated > 0 or Application.get_status(application_id) == status)
+    
+    @staticmethod
+    def bulk_update_status(application_ids, status, changed_by=None):
+        """
+        Update the status of many applications in one transaction.
+        Returns the number of applications whose status changed, or None on error.
+        """
+        if status not in VALID_STATUSES:
+            return None
+        if not application_ids:
+            return 0
+        
+        connection = get_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor()
+        try:
+            placeholders = ", ".join(["%s"] * len(application_ids))
+            cursor.execute(f"""
+                SELECT application_id, form_id, user_id, society_id, status FROM applications
+                WHERE application_id IN ({placeholders}) AND status <> %s
+                FOR UPDATE
+            """, list(application_ids) + [status])
+            rows = cursor.fetchall()
+            changed_ids = [row[0] for row in rows]
+            
+            if changed_ids:
+                record_status_change(cursor, changed_ids, status, changed_by)
+            
+            connection.commit()
+            for form_id in {row[1] for row in rows}:
+                _distribution_cache.invalidate(form_id)
+            
+            # Push the change to the applicants' status streams and the society feed
+            for application_id, form_id, user_id, society_id, previous in rows:
+                broker.publish(f'user:{user_id}', 'status', {
+                    'application_id': application_id,
+                    'form_id': form_id,
+                    'society_id': society_id,
+                    'status': status,
+                    'previous_status': previous,
+                })
+                _society_feed.add(society_id, {
+                    'event': 'status', 'application_id': application_id, 'form_id': form_id,
+                    'status': status, 'previous_status': previous,
+                })
+            return len(changed_ids)
+        except Error as e:
+            logger.error("Error updating application status: %s", e)
+            connection.rollback()
+            return None
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def delete(application_id):
+        """
+        Delete an application and take it back out of the submission rollups
+        and the transition aggregates in the same transaction (max_seconds
+        stays a high-water mark). History and responses go with it by cascade.
+        """
         connection = get_connection()
         if not connection:
             return False
         
         cursor = connection.cursor()
         try:
-            valid_statuses = ['pending', 'shortlisted', 'accepted', 'rejected']
-            if status not in valid_statuses:
+            cursor.execute("""
+                SELECT form_id, society_id FROM applications WHERE application_id = %s FOR UPDATE
+            """, (application_id,))
+            row = cursor.fetchone()
+            if not row:
                 return False
             
+            bump_rollups(cursor, [application_id], None, -1)
+            
             cursor.execute("""
-                UPDATE applications 
-                SET status = %s 
-                WHERE application_id = %s
-            """, (status, application_id))
+                UPDATE application_transition_stats t
+                JOIN (
+                    SELECT society_id, form_id, from_status, to_status,
+                           COUNT(*) AS transitions, SUM(seconds_in_previous) AS seconds
+                    FROM application_status_history
+                    WHERE application_id = %s
+                    GROUP BY society_id, form_id, from_status, to_status
+                ) h ON t.society_id = h.society_id AND t.form_id = h.form_id
+                   AND t.from_status = h.from_status AND t.to_status = h.to_status
+                SET t.transition_count = t.transition_count - h.transitions,
+                    t.total_seconds = t.total_seconds - h.seconds
+            """, (application_id,))
+            
+            cursor.execute("DELETE FROM applications WHERE application_id = %s", (application_id,))
             
             connection.commit()
-            return cursor.rowcount > 0
+            _distribution_cache.invalidate(row[0])
+            _society_feed.add(row[1], {'event': 'deleted', 'application_id': application_id})
+            return True
         except Error as e:
-            print(f"Error updating application status: {e}")
+            logger.error("Error deleting application: %s", e)
+            connection.rollback()
             return False
         finally:
             cursor.close()
             connection.close()
     
+    @staticmethod
+    def get_status(application_id):
+        """Get the current status of an application"""
+        connection = get_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT status FROM applications WHERE application_id = %s", (application_id,))
+            row = cursor.fetchone()
+            return row[0] if row else None
+        except Error as e:
+            logger.error("Error fetching application status: %s", e)
+            return None
+        finally:
+            cursor.close()
+            connection.close()
+    
     @staticmethod
     def get_statistics(society_id):
         """Get application statistics for a society"""
@@ -266,8 +709,248 @@ class Application:
             stats = cursor.fetchone()
             return stats
         except Error as e:
-            print(f"Error fetching statistics: {e}")
+            logger.error("Error fetching statistics: %s", e)
+            return {}
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def get_timeseries(society_id, granularity='day', start=None, end=None, form_id=None):
+        """
+        Submission counts per hour/day bucket and status from application_rollups.
+        start is inclusive, end exclusive; empty buckets are zero-filled.
+        """
+        connection = get_connection()
+        if not connection:
+            return []
+        
+        cursor = connection.cursor(dictionary=True)
+        try:
+            where_clause = "society_id = %s AND granularity = %s AND bucket_start >= %s AND bucket_start < %s"
+            params = [society_id, granularity, start, end]
+            
+            if form_id:
+                where_clause += " AND form_id = %s"
+                params.append(form_id)
+            
+            cursor.execute(f"""
+                SELECT bucket_start, status, SUM(application_count) as count
+                FROM application_rollups
+                WHERE {where_clause}
+                GROUP BY bucket_start, status
+                ORDER BY bucket_start
+            """, params)
+            
+            counts = {}
+            for row in cursor.fetchall():
+                counts.setdefault(row['bucket_start'], {})[row['status']] = int(row['count'])
+            
+            step = timedelta(hours=1) if granularity == 'hour' else timedelta(days=1)
+            series = []
+            bucket = start
+            while bucket < end:
+                bucket_counts = counts.get(bucket, {})
+                point = {'bucket': bucket, 'total': sum(bucket_counts.values())}
+                for status in VALID_STATUSES:
+                    point[status] = bucket_counts.get(status, 0)
+                series.append(point)
+                bucket += step
+            return series
+        except Error as e:
+            logger.error("Error fetching application timeseries: %s", e)
+            return []
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def get_funnel(society_id, form_id=None):
+        """
+        Funnel and time-in-status analytics from the pre-aggregated
+        application_transition_stats and application_rollups tables.
+        """
+        connection = get_connection()
+        if not connection:
+            return {}
+        
+        cursor = connection.cursor(dictionary=True)
+        try:
+            where_clause = "society_id = %s"
+            params = [society_id]
+            if form_id:
+                where_clause += " AND form_id = %s"
+                params.append(form_id)
+            
+            cursor.execute(f"""
+                SELECT status, SUM(application_count) as count
+                FROM application_rollups
+                WHERE {where_clause} AND granularity = 'day'
+                GROUP BY status
+            """, params)
+            current = {status: 0 for status in VALID_STATUSES}
+            for row in cursor.fetchall():
+                current[row['status']] = int(row['count'])
+            submitted = sum(current.values())
+            
+            cursor.execute(f"""
+                SELECT from_status, to_status,
+                       SUM(transition_count) as count,
+                       SUM(total_seconds) as total_seconds,
+                       MAX(max_seconds) as max_seconds
+                FROM application_transition_stats
+                WHERE {where_clause}
+                GROUP BY from_status, to_status
+            """, params)
+            
+            transitions = []
+            entered = {status: 0 for status in VALID_STATUSES}
+            entered['pending'] = submitted
+            exits = {}
+            for row in cursor.fetchall():
+                count = int(row['count'])
+                total_seconds = int(row['total_seconds'] or 0)
+                transitions.append({
+                    'from': row['from_status'],
+                    'to': row['to_status'],
+                    'count': count,
+                    'avg_seconds': round(total_seconds / count, 1) if count else None,
+                    'max_seconds': int(row['max_seconds'] or 0)
+                })
+                entered[row['to_status']] += count
+                exit_count, exit_seconds = exits.get(row['from_status'], (0, 0))
+                exits[row['from_status']] = (exit_count + count, exit_seconds + total_seconds)
+            
+            def transition_count(from_status, to_status):
+                return sum(t['count'] for t in transitions if t['from'] == from_status and t['to'] == to_status)
+            
+            def ratio(numerator, denominator):
+                return round(numerator / denominator, 4) if denominator else None
+            
+            return {
+                'submitted': submitted,
+                'current': current,
+                'entered': entered,
+                'transitions': transitions,
+                'time_in_status': {
+                    status: {'exits': count, 'avg_seconds': round(seconds / count, 1) if count else None}
+                    for status, (count, seconds) in exits.items()
+                },
+                'conversion': {
+                    'pending_to_shortlisted': ratio(transition_count('pending', 'shortlisted'), entered['pending']),
+                    'shortlisted_to_accepted': ratio(transition_count('shortlisted', 'accepted'), entered['shortlisted']),
+                    'submitted_to_accepted': ratio(entered['accepted'], submitted)
+                }
+            }
+        except Error as e:
+            logger.error("Error fetching application funnel: %s", e)
             return {}
         finally:
             cursor.close()
             connection.close()
+    
+    @staticmethod
+    def get_answer_distribution(form_id, questions):
+        """
+        Answer distribution and status cross-tab for every select question of
+        a form (cached per form). Answers are integer-coded in SQL with FIELD()
+        and streamed straight into NumPy arrays, so counting never loops in Python.
+        """
+        form_id = int(form_id)
+        cached = _distribution_cache.get(form_id)
+        if cached is not None:
+            return cached
+        
+        select_questions = []
+        for question in questions:
+            options = parse_options(question.get('options'))
+            if question.get('question_type') == 'select' and options:
+                select_questions.append((question, options))
+        
+        result = {'form_id': form_id, 'statuses': VALID_STATUSES, 'questions': []}
+        if not select_questions:
+            _distribution_cache.set(form_id, result)
+            return result
+        
+        connection = get_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor()
+        try:
+            question_ids = [question['question_id'] for question, _ in select_questions]
+            
+            # EAV layout: (question_id, option code, status code) per answer
+            case_sql = []
+            case_params = []
+            for question, options in select_questions:
+                case_sql.append(f"WHEN %s THEN FIELD(ar.response_text, {', '.join(['%s'] * len(options))})")
+                case_params.extend([question['question_id']] + list(options))
+            placeholders = ", ".join(["%s"] * len(question_ids))
+            
+            cursor.execute(f"""
+                SELECT ar.question_id,
+                       CASE ar.question_id {' '.join(case_sql)} END,
+                       {STATUS_FIELD_SQL}
+                FROM application_responses ar
+                JOIN applications a ON a.application_id = ar.application_id
+                WHERE a.form_id = %s AND ar.question_id IN ({placeholders})
+            """, case_params + [form_id] + question_ids)
+            eav = codes_from_rows(Application._stream(cursor), 3)
+            
+            # JSON layout: (status code, option code per question); -1 = unanswered
+            json_codes = None
+            if RESPONSE_STORAGE == 'json':
+                column_sql = []
+                column_params = []
+                for question, options in select_questions:
+                    path = f'$."{int(question["question_id"])}"'
+                    column_sql.append(f"""IF(JSON_EXTRACT(a.responses_json, %s) IS NULL, -1,
+                        FIELD(JSON_UNQUOTE(JSON_EXTRACT(a.responses_json, %s)), {', '.join(['%s'] * len(options))}))""")
+                    column_params.extend([path, path] + list(options))
+                cursor.execute(f"""
+                    SELECT {STATUS_FIELD_SQL}, {', '.join(column_sql)}
+                    FROM applications a
+                    WHERE a.form_id = %s AND a.responses_json IS NOT NULL
+                """, column_params + [form_id])
+                json_codes = codes_from_rows(Application._stream(cursor), len(select_questions) + 1)
+            
+            status_count = len(VALID_STATUSES)
+            for index, (question, options) in enumerate(select_questions):
+                mask = eav[:, 0] == question['question_id']
+                option_codes = eav[mask, 1]
+                status_codes = eav[mask, 2]
+                if json_codes is not None:
+                    answered = json_codes[:, index + 1] >= 0
+                    option_codes = np.concatenate([option_codes, json_codes[answered, index + 1]])
+                    status_codes = np.concatenate([status_codes, json_codes[answered, 0]])
+                
+                counts, crosstab = count_option_codes(option_codes, status_codes, len(options), status_count)
+                # Code 0 (answers outside the option list) is reported last as "Other"
+                order = list(range(1, len(options) + 1)) + [0]
+                result['questions'].append({
+                    'question_id': question['question_id'],
+                    'question_text': question['question_text'],
+                    'options': list(options) + ['Other'],
+                    'responses': int(counts.sum()),
+                    'counts': counts[order].tolist(),
+                    'by_status': {status: crosstab[order, i].tolist() for i, status in enumerate(VALID_STATUSES)}
+                })
+            
+            _distribution_cache.set(form_id, result)
+            return result
+        except Error as e:
+            logger.error("Error fetching answer distribution: %s", e)
+            return None
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def _stream(cursor):
+        """Yield result batches from an unbuffered cursor without loading every row"""
+        while True:
+            batch = cursor.fetchmany(STREAM_BATCH_SIZE)
+            if not batch:
+                return
+            yield batch
@@ -1,7 +1,41 @@
+import logging
 from config.db import get_connection
 from mysql.connector import Error
 from datetime import datetime
+from utils.cache import LocalCache
+from utils.form_validator import compile_form_validator
+from utils.rows import fetch_rows
+from utils.projection import build_select
+from utils.tracing import traced_class
 
+logger = logging.getLogger(__name__)
+
+# Compiled response validators keyed by form_id. The TTL bounds staleness
+# for other worker processes; local writes invalidate immediately.
+_validator_cache = LocalCache('form_validators', ttl=300)
+
+# Projectable fields: name -> (select expression, join it needs)
+FORM_FIELDS = {
+    'form_id': ('f.form_id', None),
+    'society_id': ('f.society_id', None),
+    'title': ('f.title', None),
+    'status': ('f.status', None),
+    'created_at': ('f.created_at', None),
+    'published_at': ('f.published_at', None),
+    'society_name': ('s.society_name', 'society'),
+    'category': ('s.category', 'society'),
+    'logo_url': ('s.logo_url', 'society'),
+    'application_count': ('(SELECT COUNT(*) FROM applications WHERE form_id = f.form_id)', None),
+}
+FORM_JOINS = {'society': 'JOIN societies s ON f.society_id = s.society_id'}
+
+# Default (and allowed) shapes per endpoint
+FORM_DETAIL_FIELDS = [name for name in FORM_FIELDS if name != 'application_count']
+FORM_SOCIETY_LIST_FIELDS = ['form_id', 'society_id', 'title', 'status', 'created_at', 'published_at', 'application_count']
+FORM_PUBLISHED_FIELDS = list(FORM_FIELDS)
+FORM_RELATIONS = ['questions']
+
+@traced_class
 class Form:
     @staticmethod
     def create(society_id, title, status='draft'):
@@ -23,30 +57,31 @@ class Form:
             form_id = cursor.lastrowid
             return Form.get_by_id(form_id)
         except Error as e:
-            print(f"Error creating form: {e}")
+            logger.error("Error creating form: %s", e)
             return None
         finally:
             cursor.close()
             connection.close()
     
     @staticmethod
-    def get_by_id(form_id):
-        """Get form by ID with society details and questions"""
+    def get_by_id(form_id, fields=None, include=FORM_RELATIONS):
+        """Get form by ID with society details and (unless excluded) questions"""
         connection = get_connection()
         if not connection:
             return None
         
         cursor = connection.cursor(dictionary=True)
         try:
-            cursor.execute("""
-                SELECT f.*, s.society_name, s.category, s.logo_url
+            columns, joins = build_select(FORM_FIELDS, fields or FORM_DETAIL_FIELDS, FORM_JOINS)
+            cursor.execute(f"""
+                SELECT {columns}
                 FROM forms f
-                JOIN societies s ON f.society_id = s.society_id
+                {joins}
                 WHERE f.form_id = %s
             """, (form_id,))
             form = cursor.fetchone()
             
-            if form:
+            if form and 'questions' in include:
                 # Get questions for this form
                 cursor.execute("""
                     SELECT * FROM form_questions
@@ -57,67 +92,90 @@ class Form:
             
             return form
         except Error as e:
-            print(f"Error fetching form: {e}")
+            logger.error("Error fetching form: %s", e)
             return None
         finally:
             cursor.close()
             connection.close()
     
     @staticmethod
-    def get_by_society(society_id):
-        """Get all forms for a society"""
+    def get_validator(form_id, form=None):
+        """Get the compiled response validator for a form (cached)"""
+        form_id = int(form_id)
+        validator = _validator_cache.get(form_id)
+        if validator is not None:
+            return validator
+        
+        if form is None:
+            form = Form.get_by_id(form_id)
+        if not form:
+            return None
+        
+        validator = compile_form_validator(form_id, form.get('questions'))
+        _validator_cache.set(form_id, validator)
+        return validator
+    
+    @staticmethod
+    def invalidate_validator(form_id):
+        """Drop the cached validator after a form or its questions change"""
+        _validator_cache.invalidate(int(form_id))
+    
+    @staticmethod
+    def get_by_society(society_id, fields=None):
+        """Get all forms for a society (optionally only the given FORM_SOCIETY_LIST_FIELDS)"""
         connection = get_connection()
         if not connection:
             return []
         
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         try:
-            cursor.execute("""
-                SELECT f.*, 
-                       (SELECT COUNT(*) FROM applications WHERE form_id = f.form_id) as application_count
+            columns, joins = build_select(FORM_FIELDS, fields or FORM_SOCIETY_LIST_FIELDS, FORM_JOINS)
+            cursor.execute(f"""
+                SELECT {columns}
                 FROM forms f
+                {joins}
                 WHERE f.society_id = %s
                 ORDER BY f.created_at DESC
             """, (society_id,))
-            forms = cursor.fetchall()
+            forms = fetch_rows(cursor)
             return forms
         except Error as e:
-            print(f"Error fetching forms: {e}")
+            logger.error("Error fetching forms: %s", e)
             return []
         finally:
             cursor.close()
             connection.close()
     
     @staticmethod
-    def get_published(page=1, per_page=10):
-        """Get all published forms with pagination"""
+    def get_published(page=1, per_page=10, fields=None):
+        """Get all published forms with pagination and optional field projection"""
         connection = get_connection()
         if not connection:
             return [], 0
         
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         try:
             # Get total count
             cursor.execute("SELECT COUNT(*) as total FROM forms WHERE status = 'published'")
-            total = cursor.fetchone()['total']
+            total = cursor.fetchone()[0]
             
             # Get paginated results
             offset = (page - 1) * per_page
             
-            cursor.execute("""
-                SELECT f.*, s.society_name, s.category, s.logo_url,
-                       (SELECT COUNT(*) FROM applications WHERE form_id = f.form_id) as application_count
+            columns, joins = build_select(FORM_FIELDS, fields or FORM_PUBLISHED_FIELDS, FORM_JOINS)
+            cursor.execute(f"""
+                SELECT {columns}
                 FROM forms f
-                JOIN societies s ON f.society_id = s.society_id
+                {joins}
                 WHERE f.status = 'published'
                 ORDER BY f.published_at DESC
                 LIMIT %s OFFSET %s
             """, (per_page, offset))
             
-            forms = cursor.fetchall()
+            forms = fetch_rows(cursor)
             return forms, total
         except Error as e:
-            print(f"Error fetching published forms: {e}")
+            logger.error("Error fetching published forms: %s", e)
             return [], 0
         finally:
             cursor.close()
@@ -156,9 +214,10 @@ class Form:
             
             cursor.execute(query, values)
             connection.commit()
+            Form.invalidate_validator(form_id)
             return cursor.rowcount > 0
         except Error as e:
-            print(f"Error updating form: {e}")
+            logger.error("Error updating form: %s", e)
             return False
         finally:
             cursor.close()
@@ -175,9 +234,10 @@ class Form:
         try:
             cursor.execute("DELETE FROM forms WHERE form_id = %s", (form_id,))
             connection.commit()
+            Form.invalidate_validator(form_id)
             return cursor.rowcount > 0
         except Error as e:
-            print(f"Error deleting form: {e}")
+            logger.error("Error deleting form: %s", e)
             return False
         finally:
             cursor.close()
@@ -0,0 +1,233 @@
+import logging
+from config.db import get_connection
+from mysql.connector import Error
+import json
+from utils.tracing import traced_class
+
+logger = logging.getLogger(__name__)
+
+@traced_class
+class ReportJob:
+    @staticmethod
+    def create(report_type, params, requested_by):
+        """Queue a new report job"""
+        connection = get_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO report_jobs (report_type, params, requested_by)
+                VALUES (%s, %s, %s)
+            """, (report_type, json.dumps(params or {}), requested_by))
+            
+            connection.commit()
+            job_id = cursor.lastrowid
+            return ReportJob.get_by_id(job_id)
+        except Error as e:
+            logger.error("Error creating report job: %s", e)
+            return None
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def get_by_id(job_id):
+        """Get report job by ID"""
+        connection = get_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT * FROM report_jobs WHERE job_id = %s", (job_id,))
+            job = cursor.fetchone()
+            if job:
+                job['params'] = json.loads(job['params']) if job['params'] else {}
+                job['cancel_requested'] = bool(job['cancel_requested'])
+            return job
+        except Error as e:
+            logger.error("Error fetching report job: %s", e)
+            return None
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def get_recent(limit=50):
+        """Get the most recent report jobs"""
+        connection = get_connection()
+        if not connection:
+            return []
+        
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT job_id, report_type, status, progress, requested_by, row_count,
+                       created_at, started_at, finished_at
+                FROM report_jobs
+                ORDER BY created_at DESC, job_id DESC
+                LIMIT %s
+            """, (limit,))
+            return cursor.fetchall()
+        except Error as e:
+            logger.error("Error fetching report jobs: %s", e)
+            return []
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def claim(job_id):
+        """Atomically move a queued job to running; False if another worker took it or it was cancelled"""
+        connection = get_connection()
+        if not connection:
+            return False
+        
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                UPDATE report_jobs
+                SET status = 'running', started_at = NOW(), heartbeat_at = NOW()
+                WHERE job_id = %s AND status = 'queued'
+            """, (job_id,))
+            connection.commit()
+            return cursor.rowcount == 1
+        except Error as e:
+            logger.error("Error claiming report job: %s", e)
+            return False
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def update_progress(job_id, progress):
+        """Record progress (and the heartbeat) and return True if cancellation was requested"""
+        connection = get_connection()
+        if not connection:
+            return False
+        
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                UPDATE report_jobs SET progress = %s, heartbeat_at = NOW()
+                WHERE job_id = %s AND status = 'running'
+            """, (progress, job_id))
+            cursor.execute("SELECT cancel_requested FROM report_jobs WHERE job_id = %s", (job_id,))
+            row = cursor.fetchone()
+            connection.commit()
+            return bool(row and row[0])
+        except Error as e:
+            logger.error("Error updating report job progress: %s", e)
+            return False
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def finish(job_id, status, result_path=None, row_count=None, error=None):
+        """Mark a job completed, failed or cancelled"""
+        connection = get_connection()
+        if not connection:
+            return False
+        
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                UPDATE report_jobs
+                SET status = %s, progress = IF(%s = 'completed', 100, progress),
+                    result_path = %s, row_count = %s, error = %s, finished_at = NOW()
+                WHERE job_id = %s
+            """, (status, status, result_path, row_count, error, job_id))
+            connection.commit()
+            return cursor.rowcount > 0
+        except Error as e:
+            logger.error("Error finishing report job: %s", e)
+            return False
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def request_cancel(job_id, stale_after=300):
+        """
+        Cancel a queued job immediately or flag a running one; returns the new
+        status. A running job without a heartbeat for stale_after seconds has
+        no worker left to see the flag, so it is cancelled immediately too.
+        """
+        connection = get_connection()
+        if not connection:
+            return None
+        
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                UPDATE report_jobs
+                SET status = 'cancelled', finished_at = NOW()
+                WHERE job_id = %s AND (status = 'queued' OR (status = 'running'
+                      AND COALESCE(heartbeat_at, started_at) < NOW() - INTERVAL %s SECOND))
+            """, (job_id, stale_after))
+            if cursor.rowcount == 0:
+                cursor.execute("""
+                    UPDATE report_jobs SET cancel_requested = TRUE
+                    WHERE job_id = %s AND status = 'running'
+                """, (job_id,))
+            cursor.execute("SELECT status FROM report_jobs WHERE job_id = %s", (job_id,))
+            row = cursor.fetchone()
+            connection.commit()
+            return row[0] if row else None
+        except Error as e:
+            logger.error("Error cancelling report job: %s", e)
+            return None
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def get_queued_ids():
+        """Get IDs of jobs still waiting to run (oldest first)"""
+        connection = get_connection()
+        if not connection:
+            return []
+        
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT job_id FROM report_jobs
+                WHERE status = 'queued'
+                ORDER BY created_at, job_id
+            """)
+            return [row[0] for row in cursor.fetchall()]
+        except Error as e:
+            logger.error("Error fetching queued report jobs: %s", e)
+            return []
+        finally:
+            cursor.close()
+            connection.close()
+    
+    @staticmethod
+    def fail_stale(stale_after=300):
+        """
+        Fail running jobs whose worker stopped (no heartbeat for stale_after
+        seconds); returns how many were failed
+        """
+        connection = get_connection()
+        if not connection:
+            return 0
+        
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                UPDATE report_jobs
+                SET status = 'failed', error = 'Interrupted: the worker running it stopped', finished_at = NOW()
+                WHERE status = 'running' AND COALESCE(heartbeat_at, started_at) < NOW() - INTERVAL %s SECOND
+            """, (stale_after,))
+            connection.commit()
+            return cursor.rowcount
+        except Error as e:
+            logger.error("Error failing stale report jobs: %s", e)
+            return 0
+        finally:
+            cursor.close()
+            connection.close()
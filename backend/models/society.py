@@ -1,6 +1,40 @@
+import logging
 from config.db import get_connection
 from mysql.connector import Error
+from utils.search import build_search_query
+from utils.cache import LocalCache
+from utils.rows import fetch_rows
+from utils.projection import build_select
+from utils.tracing import traced_class
 
+logger = logging.getLogger(__name__)
+
+# (category, admission_open) -> count grids keyed by search expression.
+# Cleared on every society write; the TTL bounds staleness for other workers.
+_facet_cache = LocalCache('society_facets', ttl=60, max_entries=256)
+
+# Projectable fields: name -> (select expression, join it needs)
+SOCIETY_FIELDS = {
+    'society_id': ('s.society_id', None),
+    'society_name': ('s.society_name', None),
+    'tagline': ('s.tagline', None),
+    'description': ('s.description', None),
+    'category': ('s.category', None),
+    'logo_url': ('s.logo_url', None),
+    'member_count': ('s.member_count', None),
+    'admission_open': ('s.admission_open', None),
+    'admission_deadline': ('s.admission_deadline', None),
+    'society_head_id': ('s.society_head_id', None),
+    'created_at': ('s.created_at', None),
+    'head_name': ('u.user_name', 'head'),
+    'head_email': ('u.user_email', 'head'),
+}
+SOCIETY_JOINS = {'head': 'LEFT JOIN users u ON s.society_head_id = u.user_id'}
+
+# Default (and allowed) shape of list rows; head_email is detail-only
+SOCIETY_LIST_FIELDS = [name for name in SOCIETY_FIELDS if name != 'head_email']
+
+@traced_class
 class Society:
     @staticmethod
     def create(society_name, tagline, description, category, logo_url, 
@@ -20,47 +54,49 @@ class Society:
                   admission_open, admission_deadline, society_head_id))
             
             connection.commit()
+            _facet_cache.clear()
             society_id = cursor.lastrowid
             return Society.get_by_id(society_id)
         except Error as e:
-            print(f"Error creating society: {e}")
+            logger.error("Error creating society: %s", e)
             return None
         finally:
             cursor.close()
             connection.close()
     
     @staticmethod
-    def get_by_id(society_id):
-        """Get society by ID with head details"""
+    def get_by_id(society_id, fields=None):
+        """Get society by ID with head details (optionally only the given SOCIETY_FIELDS)"""
         connection = get_connection()
         if not connection:
             return None
         
         cursor = connection.cursor(dictionary=True)
         try:
-            cursor.execute("""
-                SELECT s.*, u.user_name as head_name, u.user_email as head_email
+            columns, joins = build_select(SOCIETY_FIELDS, fields or list(SOCIETY_FIELDS), SOCIETY_JOINS)
+            cursor.execute(f"""
+                SELECT {columns}
                 FROM societies s
-                LEFT JOIN users u ON s.society_head_id = u.user_id
+                {joins}
                 WHERE s.society_id = %s
             """, (society_id,))
             society = cursor.fetchone()
             return society
         except Error as e:
-            print(f"Error fetching society: {e}")
+            logger.error("Error fetching society: %s", e)
             return None
         finally:
             cursor.close()
             connection.close()
     
     @staticmethod
-    def get_all(page=1, per_page=10, category=None, admission_open=None):
-        """Get all societies with pagination and filters"""
+    def get_all(page=1, per_page=10, category=None, admission_open=None, search=None, fields=None):
+        """Get all societies with pagination, filters, optional full-text search and field projection"""
         connection = get_connection()
         if not connection:
             return [], 0
         
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         try:
             # Build query with filters
             where_clauses = []
@@ -74,34 +110,102 @@ class Society:
                 where_clauses.append("s.admission_open = %s")
                 params.append(admission_open)
             
+            # Full-text search over name/tagline/description (ft_societies_search index)
+            search_query = build_search_query(search)
+            select_extra = ""
+            order_sql = "s.created_at DESC"
+            select_params = []
+            
+            if search_query:
+                where_clauses.append("MATCH(s.society_name, s.tagline, s.description) AGAINST (%s IN BOOLEAN MODE)")
+                params.append(search_query)
+                # Name matches weigh double (ft_societies_name index)
+                select_extra = """,
+                       (MATCH(s.society_name) AGAINST (%s IN BOOLEAN MODE) * 2 +
+                        MATCH(s.society_name, s.tagline, s.description) AGAINST (%s IN BOOLEAN MODE)) as relevance"""
+                select_params = [search_query, search_query]
+                order_sql = "relevance DESC, s.created_at DESC"
+            
             where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
             
             # Get total count
             cursor.execute(f"SELECT COUNT(*) as total FROM societies s WHERE {where_sql}", params)
-            total = cursor.fetchone()['total']
+            total = cursor.fetchone()[0]
             
             # Get paginated results
             offset = (page - 1) * per_page
-            params.extend([per_page, offset])
             
+            columns, joins = build_select(SOCIETY_FIELDS, fields or SOCIETY_LIST_FIELDS, SOCIETY_JOINS)
             cursor.execute(f"""
-                SELECT s.*, u.user_name as head_name
+                SELECT {columns}{select_extra}
                 FROM societies s
-                LEFT JOIN users u ON s.society_head_id = u.user_id
+                {joins}
                 WHERE {where_sql}
-                ORDER BY s.created_at DESC
+                ORDER BY {order_sql}
                 LIMIT %s OFFSET %s
-            """, params)
+            """, select_params + params + [per_page, offset])
             
-            societies = cursor.fetchall()
+            societies = fetch_rows(cursor)
             return societies, total
         except Error as e:
-            print(f"Error fetching societies: {e}")
+            logger.error("Error fetching societies: %s", e)
             return [], 0
         finally:
             cursor.close()
             connection.close()
     
+    @staticmethod
+    def get_facets(category=None, admission_open=None, search=None):
+        """
+        Facet counts for the browse filters. One grouped query per search
+        expression (cached); each facet respects the other facet's filter.
+        """
+        search_query = build_search_query(search)
+        cache_key = search_query or ''
+        grid = _facet_cache.get(cache_key)
+        
+        if grid is None:
+            connection = get_connection()
+            if not connection:
+                return {}
+            
+            cursor = connection.cursor()
+            try:
+                where_sql = "1=1"
+                params = []
+                if search_query:
+                    where_sql = "MATCH(s.society_name, s.tagline, s.description) AGAINST (%s IN BOOLEAN MODE)"
+                    params.append(search_query)
+                
+                cursor.execute(f"""
+                    SELECT s.category, s.admission_open, COUNT(*)
+                    FROM societies s
+                    WHERE {where_sql}
+                    GROUP BY s.category, s.admission_open
+                """, params)
+                grid = [(row_category, bool(row_open), count) for row_category, row_open, count in cursor.fetchall()]
+                _facet_cache.set(cache_key, grid)
+            except Error as e:
+                logger.error("Error fetching society facets: %s", e)
+                return {}
+            finally:
+                cursor.close()
+                connection.close()
+        
+        categories = {}
+        admission = {'open': 0, 'closed': 0}
+        for row_category, row_open, count in grid:
+            if admission_open is None or row_open == bool(admission_open):
+                key = row_category or 'Uncategorized'
+                categories[key] = categories.get(key, 0) + count
+            if not category or row_category == category:
+                admission['open' if row_open else 'closed'] += count
+        
+        return {
+            'category': categories,
+            'admission_open': admission
+        }
+    
     @staticmethod
     def get_by_head(society_head_id):
         """Get society managed by a specific head"""
@@ -120,7 +224,7 @@ class Society:
             society = cursor.fetchone()
             return society
         except Error as e:
-            print(f"Error fetching society: {e}")
+            logger.error("Error fetching society: %s", e)
             return None
         finally:
             cursor.close()
@@ -155,9 +259,10 @@ class Society:
             
             cursor.execute(query, values)
             connection.commit()
+            _facet_cache.clear()
             return cursor.rowcount > 0
         except Error as e:
-            print(f"Error updating society: {e}")
+            logger.error("Error updating society: %s", e)
             return False
         finally:
             cursor.close()
@@ -174,9 +279,10 @@ class Society:
         try:
             cursor.execute("DELETE FROM societies WHERE society_id = %s", (society_id,))
             connection.commit()
+            _facet_cache.clear()
             return cursor.rowcount > 0
         except Error as e:
-            print(f"Error deleting society: {e}")
+            logger.error("Error deleting society: %s", e)
             return False
         finally:
             cursor.close()
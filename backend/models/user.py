@@ -1,7 +1,13 @@
+import logging
 from config.db import get_connection
 from mysql.connector import Error
 import bcrypt
+from utils.metrics import BCRYPT_LATENCY, timed
+from utils.tracing import traced_class
 
+logger = logging.getLogger(__name__)
+
+@traced_class
 class User:
     @staticmethod
     def create(user_name, user_email, user_password, user_role='student'):
@@ -12,7 +18,8 @@ class User:
         
         cursor = connection.cursor()
         try:
-            hashed_password = bcrypt.hashpw(user_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            with timed(BCRYPT_LATENCY, 'hash'):
+                hashed_password = bcrypt.hashpw(user_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
             
             cursor.execute("""
                 INSERT INTO users (user_name, user_email, user_password, user_role)
@@ -23,7 +30,7 @@ class User:
             user_id = cursor.lastrowid
             return User.get_by_id(user_id)
         except Error as e:
-            print(f"Error creating user: {e}")
+            logger.error("Error creating user: %s", e)
             return None
         finally:
             cursor.close()
@@ -42,7 +49,7 @@ class User:
             user = cursor.fetchone()
             return user
         except Error as e:
-            print(f"Error fetching user: {e}")
+            logger.error("Error fetching user: %s", e)
             return None
         finally:
             cursor.close()
@@ -61,7 +68,7 @@ class User:
             user = cursor.fetchone()
             return user
         except Error as e:
-            print(f"Error fetching user: {e}")
+            logger.error("Error fetching user: %s", e)
             return None
         finally:
             cursor.close()
@@ -70,7 +77,8 @@ class User:
     @staticmethod
     def verify_password(plain_password, hashed_password):
         """Verify password"""
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        with timed(BCRYPT_LATENCY, 'verify'):
+            return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
     
     @staticmethod
     def get_all(role=None, limit=50, offset=0):
@@ -95,7 +103,7 @@ class User:
             users = cursor.fetchall()
             return users
         except Error as e:
-            print(f"Error fetching users: {e}")
+            logger.error("Error fetching users: %s", e)
             return []
         finally:
             cursor.close()
@@ -117,7 +125,7 @@ class User:
             count = cursor.fetchone()[0]
             return count
         except Error as e:
-            print(f"Error counting users: {e}")
+            logger.error("Error counting users: %s", e)
             return 0
         finally:
             cursor.close()
@@ -1,7 +1,17 @@
-from flask import Blueprint, request, jsonify
+import os
+from flask import Blueprint, current_app, request, send_file, send_from_directory
+from flask_jwt_extended import get_jwt_identity
 from models.user import User
-from models.society import Society
+from models.society import Society, SOCIETY_LIST_FIELDS
+from models.report_job import ReportJob
 from middleware.auth import role_required
+from utils.job_runner import job_runner
+from utils.reports import REPORTS
+from utils.projection import ProjectionError, projection_args
+from utils.responses import respond
+from utils.slow_queries import slow_query_log
+from utils.sampling_profiler import list_profiles
+from utils.health import status_report
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -21,13 +31,13 @@ def get_all_users():
                 'user_name': user['user_name'],
                 'user_email': user['user_email'],
                 'user_role': user['user_role'],
-                'created_at': user['created_at'].isoformat() if user.get('created_at') else None
+                'created_at': user.get('created_at')
             })
         
-        return jsonify({'users': safe_users}), 200
+        return respond({'users': safe_users}), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch users', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch users', 'message': str(e)}), 500
 
 @admin_bp.route('/societies', methods=['GET'])
 @role_required('admin')
@@ -37,9 +47,11 @@ def get_all_societies_admin():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         
-        societies, total = Society.get_all(page, per_page)
+        fields, _ = projection_args(request.args, SOCIETY_LIST_FIELDS, required=['society_id'])
         
-        return jsonify({
+        societies, total = Society.get_all(page, per_page, fields=fields)
+        
+        return respond({
             'societies': societies,
             'pagination': {
                 'page': page,
@@ -49,8 +61,10 @@ def get_all_societies_admin():
             }
         }), 200
         
+    except ProjectionError as e:
+        return respond({'error': 'Invalid field selection', 'message': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch societies', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch societies', 'message': str(e)}), 500
 
 @admin_bp.route('/societies/<int:society_id>/approve', methods=['PUT'])
 @role_required('admin')
@@ -62,16 +76,16 @@ def approve_society(society_id):
         success = Society.update(society_id, admission_open=data.get('approve', True))
         
         if not success:
-            return jsonify({'error': 'Failed to update society'}), 500
+            return respond({'error': 'Failed to update society'}), 500
         
         society = Society.get_by_id(society_id)
-        return jsonify({
+        return respond({
             'message': 'Society updated successfully',
             'society': society
         }), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to approve society', 'message': str(e)}), 500
+        return respond({'error': 'Failed to approve society', 'message': str(e)}), 500
 
 @admin_bp.route('/dashboard/stats', methods=['GET'])
 @role_required('admin')
@@ -82,7 +96,7 @@ def get_dashboard_stats():
         
         connection = get_connection()
         if not connection:
-            return jsonify({'error': 'Database connection failed'}), 500
+            return respond({'error': 'Database connection failed'}), 500
         
         cursor = connection.cursor(dictionary=True)
         
@@ -120,7 +134,7 @@ def get_dashboard_stats():
         cursor.close()
         connection.close()
         
-        return jsonify({
+        return respond({
             'stats': {
                 'total_users': total_users,
                 'total_societies': total_societies,
@@ -132,4 +146,152 @@ def get_dashboard_stats():
         }), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch dashboard stats', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch dashboard stats', 'message': str(e)}), 500
+
+@admin_bp.route('/reports', methods=['GET'])
+@role_required('admin')
+def list_reports():
+    """List available report types and recent report jobs (admin only)"""
+    try:
+        jobs = ReportJob.get_recent()
+        
+        return respond({
+            'report_types': {name: report['description'] for name, report in REPORTS.items()},
+            'jobs': jobs
+        }), 200
+        
+    except Exception as e:
+        return respond({'error': 'Failed to fetch reports', 'message': str(e)}), 500
+
+@admin_bp.route('/reports', methods=['POST'])
+@role_required('admin')
+def submit_report():
+    """Queue a report job to run in the background (admin only)"""
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json() or {}
+        report_type = data.get('report_type')
+        
+        if report_type not in REPORTS:
+            return respond({'error': 'Invalid report type', 'report_types': list(REPORTS)}), 400
+        
+        params = data.get('params') or {}
+        if not isinstance(params, dict):
+            return respond({'error': 'params must be an object'}), 400
+        
+        job = ReportJob.create(report_type, params, user_id)
+        
+        if not job:
+            return respond({'error': 'Failed to queue report'}), 500
+        
+        job_runner.submit(job['job_id'])
+        
+        return respond({
+            'message': 'Report queued',
+            'job': job
+        }), 202
+        
+    except Exception as e:
+        return respond({'error': 'Failed to queue report', 'message': str(e)}), 500
+
+@admin_bp.route('/reports/<int:job_id>', methods=['GET'])
+@role_required('admin')
+def get_report_status(job_id):
+    """Get report job status and progress (admin only)"""
+    try:
+        job = ReportJob.get_by_id(job_id)
+        
+        if not job:
+            return respond({'error': 'Report job not found'}), 404
+        
+        job.pop('result_path', None)
+        return respond({'job': job}), 200
+        
+    except Exception as e:
+        return respond({'error': 'Failed to fetch report job', 'message': str(e)}), 500
+
+@admin_bp.route('/reports/<int:job_id>/download', methods=['GET'])
+@role_required('admin')
+def download_report(job_id):
+    """Download a completed report as CSV (admin only)"""
+    try:
+        job = ReportJob.get_by_id(job_id)
+        
+        if not job:
+            return respond({'error': 'Report job not found'}), 404
+        
+        if job['status'] != 'completed' or not job['result_path'] or not os.path.exists(job['result_path']):
+            return respond({'error': 'Report is not ready', 'status': job['status']}), 409
+        
+        return send_file(job['result_path'], mimetype='text/csv', as_attachment=True,
+                         download_name=os.path.basename(job['result_path']))
+        
+    except Exception as e:
+        return respond({'error': 'Failed to download report', 'message': str(e)}), 500
+
+@admin_bp.route('/reports/<int:job_id>/cancel', methods=['POST'])
+@role_required('admin')
+def cancel_report(job_id):
+    """Cancel a queued or running report job (admin only)"""
+    try:
+        status = ReportJob.request_cancel(job_id, job_runner.stale_after)
+        
+        if status is None:
+            return respond({'error': 'Report job not found'}), 404
+        
+        return respond({
+            'message': 'Cancellation requested' if status == 'running' else f'Report job is {status}',
+            'status': status
+        }), 200
+        
+    except Exception as e:
+        return respond({'error': 'Failed to cancel report', 'message': str(e)}), 500
+
+@admin_bp.route('/slow-queries', methods=['GET'])
+@role_required('admin')
+def get_slow_queries():
+    """Slowest statement fingerprints by total time, with routes, callers and EXPLAIN (admin only)"""
+    try:
+        limit = min(request.args.get('limit', 20, type=int), 100)
+        
+        return respond({
+            'threshold_ms': slow_query_log.threshold * 1000,
+            'fingerprints': slow_query_log.top(limit)
+        }), 200
+        
+    except Exception as e:
+        return respond({'error': 'Failed to fetch slow queries', 'message': str(e)}), 500
+
+@admin_bp.route('/slow-queries', methods=['DELETE'])
+@role_required('admin')
+def reset_slow_queries():
+    """Clear captured slow queries, e.g. after adding an index (admin only)"""
+    slow_query_log.reset()
+    return respond({'message': 'Slow query log cleared'}), 200
+
+@admin_bp.route('/profiles', methods=['GET'])
+@role_required('admin')
+def list_request_profiles():
+    """Recent per-request cProfile/tracemalloc captures (admin only)"""
+    try:
+        limit = min(request.args.get('limit', 50, type=int), 200)
+        return respond({'profiles': list_profiles(current_app.config['PROFILE_DIR'], limit)}), 200
+        
+    except Exception as e:
+        return respond({'error': 'Failed to list profiles', 'message': str(e)}), 500
+
+@admin_bp.route('/profiles/<path:filename>', methods=['GET'])
+@role_required('admin')
+def download_request_profile(filename):
+    """Download a .pstats, .collapsed or .alloc.txt profile file (admin only)"""
+    return send_from_directory(current_app.config['PROFILE_DIR'], filename, as_attachment=True)
+
+@admin_bp.route('/status', methods=['GET'])
+@role_required('admin')
+def get_status():
+    """This worker's connections, cache hit ratios, queue depths and build info (admin only)"""
+    try:
+        return respond(status_report()), 200
+        
+    except Exception as e:
+        return respond({'error': 'Failed to build status', 'message': str(e)}), 500
@@ -1,12 +1,22 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request
 from flask_jwt_extended import get_jwt_identity
-from models.application import Application
-from models.society import Society
+from datetime import datetime, timedelta
+from models.application import (
+    Application, VALID_STATUSES, APPLICATION_DETAIL_FIELDS, APPLICATION_REQUIRED_FIELDS, APPLICATION_RELATIONS,
+    APPLICATION_USER_LIST_FIELDS, APPLICATION_SOCIETY_LIST_FIELDS, APPLICATION_FORM_LIST_FIELDS
+)
 from models.form import Form
-from middleware.auth import jwt_required_custom, role_required
+from middleware.auth import jwt_required_custom, role_required, society_access_required
+from models.access import Access
+from utils.projection import ProjectionError, projection_args
+from utils.search import SearchUnavailableError
+from utils.responses import respond
+from utils.events import sse_response
 
 application_bp = Blueprint('application', __name__)
 
+MAX_BULK_STATUS_UPDATES = 500
+
 @application_bp.route('/', methods=['POST'], strict_slashes=False)
 @application_bp.route('', methods=['POST'], strict_slashes=False)
 @role_required('student')
@@ -18,33 +28,38 @@ def create_application():
         
         # Validate required fields
         if not data.get('form_id'):
-            return jsonify({'error': 'form_id is required'}), 400
+            return respond({'error': 'form_id is required'}), 400
         
         # Get form details to extract society_id
         form = Form.get_by_id(data['form_id'])
         if not form:
-            return jsonify({'error': 'Form not found'}), 404
+            return respond({'error': 'Form not found'}), 404
         
         if form['status'] != 'published':
-            return jsonify({'error': 'Form is not published'}), 400
+            return respond({'error': 'Form is not published'}), 400
+        
+        # Validate responses against the form's questions
+        validator = Form.get_validator(data['form_id'], form)
+        responses, errors = validator.validate(data.get('responses', {}))
+        if errors:
+            return respond({'error': 'Invalid responses', 'fields': errors}), 400
         
         # Create application with responses
-        responses = data.get('responses', {})
         application = Application.create(user_id, form['society_id'], data['form_id'], responses)
         
         if not application:
-            return jsonify({'error': 'Failed to create application'}), 500
+            return respond({'error': 'Failed to create application'}), 500
         
         if isinstance(application, dict) and 'error' in application:
-            return jsonify(application), 409
+            return respond(application), 409
         
-        return jsonify({
+        return respond({
             'message': 'Application submitted successfully',
             'application': application
         }), 201
         
     except Exception as e:
-        return jsonify({'error': 'Failed to submit application', 'message': str(e)}), 500
+        return respond({'error': 'Failed to submit application', 'message': str(e)}), 500
 
 @application_bp.route('/my-applications', methods=['GET'])
 @role_required('student')
@@ -55,9 +70,11 @@ def get_my_applications():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
-        applications, total = Application.get_by_user(user_id, page, per_page)
+        fields, _ = projection_args(request.args, APPLICATION_USER_LIST_FIELDS, required=['application_id'])
+        
+        applications, total = Application.get_by_user(user_id, page, per_page, fields)
         
-        return jsonify({
+        return respond({
             'applications': applications,
             'pagination': {
                 'page': page,
@@ -67,33 +84,32 @@ def get_my_applications():
             }
         }), 200
         
+    except ProjectionError as e:
+        return respond({'error': 'Invalid field selection', 'message': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch applications', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch applications', 'message': str(e)}), 500
+
+@application_bp.route('/my-applications/stream', methods=['GET'])
+@role_required('student', locations=('headers', 'query_string'))
+def stream_my_applications():
+    """Server-sent status changes for the current user's applications (token may be passed as ?jwt=)"""
+    user_id = int(get_jwt_identity())
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    return sse_response(f'user:{user_id}', last_event_id)
 
 @application_bp.route('/society/<int:society_id>', methods=['GET'])
-@role_required('societyHead', 'admin')
+@society_access_required('society', message='You are not authorized to view these applications')
 def get_society_applications(society_id):
     """Get all applications for a society"""
     try:
-        user_id = int(get_jwt_identity())
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         status = request.args.get('status', None)
+        fields, _ = projection_args(request.args, APPLICATION_SOCIETY_LIST_FIELDS, required=['application_id'])
         
-        # Verify ownership or admin
-        from models.user import User
-        current_user = User.get_by_id(user_id)
-        society = Society.get_by_id(society_id)
+        applications, total = Application.get_by_society(society_id, page, per_page, status, fields)
         
-        if not society:
-            return jsonify({'error': 'Society not found'}), 404
-        
-        if current_user['user_role'] != 'admin' and society['society_head_id'] != user_id:
-            return jsonify({'error': 'You are not authorized to view these applications'}), 403
-        
-        applications, total = Application.get_by_society(society_id, page, per_page, status)
-        
-        return jsonify({
+        return respond({
             'applications': applications,
             'pagination': {
                 'page': page,
@@ -103,34 +119,61 @@ def get_society_applications(society_id):
             }
         }), 200
         
+    except ProjectionError as e:
+        return respond({'error': 'Invalid field selection', 'message': str(e)}), 400
+    except Exception as e:
+        return respond({'error': 'Failed to fetch applications', 'message': str(e)}), 500
+
+@application_bp.route('/society/<int:society_id>/search', methods=['GET'])
+@society_access_required('society', message='You are not authorized to search these applications')
+def search_society_applications(society_id):
+    """Full-text search over a society's applications with highlighted snippets"""
+    try:
+        search = request.args.get('q', '').strip()
+        status = request.args.get('status', None)
+        question_id = request.args.get('question_id', None, type=int)
+        after_id = request.args.get('cursor', None, type=int)
+        per_page = max(1, min(request.args.get('per_page', 20, type=int), 100))
+        
+        if not search:
+            return respond({'error': 'Search query (q) is required'}), 400
+        
+        results, next_cursor = Application.search(society_id, search, status, question_id, after_id, per_page)
+        
+        if results is None:
+            return respond({'error': 'Failed to search applications'}), 500
+        
+        return respond({
+            'results': results,
+            'next_cursor': next_cursor
+        }), 200
+        
+    except SearchUnavailableError as e:
+        return respond({'error': 'Search is unavailable', 'message': str(e)}), 503
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch applications', 'message': str(e)}), 500
+        return respond({'error': 'Failed to search applications', 'message': str(e)}), 500
+
+@application_bp.route('/society/<int:society_id>/stream', methods=['GET'])
+@society_access_required('society', message='You are not authorized to view these applications',
+                         locations=('headers', 'query_string'))
+def stream_society_applications(society_id):
+    """Server-sent submissions, status changes and counters for a society, batched over EVENTS_COALESCE_MS"""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    return sse_response(f'society:{society_id}', last_event_id)
 
 @application_bp.route('/form/<int:form_id>', methods=['GET'])
-@role_required('societyHead', 'admin')
+@society_access_required('form', message='You are not authorized to view these applications')
 def get_form_applications(form_id):
     """Get all applications for a form"""
     try:
-        user_id = get_jwt_identity()
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         status = request.args.get('status', None)
+        fields, _ = projection_args(request.args, APPLICATION_FORM_LIST_FIELDS, required=['application_id'])
         
-        # Verify ownership or admin
-        form = Form.get_by_id(form_id)
-        if not form:
-            return jsonify({'error': 'Form not found'}), 404
-        
-        from models.user import User
-        current_user = User.get_by_id(user_id)
-        society = Society.get_by_id(form['society_id'])
-        
-        if current_user['user_role'] != 'admin' and society['society_head_id'] != user_id:
-            return jsonify({'error': 'You are not authorized to view these applications'}), 403
-        
-        applications, total = Application.get_by_form(form_id, page, per_page, status)
+        applications, total = Application.get_by_form(form_id, page, per_page, status, fields)
         
-        return jsonify({
+        return respond({
             'applications': applications,
             'pagination': {
                 'page': page,
@@ -140,41 +183,32 @@ def get_form_applications(form_id):
             }
         }), 200
         
+    except ProjectionError as e:
+        return respond({'error': 'Invalid field selection', 'message': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch applications', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch applications', 'message': str(e)}), 500
 
 @application_bp.route('/<int:application_id>', methods=['GET'])
-@jwt_required_custom
+@society_access_required('application', allow_owner=True, message='You are not authorized to view this application')
 def get_application(application_id):
-    """Get application details"""
+    """Get application details (applicant, society head, or admin)"""
     try:
-        user_id = int(get_jwt_identity())
+        fields, include = projection_args(request.args, APPLICATION_DETAIL_FIELDS, required=APPLICATION_REQUIRED_FIELDS,
+                                          include_allowed=APPLICATION_RELATIONS, include_default=APPLICATION_RELATIONS)
         
-        application = Application.get_by_id(application_id)
+        application = Application.get_by_id(application_id, fields, include)
         if not application:
-            return jsonify({'error': 'Application not found'}), 404
-        
-        # Verify access: owner, society head, or admin
-        from models.user import User
-        current_user = User.get_by_id(user_id)
-        society = Society.get_by_id(application['society_id'])
-        
-        has_access = (
-            application['user_id'] == user_id or
-            current_user['user_role'] == 'admin' or
-            (current_user['user_role'] == 'societyHead' and society['society_head_id'] == user_id)
-        )
+            return respond({'error': 'Application not found'}), 404
         
-        if not has_access:
-            return jsonify({'error': 'You are not authorized to view this application'}), 403
-        
-        return jsonify(application), 200
+        return respond(application), 200
         
+    except ProjectionError as e:
+        return respond({'error': 'Invalid field selection', 'message': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch application', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch application', 'message': str(e)}), 500
 
 @application_bp.route('/<int:application_id>/status', methods=['PUT'])
-@role_required('societyHead', 'admin')
+@society_access_required('application', message='You are not authorized to update this application')
 def update_application_status(application_id):
     """Update application status"""
     try:
@@ -182,55 +216,152 @@ def update_application_status(application_id):
         data = request.get_json()
         
         if not data.get('status'):
-            return jsonify({'error': 'Status is required'}), 400
-        
-        # Verify ownership
-        application = Application.get_by_id(application_id)
-        if not application:
-            return jsonify({'error': 'Application not found'}), 404
-        
-        from models.user import User
-        current_user = User.get_by_id(user_id)
-        society = Society.get_by_id(application['society_id'])
-        
-        if current_user['user_role'] != 'admin' and society['society_head_id'] != user_id:
-            return jsonify({'error': 'You are not authorized to update this application'}), 403
+            return respond({'error': 'Status is required'}), 400
         
-        success = Application.update_status(application_id, data['status'])
+        success = Application.update_status(application_id, data['status'], user_id)
         
         if not success:
-            return jsonify({'error': 'Failed to update application status'}), 500
+            return respond({'error': 'Failed to update application status'}), 500
         
         updated_application = Application.get_by_id(application_id)
-        return jsonify({
+        return respond({
             'message': 'Application status updated successfully',
             'application': updated_application
         }), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to update application', 'message': str(e)}), 500
+        return respond({'error': 'Failed to update application', 'message': str(e)}), 500
 
-@application_bp.route('/statistics/<int:society_id>', methods=['GET'])
-@role_required('societyHead', 'admin')
-def get_application_statistics(society_id):
-    """Get application statistics for a society"""
+@application_bp.route('/<int:application_id>', methods=['DELETE'])
+@society_access_required('application', message='You are not authorized to delete this application')
+def delete_application(application_id):
+    """Delete an application (society head or admin)"""
+    try:
+        success = Application.delete(application_id)
+        
+        if not success:
+            return respond({'error': 'Application not found or failed to delete'}), 404
+        
+        return respond({'message': 'Application deleted successfully'}), 200
+        
+    except Exception as e:
+        return respond({'error': 'Failed to delete application', 'message': str(e)}), 500
+
+@application_bp.route('/status/bulk', methods=['PUT'])
+@jwt_required_custom
+def bulk_update_application_status():
+    """Update the status of many applications at once"""
     try:
         user_id = int(get_jwt_identity())
+        data = request.get_json()
+        status = data.get('status')
+        application_ids = data.get('application_ids') or []
+        
+        if status not in VALID_STATUSES:
+            return respond({'error': 'Invalid status'}), 400
         
-        # Verify ownership or admin
-        from models.user import User
-        current_user = User.get_by_id(user_id)
-        society = Society.get_by_id(society_id)
+        if not isinstance(application_ids, list) or not application_ids:
+            return respond({'error': 'application_ids must be a non-empty list'}), 400
         
-        if not society:
-            return jsonify({'error': 'Society not found'}), 404
+        if len(application_ids) > MAX_BULK_STATUS_UPDATES:
+            return respond({'error': f'At most {MAX_BULK_STATUS_UPDATES} applications per request'}), 400
         
-        if current_user['user_role'] != 'admin' and society['society_head_id'] != user_id:
-            return jsonify({'error': 'You are not authorized to view these statistics'}), 403
+        try:
+            application_ids = sorted({int(application_id) for application_id in application_ids})
+        except (TypeError, ValueError):
+            return respond({'error': 'application_ids must be integers'}), 400
         
+        # Role and ownership of every affected society in one query (admins may update any)
+        access = Access.resolve_applications(user_id, application_ids)
+        if not access:
+            return respond({'error': 'User not found'}), 404
+        
+        if access['user_role'] not in ('societyHead', 'admin'):
+            return respond({'error': 'Access denied', 'message': 'Required role: societyHead, admin'}), 403
+        
+        if access['user_role'] != 'admin' and access['owned'] != access['found']:
+            return respond({'error': 'You are not authorized to update these applications'}), 403
+        
+        updated = Application.bulk_update_status(application_ids, status, user_id)
+        
+        if updated is None:
+            return respond({'error': 'Failed to update application status'}), 500
+        
+        return respond({
+            'message': 'Application statuses updated successfully',
+            'updated': updated
+        }), 200
+        
+    except Exception as e:
+        return respond({'error': 'Failed to update applications', 'message': str(e)}), 500
+
+@application_bp.route('/funnel/<int:society_id>', methods=['GET'])
+@society_access_required('society', message='You are not authorized to view these statistics')
+def get_application_funnel(society_id):
+    """Get status funnel and time-in-status analytics for a society"""
+    try:
+        form_id = request.args.get('form_id', None, type=int)
+        
+        funnel = Application.get_funnel(society_id, form_id)
+        
+        return respond(funnel), 200
+        
+    except Exception as e:
+        return respond({'error': 'Failed to fetch funnel', 'message': str(e)}), 500
+
+@application_bp.route('/statistics/<int:society_id>', methods=['GET'])
+@society_access_required('society', message='You are not authorized to view these statistics')
+def get_application_statistics(society_id):
+    """Get application statistics for a society"""
+    try:
         stats = Application.get_statistics(society_id)
         
-        return jsonify(stats), 200
+        return respond(stats), 200
+        
+    except Exception as e:
+        return respond({'error': 'Failed to fetch statistics', 'message': str(e)}), 500
+
+# Longest range (in buckets) a single timeseries request may cover
+MAX_TIMESERIES_BUCKETS = {'day': 366, 'hour': 24 * 14}
+
+# Days covered when no start is given
+DEFAULT_TIMESERIES_DAYS = {'day': 30, 'hour': 7}
+
+@application_bp.route('/timeseries/<int:society_id>', methods=['GET'])
+@society_access_required('society', message='You are not authorized to view these statistics')
+def get_application_timeseries(society_id):
+    """Get submissions per day/hour for a society from the rollup table"""
+    try:
+        granularity = request.args.get('granularity', 'day')
+        form_id = request.args.get('form_id', None, type=int)
+        
+        if granularity not in MAX_TIMESERIES_BUCKETS:
+            return respond({'error': 'granularity must be day or hour'}), 400
+        
+        # Dates are inclusive YYYY-MM-DD; default to the last 30 days (7 for hourly buckets)
+        try:
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            end = request.args.get('end')
+            end = datetime.strptime(end, '%Y-%m-%d') if end else today
+            start = request.args.get('start')
+            start = (datetime.strptime(start, '%Y-%m-%d') if start
+                     else end - timedelta(days=DEFAULT_TIMESERIES_DAYS[granularity] - 1))
+        except ValueError:
+            return respond({'error': 'start and end must be YYYY-MM-DD'}), 400
+        
+        end = end + timedelta(days=1)
+        step = timedelta(hours=1) if granularity == 'hour' else timedelta(days=1)
+        if start >= end or (end - start) / step > MAX_TIMESERIES_BUCKETS[granularity]:
+            return respond({'error': f'Range must cover 1-{MAX_TIMESERIES_BUCKETS[granularity]} {granularity}s'}), 400
+        
+        series = Application.get_timeseries(society_id, granularity, start, end, form_id)
+        
+        return respond({
+            'granularity': granularity,
+            'start': start.date(),
+            'end': (end - timedelta(days=1)).date(),
+            'series': series
+        }), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch statistics', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch timeseries', 'message': str(e)}), 500
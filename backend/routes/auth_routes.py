@@ -1,7 +1,8 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request
 from flask_jwt_extended import get_jwt_identity
 from middleware.auth import jwt_required_custom
 from controllers.auth_controller import AuthController
+from utils.responses import respond
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -10,14 +11,14 @@ def register():
     """Register a new user"""
     data = request.get_json()
     response, status_code = AuthController.register(data)
-    return jsonify(response), status_code
+    return respond(response), status_code
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """Login user"""
     data = request.get_json()
     response, status_code = AuthController.login(data)
-    return jsonify(response), status_code
+    return respond(response), status_code
 
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required_custom
@@ -25,4 +26,4 @@ def get_profile():
     """Get current user profile"""
     user_id = get_jwt_identity()
     response, status_code = AuthController.get_profile(user_id)
-    return jsonify(response), status_code
+    return respond(response), status_code
@@ -1,8 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request
 from flask_jwt_extended import get_jwt_identity
-from models.form import Form
+from models.form import Form, FORM_DETAIL_FIELDS, FORM_SOCIETY_LIST_FIELDS, FORM_PUBLISHED_FIELDS, FORM_RELATIONS
 from models.society import Society
-from middleware.auth import jwt_required_custom, role_required
+from models.application import Application
+from middleware.auth import jwt_required_custom, role_required, society_access_required
+from utils.projection import ProjectionError, projection_args
+from utils.responses import respond
 
 form_bp = Blueprint('form', __name__)
 
@@ -13,9 +16,11 @@ def get_published_forms():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
-        forms, total = Form.get_published(page, per_page)
+        fields, _ = projection_args(request.args, FORM_PUBLISHED_FIELDS, required=['form_id'])
         
-        return jsonify({
+        forms, total = Form.get_published(page, per_page, fields)
+        
+        return respond({
             'forms': forms,
             'pagination': {
                 'page': page,
@@ -25,22 +30,47 @@ def get_published_forms():
             }
         }), 200
         
+    except ProjectionError as e:
+        return respond({'error': 'Invalid field selection', 'message': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch forms', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch forms', 'message': str(e)}), 500
 
 @form_bp.route('/<int:form_id>', methods=['GET'])
 def get_form(form_id):
     """Get form details (public endpoint)"""
     try:
-        form = Form.get_by_id(form_id)
+        fields, include = projection_args(request.args, FORM_DETAIL_FIELDS, required=['form_id'],
+                                          include_allowed=FORM_RELATIONS, include_default=FORM_RELATIONS)
+        form = Form.get_by_id(form_id, fields, include)
+        
+        if not form:
+            return respond({'error': 'Form not found'}), 404
         
+        return respond(form), 200
+        
+    except ProjectionError as e:
+        return respond({'error': 'Invalid field selection', 'message': str(e)}), 400
+    except Exception as e:
+        return respond({'error': 'Failed to fetch form', 'message': str(e)}), 500
+
+@form_bp.route('/<int:form_id>/analytics', methods=['GET'])
+@society_access_required('form', message='You are not authorized to view these analytics')
+def get_form_analytics(form_id):
+    """Get answer distributions for a form's select questions, cross-tabbed by status"""
+    try:
+        form = Form.get_by_id(form_id)
         if not form:
-            return jsonify({'error': 'Form not found'}), 404
+            return respond({'error': 'Form not found'}), 404
+        
+        analytics = Application.get_answer_distribution(form_id, form['questions'])
         
-        return jsonify(form), 200
+        if analytics is None:
+            return respond({'error': 'Failed to compute analytics'}), 500
+        
+        return respond(analytics), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch form', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch analytics', 'message': str(e)}), 500
 
 @form_bp.route('/', methods=['POST'], strict_slashes=False)
 @form_bp.route('', methods=['POST'], strict_slashes=False)
@@ -53,12 +83,12 @@ def create_form():
         
         # Validate required fields
         if not data.get('title'):
-            return jsonify({'error': 'Title is required'}), 400
+            return respond({'error': 'Title is required'}), 400
         
         # Get society managed by this user
         society = Society.get_by_head(user_id)
         if not society:
-            return jsonify({'error': 'No society found for this user'}), 404
+            return respond({'error': 'No society found for this user'}), 404
         
         form = Form.create(
             society['society_id'],
@@ -67,99 +97,64 @@ def create_form():
         )
         
         if not form:
-            return jsonify({'error': 'Failed to create form'}), 500
+            return respond({'error': 'Failed to create form'}), 500
         
-        return jsonify({
+        return respond({
             'message': 'Form created successfully',
             'form': form
         }), 201
         
     except Exception as e:
-        return jsonify({'error': 'Failed to create form', 'message': str(e)}), 500
+        return respond({'error': 'Failed to create form', 'message': str(e)}), 500
 
 @form_bp.route('/society/<int:society_id>', methods=['GET'])
-@role_required('societyHead', 'admin')
+@society_access_required('society', message='You are not authorized to view these forms')
 def get_society_forms(society_id):
     """Get all forms for a society"""
     try:
-        user_id = int(get_jwt_identity())
-        
-        # Verify ownership or admin
-        from models.user import User
-        current_user = User.get_by_id(user_id)
-        society = Society.get_by_id(society_id)
-        
-        if not society:
-            return jsonify({'error': 'Society not found'}), 404
-        
-        if current_user['user_role'] != 'admin' and society['society_head_id'] != user_id:
-            return jsonify({'error': 'You are not authorized to view these forms'}), 403
+        fields, _ = projection_args(request.args, FORM_SOCIETY_LIST_FIELDS, required=['form_id'])
+        forms = Form.get_by_society(society_id, fields)
         
-        forms = Form.get_by_society(society_id)
-        
-        return jsonify({'forms': forms}), 200
+        return respond({'forms': forms}), 200
         
+    except ProjectionError as e:
+        return respond({'error': 'Invalid field selection', 'message': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch forms', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch forms', 'message': str(e)}), 500
 
 @form_bp.route('/<int:form_id>', methods=['PUT'])
-@role_required('societyHead')
+@society_access_required('form', roles=('societyHead',), message='You are not authorized to update this form')
 def update_form(form_id):
     """Update form details"""
     try:
-        user_id = int(get_jwt_identity())
         data = request.get_json()
         
-        # Verify ownership
-        form = Form.get_by_id(form_id)
-        if not form:
-            return jsonify({'error': 'Form not found'}), 404
-        
-        society = Society.get_by_head(user_id)
-        if not society or society['society_id'] != form['society_id']:
-            return jsonify({'error': 'You are not authorized to update this form'}), 403
-        
         # Update form
         success = Form.update(form_id, **data)
         
         if not success:
-            return jsonify({'error': 'Failed to update form'}), 500
+            return respond({'error': 'Failed to update form'}), 500
         
         updated_form = Form.get_by_id(form_id)
-        return jsonify({
+        return respond({
             'message': 'Form updated successfully',
             'form': updated_form
         }), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to update form', 'message': str(e)}), 500
+        return respond({'error': 'Failed to update form', 'message': str(e)}), 500
 
 @form_bp.route('/<int:form_id>', methods=['DELETE'])
-@role_required('societyHead', 'admin')
+@society_access_required('form', message='You are not authorized to delete this form')
 def delete_form(form_id):
     """Delete a form"""
     try:
-        user_id = int(get_jwt_identity())
-        
-        # Verify ownership
-        form = Form.get_by_id(form_id)
-        if not form:
-            return jsonify({'error': 'Form not found'}), 404
-        
-        from models.user import User
-        current_user = User.get_by_id(user_id)
-        
-        if current_user['user_role'] != 'admin':
-            society = Society.get_by_head(user_id)
-            if not society or society['society_id'] != form['society_id']:
-                return jsonify({'error': 'You are not authorized to delete this form'}), 403
-        
         success = Form.delete(form_id)
         
         if not success:
-            return jsonify({'error': 'Failed to delete form'}), 500
+            return respond({'error': 'Failed to delete form'}), 500
         
-        return jsonify({'message': 'Form deleted successfully'}), 200
+        return respond({'message': 'Form deleted successfully'}), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to delete form', 'message': str(e)}), 500
+        return respond({'error': 'Failed to delete form', 'message': str(e)}), 500
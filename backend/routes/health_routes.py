@@ -0,0 +1,16 @@
+from flask import Blueprint
+from utils.health import readiness
+from utils.responses import respond
+
+health_bp = Blueprint('health', __name__)
+
+@health_bp.route('/healthz', methods=['GET'])
+def liveness():
+    """Liveness: the process is serving requests (checks nothing else)"""
+    return respond({'status': 'ok'}), 200
+
+@health_bp.route('/readyz', methods=['GET'])
+def ready():
+    """Readiness: database round trip + schema and cache checks, cached for a second"""
+    result = readiness()
+    return respond(result), 200 if result['ready'] else 503
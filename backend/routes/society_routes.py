@@ -1,7 +1,9 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request
 from flask_jwt_extended import get_jwt_identity
-from models.society import Society
-from middleware.auth import jwt_required_custom, role_required
+from models.society import Society, SOCIETY_FIELDS, SOCIETY_LIST_FIELDS
+from middleware.auth import jwt_required_custom, role_required, society_access_required
+from utils.projection import ProjectionError, projection_args
+from utils.responses import respond
 
 society_bp = Blueprint('society', __name__)
 
@@ -13,10 +15,14 @@ def browse_societies():
         per_page = request.args.get('per_page', 10, type=int)
         category = request.args.get('category', None)
         admission_open = request.args.get('admission_open', None, type=bool)
+        search = request.args.get('q', None)
         
-        societies, total = Society.get_all(page, per_page, category, admission_open)
+        include_facets = request.args.get('facets', '').lower() in ('1', 'true', 'yes')
+        fields, _ = projection_args(request.args, SOCIETY_LIST_FIELDS, required=['society_id'])
         
-        return jsonify({
+        societies, total = Society.get_all(page, per_page, category, admission_open, search, fields)
+        
+        response = {
             'societies': societies,
             'pagination': {
                 'page': page,
@@ -24,24 +30,34 @@ def browse_societies():
                 'total': total,
                 'pages': (total + per_page - 1) // per_page
             }
-        }), 200
+        }
+        
+        if include_facets:
+            response['facets'] = Society.get_facets(category, admission_open, search)
         
+        return respond(response), 200
+        
+    except ProjectionError as e:
+        return respond({'error': 'Invalid field selection', 'message': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch societies', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch societies', 'message': str(e)}), 500
 
 @society_bp.route('/<int:society_id>', methods=['GET'])
 def get_society(society_id):
     """Get society details (public endpoint)"""
     try:
-        society = Society.get_by_id(society_id)
+        fields, _ = projection_args(request.args, list(SOCIETY_FIELDS), required=['society_id'])
+        society = Society.get_by_id(society_id, fields)
         
         if not society:
-            return jsonify({'error': 'Society not found'}), 404
+            return respond({'error': 'Society not found'}), 404
         
-        return jsonify(society), 200
+        return respond(society), 200
         
+    except ProjectionError as e:
+        return respond({'error': 'Invalid field selection', 'message': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch society', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch society', 'message': str(e)}), 500
 
 @society_bp.route('', methods=['POST'], strict_slashes=False)
 @society_bp.route('/', methods=['POST'], strict_slashes=False)
@@ -56,12 +72,12 @@ def create_society():
         required_fields = ['society_name', 'description', 'category']
         for field in required_fields:
             if field not in data or not data[field]:
-                return jsonify({'error': f'{field} is required'}), 400
+                return respond({'error': f'{field} is required'}), 400
         
         # Check if society head already has a society
         existing = Society.get_by_head(user_id)
         if existing:
-            return jsonify({'error': 'You already manage a society'}), 409
+            return respond({'error': 'You already manage a society'}), 409
         
         society = Society.create(
             data['society_name'],
@@ -75,15 +91,15 @@ def create_society():
         )
         
         if not society:
-            return jsonify({'error': 'Failed to create society'}), 500
+            return respond({'error': 'Failed to create society'}), 500
         
-        return jsonify({
+        return respond({
             'message': 'Society created successfully',
             'society': society
         }), 201
         
     except Exception as e:
-        return jsonify({'error': 'Failed to create society', 'message': str(e)}), 500
+        return respond({'error': 'Failed to create society', 'message': str(e)}), 500
 
 @society_bp.route('/my-society', methods=['GET'])
 @role_required('societyHead')
@@ -94,47 +110,34 @@ def get_my_society():
         society = Society.get_by_head(user_id)
         
         if not society:
-            return jsonify({'society': None, 'message': 'No society assigned yet'}), 200
+            return respond({'society': None, 'message': 'No society assigned yet'}), 200
         
-        return jsonify({'society': society}), 200
+        return respond({'society': society}), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch society', 'message': str(e)}), 500
+        return respond({'error': 'Failed to fetch society', 'message': str(e)}), 500
 
 @society_bp.route('/<int:society_id>', methods=['PUT'])
-@role_required('societyHead', 'admin')
+@society_access_required('society', message='You are not authorized to update this society')
 def update_society(society_id):
-    """Update society details"""
+    """Update society details (its head, or an admin)"""
     try:
-        user_id = int(get_jwt_identity())
         data = request.get_json()
         
-        # Verify ownership
-        society = Society.get_by_id(society_id)
-        if not society:
-            return jsonify({'error': 'Society not found'}), 404
-        
-        # Check if user is the head of this society (or admin can update any)
-        from models.user import User
-        current_user = User.get_by_id(user_id)
-        
-        if current_user['user_role'] != 'admin' and society['society_head_id'] != user_id:
-            return jsonify({'error': 'You are not authorized to update this society'}), 403
-        
         # Update society
         success = Society.update(society_id, **data)
         
         if not success:
-            return jsonify({'error': 'Failed to update society'}), 500
+            return respond({'error': 'Failed to update society'}), 500
         
         updated_society = Society.get_by_id(society_id)
-        return jsonify({
+        return respond({
             'message': 'Society updated successfully',
             'society': updated_society
         }), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to update society', 'message': str(e)}), 500
+        return respond({'error': 'Failed to update society', 'message': str(e)}), 500
 
 @society_bp.route('/<int:society_id>', methods=['DELETE'])
 @role_required('admin')
@@ -144,9 +147,9 @@ def delete_society(society_id):
         success = Society.delete(society_id)
         
         if not success:
-            return jsonify({'error': 'Society not found or failed to delete'}), 404
+            return respond({'error': 'Society not found or failed to delete'}), 404
         
-        return jsonify({'message': 'Society deleted successfully'}), 200
+        return respond({'message': 'Society deleted successfully'}), 200
         
     except Exception as e:
-        return jsonify({'error': 'Failed to delete society', 'message': str(e)}), 500
+        return respond({'error': 'Failed to delete society', 'message': str(e)}), 500
@@ -0,0 +1,67 @@
+"""
+Query-count checks for utils.profiler. Run from backend/:
+
+    python -m unittest discover tests    (or: python -m pytest tests)
+
+An in-memory sqlite3 connection wrapped in InstrumentedConnection feeds the
+same query hooks as MySQL connections from config.db, so these run without a
+database. Endpoint tests cap a route the same way, around a test-client call:
+
+    with assert_max_queries(3):
+        client.get('/api/forms/published', headers=auth)
+"""
+import sqlite3
+import threading
+import unittest
+from utils.instrumentation import InstrumentedConnection
+from utils.profiler import assert_max_queries, capture_queries
+
+def run_statements(connection):
+    """Three statements: create, insert, select"""
+    cursor = connection.cursor()
+    cursor.execute("CREATE TABLE forms (form_id INTEGER PRIMARY KEY, title TEXT)")
+    cursor.execute("INSERT INTO forms (title) VALUES (?)", ('Auditions',))
+    cursor.execute("SELECT title FROM forms WHERE form_id = ?", (1,))
+    return cursor.fetchall()
+
+class QueryCountTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = InstrumentedConnection(sqlite3.connect(':memory:', check_same_thread=False))
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_capture_queries_records_each_statement(self):
+        with capture_queries() as queries:
+            rows = run_statements(self.connection)
+
+        self.assertEqual(rows, [('Auditions',)])
+        self.assertEqual(len(queries), 3)
+        self.assertTrue(queries[1]['sql'].startswith('INSERT INTO forms'))
+        self.assertEqual(queries[1]['caller'], 'run_statements')
+
+    def test_capture_queries_ignores_other_threads(self):
+        with capture_queries() as queries:
+            worker = threading.Thread(target=run_statements, args=(self.connection,))
+            worker.start()
+            worker.join()
+
+        self.assertEqual(queries, [])
+
+    def test_assert_max_queries_passes_at_the_limit(self):
+        with assert_max_queries(3) as queries:
+            run_statements(self.connection)
+
+        self.assertEqual(len(queries), 3)
+
+    def test_assert_max_queries_lists_statements_over_the_limit(self):
+        with self.assertRaises(AssertionError) as raised:
+            with assert_max_queries(2):
+                run_statements(self.connection)
+
+        message = str(raised.exception)
+        self.assertIn('Expected at most 2 queries, got 3', message)
+        self.assertIn('SELECT title FROM forms', message)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import numpy as np
+
+def count_option_codes(option_codes, status_codes, option_count, status_count):
+    """
+    Vectorised distribution + cross-tab for one select question.
+    option_codes: 0 = answer not in the option list, 1..option_count = option index.
+    status_codes: 0..status_count-1 (index into VALID_STATUSES).
+    Returns (counts, crosstab) where crosstab has shape (option_count + 1, status_count).
+    """
+    cells = (option_count + 1) * status_count
+    if len(option_codes) == 0:
+        crosstab = np.zeros((option_count + 1, status_count), dtype=np.int64)
+    else:
+        # One bincount over the combined (option, status) cell index
+        crosstab = np.bincount(option_codes * status_count + status_codes, minlength=cells)
+        crosstab = crosstab.reshape(option_count + 1, status_count)
+    return crosstab.sum(axis=1), crosstab
+
+def codes_from_rows(batches, columns):
+    """Stack streamed integer row batches into an (n, columns) int64 array (converted per batch, in C)"""
+    arrays = [np.asarray(batch, dtype=np.int64).reshape(-1, columns) for batch in batches if len(batch)]
+    if not arrays:
+        return np.empty((0, columns), dtype=np.int64)
+    return np.concatenate(arrays)
@@ -0,0 +1,48 @@
+import hashlib
+import json
+import os
+import re
+
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 10
+
+# css/styles.3f9a0c1b2d.css -> fingerprinted copy written by the asset build
+FINGERPRINTED = re.compile(r'\.[0-9a-f]{%d}(\.[^./]+)$' % HASH_LENGTH)
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'  # cache, but revalidate (ETag/Last-Modified) before each use
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+def fingerprinted_name(relpath, digest):
+    """css/styles.css + digest -> css/styles.<digest>.css"""
+    base, extension = os.path.splitext(relpath)
+    return f'{base}.{digest}{extension}'
+
+def is_fingerprinted(filename):
+    return FINGERPRINTED.search(filename) is not None
+
+def load_manifest(static_folder):
+    """{source path: fingerprinted path} from the last asset build, or {} when there hasn't been one"""
+    try:
+        with open(os.path.join(static_folder, MANIFEST_NAME)) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+def cache_control(filename):
+    """Fingerprinted files never change under their name; anything else must be revalidated"""
+    return IMMUTABLE if is_fingerprinted(filename) else REVALIDATE
+
+def init_assets(app):
+    """Expose asset_url() to templates: the fingerprinted URL when the manifest has one"""
+    from flask import url_for
+
+    manifest = load_manifest(app.static_folder)
+
+    def asset_url(filename):
+        return url_for('static', filename=manifest.get(filename, filename))
+
+    app.add_template_global(asset_url)
+    return manifest
@@ -0,0 +1,73 @@
+import threading
+import time
+
+class LocalCache:
+    """Small thread-safe in-process cache with optional per-entry TTL"""
+
+    _instances = []
+
+    def __init__(self, name, ttl=None, max_entries=1024):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+        self._lock = threading.Lock()
+        LocalCache._instances.append(self)
+
+    @classmethod
+    def instances(cls):
+        """Every cache created in this process (for metrics and health reporting)"""
+        return list(cls._instances)
+
+    def get(self, key, default=None):
+        """Return cached value for key, or default if missing/expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """Store value under key"""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.max_entries:
+                # Drop the oldest entry (dicts keep insertion order)
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (value, expires_at)
+
+    def invalidate(self, key):
+        """Remove a single key"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def ping(self, timeout=0.1):
+        """True if the cache lock can be taken within timeout (readiness probe)"""
+        if not self._lock.acquire(timeout=timeout):
+            return False
+        self._lock.release()
+        return True
+
+    def stats(self):
+        """Return size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None
+            }
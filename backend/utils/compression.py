@@ -0,0 +1,136 @@
+import gzip
+import mimetypes
+import os
+import zlib
+from flask import request, send_from_directory
+from utils.assets import cache_control
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional
+    zstandard = None
+
+DEFAULT_SETTINGS = {
+    'COMPRESS_MIN_SIZE': 1024,  # bytes; smaller bodies aren't worth the CPU
+    'COMPRESS_LEVELS': {'zstd': 3, 'br': 4, 'gzip': 6},
+    'COMPRESS_MIMETYPES': {
+        'application/json', 'application/msgpack', 'text/csv',
+        'text/html', 'text/plain', 'text/css', 'application/javascript'
+    },
+}
+
+# Preference order when the client accepts several encodings equally
+ENCODINGS = [name for name, module in (('zstd', zstandard), ('br', brotli), ('gzip', zlib)) if module]
+
+# Pre-compressed sibling file suffix per encoding
+STATIC_SUFFIXES = {'zstd': '.zst', 'br': '.br', 'gzip': '.gz'}
+
+def negotiate_encoding(available=ENCODINGS):
+    """Pick the best encoding from Accept-Encoding (honours q-values), or None"""
+    accept = request.accept_encodings
+    best, best_quality = None, 0
+    for encoding in available:
+        quality = accept[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress_bytes(data, encoding, level):
+    """One-shot compression of a complete body"""
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    raise ValueError(f'Unsupported encoding: {encoding}')
+
+def compress_stream(chunks, encoding, level):
+    """Compress an iterable of chunks incrementally, flushing after each one"""
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        process, flush = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+        finish = compressor.flush
+    elif encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        process = compressor.compress
+        flush = lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        finish = compressor.flush
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = process(chunk) + flush()
+        if data:
+            yield data
+    tail = finish()
+    if tail:
+        yield tail
+
+def compress_response(response, settings):
+    """after_request hook: compress eligible responses in the negotiated encoding"""
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in settings['COMPRESS_MIMETYPES']):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if not encoding:
+        return response
+    level = settings['COMPRESS_LEVELS'][encoding]
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < settings['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(compress_bytes(data, encoding, level))
+
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+def serve_static(filename):
+    """
+    Static file view that serves a pre-compressed sibling (.zst/.br/.gz) when
+    one exists. Fingerprinted assets are cached as immutable; other files are
+    revalidated.
+    """
+    from flask import current_app
+    static_folder = current_app.static_folder
+    path = os.path.join(static_folder, filename)
+
+    available = [encoding for encoding in ENCODINGS
+                 if os.path.isfile(path + STATIC_SUFFIXES[encoding])]
+    encoding = negotiate_encoding(available) if available else None
+
+    if encoding is None:
+        response = send_from_directory(static_folder, filename)
+    else:
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = send_from_directory(static_folder, filename + STATIC_SUFFIXES[encoding], mimetype=mimetype)
+        response.headers['Content-Encoding'] = encoding
+    if available:
+        response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = cache_control(filename)
+    return response
+
+def init_compression(app):
+    """Register response compression and the pre-compressed static file view"""
+    for key, value in DEFAULT_SETTINGS.items():
+        app.config.setdefault(key, value)
+
+    settings = {key: app.config[key] for key in DEFAULT_SETTINGS}
+    app.after_request(lambda response: compress_response(response, settings))
+    app.view_functions['static'] = serve_static
@@ -0,0 +1,360 @@
+"""
+In-process publish/subscribe feeding server-sent event (SSE) streams.
+
+Models publish to a topic ('user:<id>') after their transaction commits;
+every open stream subscribed to that topic receives the event. Feeds that
+would otherwise fire per row ('society:<id>') go through a Coalescer, which
+batches a key's changes over EVENTS_COALESCE_MS into one event. Each topic
+keeps its last EVENTS_REPLAY events so a reconnecting EventSource (which
+sends Last-Event-ID) resumes without gaps; when the id has aged out the
+client is sent a 'resync' event and should refetch.
+
+With several workers, set EVENTS_BACKEND / COLLEXO_EVENTS_BACKEND to a
+redis:// URL: events are then broadcast through Redis and delivered by every
+worker, the publishing one included, so replay buffers and ids agree.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'EVENTS_BACKEND': os.environ.get('COLLEXO_EVENTS_BACKEND', 'local'),  # 'local' or a redis:// URL
+    'EVENTS_CHANNEL': 'collexo:events',  # Redis pub/sub channel shared by the workers
+    'EVENTS_REPLAY': 100,  # events kept per topic for Last-Event-ID resume
+    'EVENTS_MAX_TOPICS': 5000,  # topics with a replay buffer; least recently published dropped first
+    'EVENTS_QUEUE_SIZE': 100,  # per stream; a client this far behind is told to resync
+    'EVENTS_HEARTBEAT': 15,  # seconds between keep-alive comments on an idle stream
+    'EVENTS_STREAM_LIFETIME': 300,  # seconds before a stream ends and the browser reconnects
+    # Open streams per worker, each holding a request thread; more are refused with 503 + Retry-After
+    'EVENTS_MAX_STREAMS': int(os.environ.get('COLLEXO_EVENTS_MAX_STREAMS', '100')),
+    'EVENTS_RETRY_MS': 3000,  # reconnect delay suggested to EventSource
+    'EVENTS_COALESCE_MS': 1000,  # window over which coalesced feeds (society dashboards) batch changes
+}
+
+def _json_default(value):
+    """ISO-8601 for dates/datetimes (parsed by Date in every browser), str() for anything else"""
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+def new_event_id():
+    """Unique across workers; assigned once where the event is published"""
+    return f'{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}'
+
+def format_sse(event=None, comment=None, retry=None):
+    """One text/event-stream message"""
+    lines = []
+    if comment is not None:
+        lines.append(f': {comment}')
+    if retry is not None:
+        lines.append(f'retry: {retry}')
+    if event is not None:
+        if 'id' in event:
+            lines.append(f"id: {event['id']}")
+        lines.append(f"event: {event['type']}")
+        lines.append(f"data: {json.dumps(event['data'], default=_json_default, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+class Subscription:
+    """A stream's bounded inbox for one topic"""
+
+    def __init__(self, broker, topic, maxsize):
+        self.broker = broker
+        self.topic = topic
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize)
+
+    def put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout):
+        """The next event, or None after timeout seconds"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+class LocalBackend:
+    """Single worker: published events are delivered straight back to the broker"""
+    name = 'local'
+
+    def __init__(self, deliver):
+        self._deliver = deliver
+
+    def send(self, event):
+        self._deliver(event)
+
+    def close(self):
+        pass
+
+class RedisBackend:
+    """Broadcasts through a Redis channel; a listener thread delivers every worker's events locally"""
+    name = 'redis'
+
+    def __init__(self, deliver, url, channel):
+        self._deliver = deliver
+        self.channel = channel
+        self._client = redis.Redis.from_url(url)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{channel: self._on_message})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def send(self, event):
+        self._client.publish(self.channel, json.dumps(event, default=_json_default))
+
+    def _on_message(self, message):
+        try:
+            self._deliver(json.loads(message['data']))
+        except ValueError as e:
+            logger.error("Discarding malformed event: %s", e)
+
+    def close(self):
+        self._thread.stop()
+        self._pubsub.close()
+
+class EventBroker:
+    """
+    Fans events out to the subscriptions of their topic and keeps a replay
+    buffer per topic. publish() never blocks on a slow subscriber: its
+    inbox overflows and the stream ends with a 'resync'. At most max_streams
+    subscriptions are open at once (None: no limit).
+    """
+
+    def __init__(self, replay=100, max_topics=5000, queue_size=100, max_streams=None):
+        self.replay = replay
+        self.max_topics = max_topics
+        self.queue_size = queue_size
+        self.max_streams = max_streams
+        self._streams = 0
+        self._subscribers = {}
+        self._history = OrderedDict()
+        self._lock = threading.Lock()
+        self.backend = LocalBackend(self.deliver)
+
+    def configure(self, replay, max_topics, queue_size, backend='local', channel='collexo:events', max_streams=None):
+        self.replay = replay
+        self.max_topics = max_topics
+        self.queue_size = queue_size
+        self.max_streams = max_streams
+        self.backend.close()
+        if backend.startswith(('redis://', 'rediss://', 'unix://')):
+            if redis is None:
+                raise RuntimeError('EVENTS_BACKEND is a Redis URL but the redis package is not installed')
+            self.backend = RedisBackend(self.deliver, backend, channel)
+        else:
+            self.backend = LocalBackend(self.deliver)
+
+    def publish(self, topic, event_type, data):
+        """Send an event to every stream on topic, in any worker. Never raises."""
+        event = {'id': new_event_id(), 'topic': topic, 'type': event_type, 'data': data}
+        try:
+            self.backend.send(event)
+        except Exception as e:
+            logger.error("Error publishing %s event to %s: %s", event_type, topic, e)
+        return event
+
+    def deliver(self, event):
+        """Record an event (local or from another worker) and hand it to this worker's subscribers"""
+        topic = event['topic']
+        with self._lock:
+            history = self._history.get(topic)
+            if history is None:
+                history = self._history[topic] = deque(maxlen=self.replay)
+                if len(self._history) > self.max_topics:
+                    self._history.popitem(last=False)
+            else:
+                self._history.move_to_end(topic)
+            history.append(event)
+            subscribers = tuple(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def subscribe(self, topic, last_event_id=None):
+        """
+        (subscription, backlog): backlog holds the events after last_event_id,
+        or is None when that id is no longer buffered and the client must resync.
+        subscription is None when max_streams are already open.
+        """
+        subscription = Subscription(self, topic, self.queue_size)
+        with self._lock:
+            if self.max_streams is not None and self._streams >= self.max_streams:
+                return None, None
+            self._streams += 1
+            self._subscribers.setdefault(topic, set()).add(subscription)
+            history = list(self._history.get(topic, ()))
+        if not last_event_id:
+            return subscription, []
+        for position, event in enumerate(history):
+            if event['id'] == last_event_id:
+                return subscription, history[position + 1:]
+        return subscription, None
+
+    def latest_id(self, topic):
+        """Id of the newest buffered event on topic, or '' when there is none"""
+        with self._lock:
+            history = self._history.get(topic)
+            return history[-1]['id'] if history else ''
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is not None and subscription in subscribers:
+                subscribers.discard(subscription)
+                self._streams -= 1
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.backend.name,
+                'topics': len(self._history),
+                'streams': self._streams,
+                'max_streams': self.max_streams,
+            }
+
+broker = EventBroker()
+
+class Coalescer:
+    """
+    Batches items per key over a window and hands each batch to
+    flush(key, items, count) on a background thread: the first add() for a
+    key opens a window, later adds within it join the batch. At most
+    max_items are kept per batch; count is the number added.
+    """
+    _all = []
+
+    def __init__(self, flush, window=1.0, max_items=50):
+        self.flush = flush
+        self.window = window
+        self.max_items = max_items
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        Coalescer._all.append(self)
+
+    @classmethod
+    def instances(cls):
+        return list(cls._all)
+
+    def add(self, key, item):
+        with self._cond:
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = {'due': time.monotonic() + self.window, 'items': [], 'count': 0}
+                self._cond.notify()
+            batch['count'] += 1
+            if len(batch['items']) < self.max_items:
+                batch['items'].append(item)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='event-coalescer', daemon=True)
+                self._thread.start()
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                key, batch = min(self._pending.items(), key=lambda entry: entry[1]['due'])
+                delay = batch['due'] - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                del self._pending[key]
+            try:
+                self.flush(key, batch['items'], batch['count'])
+            except Exception as e:
+                logger.error("Error flushing coalesced events for %s: %s", key, e)
+
+def resync_event(subscription):
+    """
+    'resync' carrying the newest buffered id: the client refetches, and its
+    next reconnect resumes from there rather than from an id that is gone
+    ('' clears Last-Event-ID when the topic has no history).
+    """
+    return {'id': subscription.broker.latest_id(subscription.topic), 'type': 'resync', 'data': {}}
+
+def event_stream(subscription, backlog, heartbeat=15, lifetime=300, retry=3000):
+    """
+    Generator of SSE messages for a subscription: the reconnect delay, the
+    backlog (or a resync), then live events with heartbeat comments while
+    idle. Ends after lifetime seconds, or on overflow, so the browser
+    reconnects with Last-Event-ID; the subscription is closed either way.
+    """
+    try:
+        yield format_sse(retry=retry)
+        if backlog is None:
+            yield format_sse(resync_event(subscription))
+        else:
+            for event in backlog:
+                yield format_sse(event)
+
+        deadline = time.monotonic() + lifetime
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            event = subscription.get(min(heartbeat, remaining))
+            if subscription.overflowed:
+                yield format_sse(resync_event(subscription))
+                return
+            yield format_sse(event) if event is not None else format_sse(comment='heartbeat')
+    finally:
+        subscription.close()
+
+def sse_response(topic, last_event_id=None):
+    """
+    text/event-stream Response subscribed to topic (call inside a request);
+    503 with Retry-After when this worker already has EVENTS_MAX_STREAMS open
+    """
+    from flask import Response, current_app
+    from utils.responses import respond
+
+    config = current_app.config
+    subscription, backlog = broker.subscribe(topic, last_event_id)
+    if subscription is None:
+        response = respond({'error': 'Too many open event streams', 'retry': config['EVENTS_RETRY_MS']})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(-(-config['EVENTS_RETRY_MS'] // 1000))
+        return response
+    response = Response(
+        event_stream(subscription, backlog, config['EVENTS_HEARTBEAT'],
+                     config['EVENTS_STREAM_LIFETIME'], config['EVENTS_RETRY_MS']),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx: flush each event instead of buffering
+    # Frees the stream slot even when the client goes away before the generator starts
+    response.call_on_close(subscription.close)
+    return response
+
+def init_events(app):
+    """Pub/sub for SSE streams; EVENTS_BACKEND selects in-process or Redis broadcast"""
+    for key, value in DEFAULT_SETTINGS.items():
+        app.config.setdefault(key, value)
+    broker.configure(app.config['EVENTS_REPLAY'], app.config['EVENTS_MAX_TOPICS'],
+                     app.config['EVENTS_QUEUE_SIZE'], app.config['EVENTS_BACKEND'],
+                     app.config['EVENTS_CHANNEL'], app.config['EVENTS_MAX_STREAMS'])
+    for coalescer in Coalescer.instances():
+        coalescer.window = app.config['EVENTS_COALESCE_MS'] / 1000
+    return broker
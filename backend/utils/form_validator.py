@@ -0,0 +1,97 @@
+from utils.validators import EMAIL_PATTERN, PHONE_PATTERN, NUMBER_PATTERN
+
+MAX_RESPONSE_LENGTH = 5000
+
+# question_type -> (compiled pattern, error message)
+TYPE_PATTERNS = {
+    'email': (EMAIL_PATTERN, 'Must be a valid email address'),
+    'tel': (PHONE_PATTERN, 'Must be a valid phone number'),
+    'number': (NUMBER_PATTERN, 'Must be a number'),
+}
+
+def parse_options(options):
+    """Split a comma-separated options column into a tuple of choices"""
+    if not options:
+        return ()
+    return tuple(option.strip() for option in options.split(',') if option.strip())
+
+class CompiledField:
+    """Pre-parsed validation rules for a single form question"""
+    __slots__ = ('question_id', 'key', 'required', 'pattern', 'message', 'options')
+
+    def __init__(self, question):
+        self.question_id = int(question['question_id'])
+        self.key = str(self.question_id)
+        self.required = bool(question.get('is_required'))
+        question_type = question.get('question_type') or 'text'
+        self.pattern, self.message = TYPE_PATTERNS.get(question_type, (None, None))
+        self.options = None
+        if question_type == 'select':
+            self.options = frozenset(parse_options(question.get('options')))
+
+    def check(self, value):
+        """Return an error message for value, or None if it is valid"""
+        if len(value) > MAX_RESPONSE_LENGTH:
+            return f'Must be at most {MAX_RESPONSE_LENGTH} characters'
+        if self.pattern is not None and self.pattern.match(value) is None:
+            return self.message
+        if self.options and value not in self.options:
+            return 'Must be one of the listed options'
+        return None
+
+class CompiledFormValidator:
+    """Validates submitted responses against a form's questions"""
+    __slots__ = ('form_id', 'fields', 'field_map')
+
+    def __init__(self, form_id, questions):
+        self.form_id = form_id
+        self.fields = tuple(CompiledField(question) for question in questions)
+        self.field_map = {field.key: field for field in self.fields}
+
+    def validate(self, responses):
+        """
+        Validate a responses dict keyed by question_id.
+        Returns (cleaned, errors): cleaned maps int question_id -> answer text,
+        errors maps question_id -> message (empty when valid).
+        """
+        if responses is None:
+            responses = {}
+        if not isinstance(responses, dict):
+            return {}, {'responses': 'Responses must be an object keyed by question ID'}
+
+        errors = {}
+        field_map = self.field_map
+        submitted = {}
+
+        for question_id, value in responses.items():
+            key = str(question_id)
+            if key not in field_map:
+                errors[key] = 'Unknown question for this form'
+                continue
+            if value is None:
+                value = ''
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = str(value)
+            elif not isinstance(value, str):
+                errors[key] = 'Response must be a string'
+                continue
+            submitted[key] = value.strip()
+
+        cleaned = {}
+        for field in self.fields:
+            value = submitted.get(field.key, '')
+            if not value:
+                if field.required and field.key not in errors:
+                    errors[field.key] = 'This question is required'
+                continue
+            message = field.check(value)
+            if message:
+                errors[field.key] = message
+            else:
+                cleaned[field.question_id] = value
+
+        return cleaned, errors
+
+def compile_form_validator(form_id, questions):
+    """Build a reusable validator from a form's question rows"""
+    return CompiledFormValidator(form_id, questions or [])
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import platform
+import socket
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+
+READINESS_TTL = 1.0  # seconds a readiness result is reused, so probes never add load
+
+STARTED_AT = datetime.now(timezone.utc)
+_started = time.monotonic()
+
+_readiness = {'checked_at': None, 'result': None}
+_readiness_lock = threading.Lock()
+_build_info = None
+
+def check_database():
+    """One round trip that also verifies the schema: required tables and columns exist"""
+    from config.db import get_connection, missing_schema, schema_columns
+    from mysql.connector import Error
+
+    start = time.perf_counter()
+    connection = get_connection()
+    if not connection:
+        return {'ok': False, 'error': 'connection failed'}
+
+    cursor = connection.cursor()
+    try:
+        columns = schema_columns(cursor)
+    except Error as e:
+        return {'ok': False, 'error': str(e)}
+    finally:
+        cursor.close()
+        connection.close()
+
+    missing = missing_schema(columns)
+    return {
+        'ok': not missing,
+        'latency_ms': round((time.perf_counter() - start) * 1000, 2),
+        # Identifies the schema a worker sees, so workers can be compared after a migration
+        'schema_version': hashlib.sha1(repr(sorted(columns)).encode('utf-8')).hexdigest()[:12],
+        'missing': missing,
+    }
+
+def check_caches():
+    from utils.cache import LocalCache
+    unreachable = [cache.name for cache in LocalCache.instances() if not cache.ping()]
+    return {'ok': not unreachable, 'backend': 'in-process', 'unreachable': unreachable}
+
+def readiness():
+    """
+    Database and cache checks, run at most once per READINESS_TTL: concurrent
+    probes wait for the one in flight and share its result.
+    """
+    with _readiness_lock:
+        now = time.monotonic()
+        if _readiness['checked_at'] is not None and now - _readiness['checked_at'] < READINESS_TTL:
+            return _readiness['result']
+
+        checks = {'database': check_database(), 'caches': check_caches()}
+        result = {
+            'ready': all(check['ok'] for check in checks.values()),
+            'checks': checks,
+            'checked_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        _readiness['checked_at'] = time.monotonic()
+        _readiness['result'] = result
+        return result
+
+def build_info():
+    """Commit, versions and host; COLLEXO_BUILD_SHA overrides asking git"""
+    global _build_info
+    if _build_info is None:
+        sha = os.environ.get('COLLEXO_BUILD_SHA')
+        if not sha:
+            try:
+                sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                     timeout=2, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+            except (OSError, subprocess.SubprocessError):
+                sha = None
+        _build_info = {
+            'commit': sha or 'unknown',
+            'python': platform.python_version(),
+            'flask': metadata.version('flask'),
+            'host': socket.gethostname(),
+            'pid': os.getpid(),
+            'started_at': STARTED_AT.isoformat(timespec='seconds'),
+        }
+    return _build_info
+
+def status_report():
+    """Connections, caches, queues and build info for this worker"""
+    from utils.cache import LocalCache
+    from utils.events import Coalescer, broker
+    from utils.instrumentation import open_connections
+    from utils.job_runner import job_runner
+    from utils.metrics import DB_CONNECT_ERRORS, DB_CONNECT_LATENCY
+    from utils.slow_queries import slow_query_log
+    from utils.structured_logging import dropped_records, log_queue_depth
+
+    connect = DB_CONNECT_LATENCY.values().get((), [0, 0.0])
+    connects = sum(connect[:-1])
+    return {
+        'build': build_info(),
+        'uptime_seconds': round(time.monotonic() - _started),
+        'database': {
+            'pooled': False,  # every model call opens its own connection
+            'connections_open': open_connections(),
+            'connects_total': connects,
+            'connect_avg_ms': round(connect[-1] / connects * 1000, 2) if connects else None,
+            'connect_errors_total': DB_CONNECT_ERRORS.values().get((), 0),
+        },
+        'caches': [cache.stats() for cache in LocalCache.instances()],
+        'queues': {
+            'report_jobs': job_runner.queue_depth(),
+            'log_records': log_queue_depth(),
+            'log_records_dropped': dropped_records(),
+            'slow_query_explains': slow_query_log.queue_depth(),
+            'coalesced_event_batches': sum(coalescer.pending() for coalescer in Coalescer.instances()),
+        },
+        'event_streams': broker.stats(),
+        'readiness': _readiness['result'],
+    }
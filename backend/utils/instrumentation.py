@@ -0,0 +1,133 @@
+import os
+import re
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(BACKEND_DIR, 'models') + os.sep
+_THIS_FILE = os.path.abspath(__file__)
+
+# Callables hook(sql, params, duration_seconds, call_site) run after every
+# statement executed through get_connection(). Kept as a tuple so the hot
+# path iterates without a lock; add_query_hook swaps in a new tuple.
+_query_hooks = ()
+_hooks_lock = threading.Lock()
+
+# Connection accounting: every get_connection() opens a fresh connection
+# (there is no pool), so "in use" is simply opened - closed.
+_connections = {'opened': 0, 'closed': 0}
+_connections_lock = threading.Lock()
+
+# Per-thread statement count for the request being served
+_request_state = threading.local()
+
+def add_query_hook(hook):
+    """Register hook(sql, params, duration, call_site) for every executed statement"""
+    global _query_hooks
+    with _hooks_lock:
+        if hook not in _query_hooks:
+            _query_hooks = _query_hooks + (hook,)
+
+def remove_query_hook(hook):
+    global _query_hooks
+    with _hooks_lock:
+        _query_hooks = tuple(h for h in _query_hooks if h is not hook)
+
+def call_site():
+    """
+    (caller, file, line) of the model method that issued the statement, e.g.
+    ('Application.get_by_society', 'models/application.py', 312). Falls back
+    to the first frame outside this module and mysql.connector.
+    """
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(MODELS_DIR):
+            break
+        if fallback is None and filename != _THIS_FILE and 'mysql' not in filename:
+            fallback = frame
+        frame = frame.f_back
+    frame = frame or fallback
+    if frame is None:
+        return ('unknown', '', 0)
+    code = frame.f_code
+    return (getattr(code, 'co_qualname', code.co_name),
+            os.path.relpath(code.co_filename, BACKEND_DIR), frame.f_lineno)
+
+# Query parameters holding credentials (EventSource streams pass the JWT as ?jwt=)
+_SECRET_PARAMS = re.compile(r'((?:^|[?&])jwt=)[^&]*')
+
+def redact_query(target):
+    """Path or query string with credential parameters masked, for profiles and traces"""
+    return _SECRET_PARAMS.sub(r'\1[redacted]', target)
+
+def begin_request():
+    """Reset this thread's statement counter (called at the start of each request)"""
+    _request_state.queries = 0
+
+def request_query_count():
+    return getattr(_request_state, 'queries', 0)
+
+def open_connections():
+    with _connections_lock:
+        return _connections['opened'] - _connections['closed']
+
+def _record(sql, params, duration):
+    _request_state.queries = getattr(_request_state, 'queries', 0) + 1
+    hooks = _query_hooks
+    if hooks:
+        site = call_site()
+        for hook in hooks:
+            hook(sql, params, duration, site)
+
+class InstrumentedCursor:
+    """Cursor proxy that times execute/executemany and reports to the query hooks"""
+    __slots__ = ('_cursor',)
+    
+    def __init__(self, cursor):
+        self._cursor = cursor
+    
+    def execute(self, operation, params=(), *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            _record(operation, params, time.perf_counter() - start)
+    
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            _record(operation, seq_params, time.perf_counter() - start)
+    
+    def __iter__(self):
+        return iter(self._cursor)
+    
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class InstrumentedConnection:
+    """Connection proxy handing out instrumented cursors and tracking open connections"""
+    __slots__ = ('_connection', '_closed')
+    
+    def __init__(self, connection):
+        self._connection = connection
+        self._closed = False
+        with _connections_lock:
+            _connections['opened'] += 1
+    
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs))
+    
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            with _connections_lock:
+                _connections['closed'] += 1
+        return self._connection.close()
+    
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
@@ -0,0 +1,132 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from models.report_job import ReportJob
+
+logger = logging.getLogger(__name__)
+
+REPORTS_DIR = os.environ.get(
+    'COLLEXO_REPORTS_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'reports')
+)
+REPORT_WORKERS = int(os.environ.get('COLLEXO_REPORT_WORKERS', '2'))
+PROGRESS_INTERVAL = 1.0  # seconds between progress writes / cancel checks
+# A running job without a progress write (heartbeat) for this long has lost its worker
+STALE_AFTER = int(os.environ.get('COLLEXO_REPORT_STALE_SECONDS', '300'))
+
+class JobCancelled(Exception):
+    """Raised inside a report when cancellation was requested"""
+
+class JobContext:
+    """Handle passed to report functions for progress reporting and cancellation"""
+    
+    def __init__(self, job_id, params):
+        self.job_id = job_id
+        self.params = params
+        self._last_check = 0.0
+        self._progress = 0
+    
+    def progress(self, done, total):
+        """Report progress (0-99%); the DB write and cancel check are throttled"""
+        self._progress = min(99, int(done * 100 / total)) if total else 0
+        self.check_cancelled()
+    
+    def check_cancelled(self):
+        """Persist progress and raise JobCancelled if cancellation was requested"""
+        now = time.monotonic()
+        if now - self._last_check < PROGRESS_INTERVAL:
+            return
+        self._last_check = now
+        if ReportJob.update_progress(self.job_id, self._progress):
+            raise JobCancelled()
+
+class JobRunner:
+    """
+    Runs report jobs on a small thread pool. The report_jobs table is the
+    source of truth: jobs are claimed atomically, so several app workers can
+    share one queue, and cancellation is a flag any worker can set.
+    """
+    
+    def __init__(self, max_workers=REPORT_WORKERS, stale_after=STALE_AFTER):
+        self.max_workers = max_workers
+        self.stale_after = stale_after
+        self._executor = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+    
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='report-job')
+        return self._executor
+    
+    def submit(self, job_id):
+        """Schedule a queued job; returns immediately"""
+        with self._lock:
+            self._in_flight += 1
+        self._pool().submit(self._run, job_id)
+    
+    def resume_queued(self):
+        """
+        Schedule jobs left queued by a previous process and fail the ones it
+        left running. A job whose heartbeat is still recent at startup may
+        belong to a worker that has just died, so the sweep runs again once
+        that heartbeat would have gone stale.
+        """
+        self.fail_stale()
+        timer = threading.Timer(self.stale_after + PROGRESS_INTERVAL, self.fail_stale)
+        timer.daemon = True
+        timer.start()
+        for job_id in ReportJob.get_queued_ids():
+            self.submit(job_id)
+    
+    def fail_stale(self):
+        failed = ReportJob.fail_stale(self.stale_after)
+        if failed:
+            logger.warning("Failed %d report job(s) interrupted by a stopped worker", failed)
+        return failed
+    
+    def queue_depth(self):
+        """Number of jobs queued or running in this process's pool"""
+        with self._lock:
+            return self._in_flight
+    
+    def _run(self, job_id):
+        try:
+            self._execute(job_id)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+    
+    def _execute(self, job_id):
+        from utils.reports import REPORTS
+        
+        if not ReportJob.claim(job_id):
+            return
+        
+        job = ReportJob.get_by_id(job_id)
+        report = REPORTS.get(job['report_type']) if job else None
+        if report is None:
+            ReportJob.finish(job_id, 'failed', error='Unknown report type')
+            return
+        
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        final_path = os.path.join(REPORTS_DIR, f"{job['report_type']}-{job_id}.csv")
+        temp_path = final_path + '.part'
+        context = JobContext(job_id, job['params'])
+        
+        try:
+            row_count = report['run'](context, temp_path)
+            os.replace(temp_path, final_path)
+            ReportJob.finish(job_id, 'completed', result_path=final_path, row_count=row_count)
+        except JobCancelled:
+            ReportJob.finish(job_id, 'cancelled')
+        except Exception as e:
+            logger.exception("Report job %s failed", job_id)
+            ReportJob.finish(job_id, 'failed', error=str(e))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+job_runner = JobRunner()
@@ -0,0 +1,58 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+from utils.rows import Row
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+def convert_value(o):
+    """Serialise types JSON doesn't know: Decimal (MySQL SUM/AVG), timedelta, sets, rows"""
+    if isinstance(o, Row):
+        # orjson encodes row dataclasses (__dict__-backed, see utils.rows) itself; only the stdlib path gets here
+        return o.to_dict()
+    if isinstance(o, Decimal):
+        return int(o) if o == o.to_integral_value() else float(o)
+    if isinstance(o, timedelta):
+        return o.total_seconds()
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+def fallback_default(o):
+    """Stdlib json hook: ISO-8601 dates (Flask's default would emit HTTP dates)"""
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    return convert_value(o)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that serialises datetime/date/Decimal natively in a single
+    pass using orjson, so controllers never pre-convert rows. Falls back to the
+    stdlib encoder (with the same ISO-8601 output) when orjson is unavailable.
+    """
+    default = staticmethod(fallback_default)
+    orjson_options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            kwargs.setdefault('default', self.default)
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=convert_value, option=self.orjson_options).decode('utf-8')
+
+    def dumps_bytes(self, obj):
+        """Serialise straight to UTF-8 bytes (skips the str round trip)"""
+        if orjson is None:
+            return self.dumps(obj).encode('utf-8')
+        return orjson.dumps(obj, default=convert_value, option=self.orjson_options)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
@@ -0,0 +1,284 @@
+import bisect
+import hmac
+import os
+import threading
+import time
+
+DEFAULT_SETTINGS = {
+    # Bearer token for scrapers; without it /metrics follows the /_debug access rules
+    'METRICS_TOKEN': os.environ.get('COLLEXO_METRICS_TOKEN'),
+}
+
+# Seconds; covers sub-millisecond queries up to slow report-style requests
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class _Shards:
+    """
+    Per-thread storage: each thread only ever writes its own dict, so recording
+    takes no lock. The lock is taken once per thread (to register its shard)
+    and on scrape, which merges every shard. Shards of threads that have
+    exited are folded into a base total and dropped, so a thread-per-request
+    server doesn't accumulate one shard per request.
+    """
+
+    def __init__(self, merge):
+        self._merge = merge  # merge(into, shard): add shard's values into the dict `into`
+        self._local = threading.local()
+        self._shards = []  # (owner thread, shard)
+        self._base = {}
+        self._lock = threading.Lock()
+
+    def mine(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._prune()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _prune(self):
+        # Called with the lock held; an exited thread can no longer write its shard
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._merge(self._base, shard)
+        self._shards = live
+
+    def merged(self):
+        with self._lock:
+            self._prune()
+            merged = {}
+            self._merge(merged, self._base)
+            for _, shard in self._shards:
+                self._merge(merged, shard)
+            return merged
+
+    def __len__(self):
+        with self._lock:
+            return len(self._shards)
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+
+    def _label_text(self, labels, extra=None):
+        pairs = list(zip(self.labelnames, labels))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+        return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self.samples())
+        return lines
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._shards = _Shards(self._merge)
+
+    @staticmethod
+    def _merge(into, shard):
+        for labels, value in list(shard.items()):
+            into[labels] = into.get(labels, 0) + value
+
+    def inc(self, *labels, amount=1):
+        shard = self._shards.mine()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self):
+        return self._shards.merged()
+
+    def samples(self):
+        return [f'{self.name}{self._label_text(labels)} {value}' for labels, value in sorted(self.values().items())]
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        self._shards = _Shards(self._merge)
+
+    def _merge(self, into, shard):
+        for labels, series in list(shard.items()):
+            total = into.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+            for i, value in enumerate(series):
+                total[i] += value
+
+    def observe(self, value, *labels):
+        shard = self._shards.mine()
+        series = shard.get(labels)
+        if series is None:
+            # [per-bucket counts..., +Inf count, sum]
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def values(self):
+        return self._shards.merged()
+
+    def samples(self):
+        lines = []
+        for labels, series in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{self._label_text(labels, ("le", bound))} {cumulative}')
+            lines.append(f'{self.name}_sum{self._label_text(labels)} {series[-1]}')
+            lines.append(f'{self.name}_count{self._label_text(labels)} {cumulative}')
+        return lines
+
+class Gauge(Metric):
+    """Gauge whose values are read at scrape time from a callback returning {labels: value}"""
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, labelnames=(), callback=None):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+
+    def samples(self):
+        values = self.callback() if self.callback else {}
+        return [f'{self.name}{self._label_text(labels)} {value}' for labels, value in sorted(values.items())]
+
+class CallbackCounter(Gauge):
+    """Monotonic count maintained elsewhere (e.g. LocalCache hits), read at scrape time"""
+    kind = 'counter'
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._metrics.get(name) or self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._metrics.get(name) or self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge(self, name, help_text, labelnames=(), callback=None, kind=Gauge):
+        return self._metrics.get(name) or self.register(kind(name, help_text, labelnames, callback))
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    'collexo_http_request_duration_seconds', 'HTTP request latency by route, method and status',
+    ('endpoint', 'method', 'status'))
+DB_QUERY_LATENCY = REGISTRY.histogram(
+    'collexo_db_query_duration_seconds', 'SQL statement latency by originating model method',
+    ('caller',))
+DB_CONNECT_LATENCY = REGISTRY.histogram(
+    'collexo_db_connect_duration_seconds', 'Time to open a MySQL connection')
+DB_CONNECT_ERRORS = REGISTRY.counter(
+    'collexo_db_connect_errors_total', 'Failed MySQL connection attempts')
+QUERIES_PER_REQUEST = REGISTRY.histogram(
+    'collexo_db_queries_per_request', 'SQL statements issued while serving a request', ('endpoint',),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100))
+BCRYPT_LATENCY = REGISTRY.histogram(
+    'collexo_bcrypt_duration_seconds', 'bcrypt hash/verify time', ('operation',),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0))
+
+def _cache_stats(key):
+    from utils.cache import LocalCache
+    return {(stats['name'],): stats[key] for stats in (cache.stats() for cache in LocalCache.instances())}
+
+def register_process_gauges():
+    """Scrape-time gauges for connections, caches and the report job queue"""
+    from utils.instrumentation import open_connections
+    from utils.job_runner import job_runner
+    from utils.structured_logging import dropped_records
+
+    REGISTRY.gauge('collexo_db_connections_open',
+                   'MySQL connections currently open in this process (no pool: one per model call)',
+                   callback=lambda: {(): open_connections()})
+    REGISTRY.gauge('collexo_cache_entries', 'Entries held per in-process cache', ('cache',),
+                   callback=lambda: _cache_stats('size'))
+    REGISTRY.gauge('collexo_cache_hits_total', 'Cache hits since start', ('cache',),
+                   callback=lambda: _cache_stats('hits'), kind=CallbackCounter)
+    REGISTRY.gauge('collexo_cache_misses_total', 'Cache misses since start', ('cache',),
+                   callback=lambda: _cache_stats('misses'), kind=CallbackCounter)
+    REGISTRY.gauge('collexo_report_queue_depth', 'Report jobs queued or running in this process',
+                   callback=lambda: {(): job_runner.queue_depth()})
+    REGISTRY.gauge('collexo_log_records_dropped_total', 'Log records dropped because the log queue was full',
+                   callback=lambda: {(): dropped_records()}, kind=CallbackCounter)
+
+def timed(histogram, *labels):
+    """Context manager observing the block's duration on histogram"""
+    return _Timer(histogram, labels)
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+def scrape_allowed(token):
+    """/metrics is gated like the /_debug pages, or opened to scrapers presenting METRICS_TOKEN"""
+    from flask import request
+    from utils.profiler import debug_access_allowed
+    if token:
+        presented = request.headers.get('Authorization', '')
+        if hmac.compare_digest(presented.encode('utf-8'), f'Bearer {token}'.encode('utf-8')):
+            return True
+    return debug_access_allowed()
+
+def init_metrics(app):
+    """Record request latency and statements per request; serve GET /metrics"""
+    from flask import Response, abort, request
+    from utils.instrumentation import add_query_hook, begin_request, request_query_count
+
+    for key, value in DEFAULT_SETTINGS.items():
+        app.config.setdefault(key, value)
+    register_process_gauges()
+    add_query_hook(lambda sql, params, duration, site: DB_QUERY_LATENCY.observe(duration, site[0]))
+
+    @app.before_request
+    def start_request_timer():
+        request.environ.setdefault('collexo.start', time.perf_counter())
+        begin_request()
+
+    @app.after_request
+    def record_request(response):
+        start = request.environ.get('collexo.start')
+        if start is not None:
+            rule = request.url_rule.rule if request.url_rule else 'unmatched'
+            REQUEST_LATENCY.observe(time.perf_counter() - start, rule, request.method, response.status_code)
+            QUERIES_PER_REQUEST.observe(request_query_count(), rule)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        if not scrape_allowed(app.config['METRICS_TOKEN']):
+            abort(404)
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
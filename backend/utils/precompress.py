@@ -0,0 +1,112 @@
+"""
+Static asset build: write content-hashed copies of every asset
+(css/styles.css -> css/styles.<hash>.css) plus manifest.json mapping one to
+the other, then pre-compressed siblings (.gz, and .br/.zst when available)
+so the static view never compresses per request. Templates resolve URLs
+through the manifest with asset_url(), and fingerprinted files are served
+with immutable cache headers. Restart the app after a build.
+
+Usage (from backend/):
+    python -m utils.precompress [--static-dir ../frontend/static]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.assets import MANIFEST_NAME, content_hash, fingerprinted_name, is_fingerprinted
+from utils.compression import ENCODINGS, STATIC_SUFFIXES, compress_bytes
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'frontend', 'static')
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.html', '.json', '.svg', '.txt', '.map'}
+MIN_SIZE = 256
+
+# Build-time levels: spend the CPU once, at maximum compression
+MAX_LEVELS = {'gzip': 9, 'br': 11, 'zstd': 19}
+
+def precompress_file(path):
+    """Write compressed siblings for one file; returns {encoding: size} for those kept"""
+    with open(path, 'rb') as handle:
+        data = handle.read()
+
+    written = {}
+    for encoding in ENCODINGS:
+        target = path + STATIC_SUFFIXES[encoding]
+        compressed = compress_bytes(data, encoding, MAX_LEVELS[encoding])
+        if len(compressed) >= len(data):
+            # Not worth it; make sure a stale sibling isn't served instead
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        with open(target, 'wb') as handle:
+            handle.write(compressed)
+        written[encoding] = len(compressed)
+    return written
+
+def fingerprint_static(static_dir=STATIC_DIR):
+    """Write content-hashed copies of every asset, drop stale ones, and write the manifest"""
+    suffixes = tuple(STATIC_SUFFIXES.values())
+    manifest = {}
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            if name == MANIFEST_NAME or name.endswith(suffixes) or is_fingerprinted(name):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as handle:
+                data = handle.read()
+            relpath = os.path.relpath(path, static_dir).replace(os.sep, '/')
+            manifest[relpath] = fingerprinted_name(relpath, content_hash(data))
+            target = os.path.join(static_dir, manifest[relpath])
+            if not os.path.exists(target):
+                with open(target, 'wb') as handle:
+                    handle.write(data)
+
+    # Copies (and their compressed siblings) from previous builds
+    current = set(manifest.values())
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            base = name
+            for suffix in suffixes:
+                if base.endswith(suffix):
+                    base = base[:-len(suffix)]
+            relpath = os.path.relpath(os.path.join(root, base), static_dir).replace(os.sep, '/')
+            if is_fingerprinted(base) and relpath not in current:
+                os.remove(os.path.join(root, name))
+
+    with open(os.path.join(static_dir, MANIFEST_NAME), 'w') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    return manifest
+
+def precompress_static(static_dir=STATIC_DIR):
+    """Pre-compress every eligible asset under static_dir"""
+    suffixes = tuple(STATIC_SUFFIXES.values())
+    results = {}
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            if name.endswith(suffixes) or os.path.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            path = os.path.join(root, name)
+            if os.path.getsize(path) < MIN_SIZE:
+                continue
+            results[os.path.relpath(path, static_dir)] = (os.path.getsize(path), precompress_file(path))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--static-dir', default=STATIC_DIR)
+    args = parser.parse_args()
+
+    manifest = fingerprint_static(args.static_dir)
+    for source, fingerprinted in sorted(manifest.items()):
+        print(f"✓ {source} -> {fingerprinted}")
+
+    results = precompress_static(args.static_dir)
+    for name, (size, written) in sorted(results.items()):
+        sizes = ', '.join(f'{encoding} {compressed}' for encoding, compressed in written.items()) or 'skipped'
+        print(f"✓ {name} ({size} bytes): {sizes}")
+    print(f"✅ Pre-compressed {len(results)} assets in {args.static_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+import html
+import itertools
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from utils.instrumentation import add_query_hook, redact_query, remove_query_hook
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    # Off unless asked for: keeps every statement of every request in memory
+    'QUERY_PROFILER': os.environ.get('COLLEXO_QUERY_PROFILER') == '1',
+    'QUERY_PROFILER_REPEAT_THRESHOLD': 5,  # same statement shape this often => N+1
+    'QUERY_PROFILER_HISTORY': 50,          # request profiles kept for the dashboard
+    # /_debug pages for direct loopback requests; admins (JWT) may always see them
+    'DEBUG_ENDPOINTS': os.environ.get('COLLEXO_DEBUG_ENDPOINTS') == '1',
+}
+
+LOOPBACK = ('127.0.0.1', '::1')
+# Set by reverse proxies: a loopback peer sending these is relaying someone else
+FORWARDED_HEADERS = ('X-Forwarded-For', 'X-Real-IP', 'Forwarded')
+
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\b\d+(?:\.\d+)?\b|%s|%\(\w+\)s")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*")
+_WHITESPACE = re.compile(r'\s+')
+
+def statement_shape(sql):
+    """
+    SQL with literals and placeholders replaced by ? and IN/VALUES lists
+    folded, so `... IN (%s, %s)` and `... IN (%s)` compare equal
+    """
+    if isinstance(sql, (bytes, bytearray)):
+        sql = sql.decode('utf-8', 'replace')
+    shape = _LITERALS.sub('?', sql)
+    shape = _LISTS.sub('(...)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+def params_shape(params):
+    """Types (not values) of the bound parameters, e.g. 'int, str' or '3 x (int, str)'"""
+    if not params:
+        return ''
+    if isinstance(params, dict):
+        return ', '.join(f'{key}={type(value).__name__}' for key, value in params.items())
+    params = list(params)
+    if params and isinstance(params[0], (list, tuple, dict)):
+        return f'{len(params)} x ({params_shape(params[0])})'
+    return ', '.join(type(value).__name__ for value in params)
+
+class RequestProfile:
+    """Every statement one request executed, with timing and call site"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, method, path):
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.duration = None
+        self.status = None
+        self.queries = []
+
+    def record(self, sql, params, duration, site):
+        self.queries.append({
+            'sql': statement_shape(sql),
+            'params': params_shape(params),
+            'duration': duration,
+            'caller': site[0],
+            'location': f'{site[1]}:{site[2]}',
+        })
+
+    @property
+    def query_time(self):
+        return sum(query['duration'] for query in self.queries)
+
+    def repeated(self, threshold):
+        """Statement shapes run at least threshold times: likely N+1 loops"""
+        groups = {}
+        for query in self.queries:
+            group = groups.setdefault(query['sql'], {'sql': query['sql'], 'count': 0, 'duration': 0.0, 'callers': set()})
+            group['count'] += 1
+            group['duration'] += query['duration']
+            group['callers'].add(f"{query['caller']} ({query['location']})")
+        return sorted((group for group in groups.values() if group['count'] >= threshold),
+                      key=lambda group: group['count'], reverse=True)
+
+    def summary(self, threshold):
+        return (f'queries={len(self.queries)}; time={self.query_time * 1000:.1f}ms; '
+                f'repeated={len(self.repeated(threshold))}; id={self.id}')
+
+class QueryProfiler:
+    """Collects a RequestProfile per request on the serving thread and keeps the most recent ones"""
+
+    def __init__(self, history=50):
+        self.history = deque(maxlen=history)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def hook(self, sql, params, duration, site):
+        profile = getattr(self._local, 'profile', None)
+        if profile is not None:
+            profile.record(sql, params, duration, site)
+
+    def start(self, method, path):
+        self._local.profile = RequestProfile(method, path)
+
+    def finish(self, status):
+        profile = getattr(self._local, 'profile', None)
+        self._local.profile = None
+        if profile is not None:
+            profile.duration = time.time() - profile.started_at
+            profile.status = status
+            with self._lock:
+                self.history.append(profile)
+        return profile
+
+    def get(self, profile_id):
+        with self._lock:
+            return next((profile for profile in self.history if profile.id == profile_id), None)
+
+    def recent(self):
+        with self._lock:
+            return list(reversed(self.history))
+
+@contextmanager
+def capture_queries():
+    """
+    Collect the statements executed on this thread inside the block (works
+    with the Flask test client, which serves requests on the calling thread):
+
+        with capture_queries() as queries:
+            client.get('/api/forms/published')
+    """
+    thread_id = threading.get_ident()
+    queries = []
+
+    def hook(sql, params, duration, site):
+        if threading.get_ident() == thread_id:
+            queries.append({'sql': statement_shape(sql), 'duration': duration, 'caller': site[0],
+                            'location': f'{site[1]}:{site[2]}'})
+
+    add_query_hook(hook)
+    try:
+        yield queries
+    finally:
+        remove_query_hook(hook)
+
+@contextmanager
+def assert_max_queries(limit):
+    """
+    Fail if the block runs more than limit statements, listing them:
+
+        with assert_max_queries(3):
+            client.put(f'/api/applications/{app_id}/status', json={...}, headers=auth)
+    """
+    with capture_queries() as queries:
+        yield queries
+    if len(queries) > limit:
+        listing = '\n'.join(f"  {query['caller']} ({query['location']}): {query['sql']}" for query in queries)
+        raise AssertionError(f'Expected at most {limit} queries, got {len(queries)}:\n{listing}')
+
+def debug_access_allowed():
+    """
+    Whether the /_debug pages may be served: DEBUG_ENDPOINTS is on and the
+    request comes straight from this machine (loopback peer, no proxy
+    forwarding headers), or the caller presents an admin token. The address
+    alone isn't enough: behind a local reverse proxy every request is loopback.
+    """
+    from flask import current_app, request
+    if (current_app.config.get('DEBUG_ENDPOINTS') and request.remote_addr in LOOPBACK
+            and not any(header in request.headers for header in FORWARDED_HEADERS)):
+        return True
+    return _is_admin()
+
+def _is_admin():
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+    from models.user import User
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        return False
+    user = User.get_by_id(int(identity)) if identity else None
+    return bool(user) and user['user_role'] == 'admin'
+
+def _render_index(profiles, threshold):
+    rows = ''.join(
+        f'<tr><td><a href="/_debug/queries/{profile.id}">{profile.id}</a></td>'
+        f'<td>{profile.method} {html.escape(profile.path)}</td><td>{profile.status}</td>'
+        f'<td>{len(profile.queries)}</td><td>{profile.query_time * 1000:.1f}</td>'
+        f'<td>{(profile.duration or 0) * 1000:.1f}</td><td>{len(profile.repeated(threshold)) or ""}</td></tr>'
+        for profile in profiles)
+    return (f'<h1>Recent requests</h1><table border="1" cellpadding="4">'
+            f'<tr><th>#</th><th>Request</th><th>Status</th><th>Queries</th><th>SQL ms</th>'
+            f'<th>Total ms</th><th>Repeated shapes</th></tr>{rows}</table>')
+
+def _render_profile(profile, threshold):
+    repeated = ''.join(
+        f'<li><b>{group["count"]}x</b> ({group["duration"] * 1000:.1f} ms) <code>{html.escape(group["sql"])}</code>'
+        f'<br>from {html.escape(", ".join(sorted(group["callers"])))}</li>'
+        for group in profile.repeated(threshold))
+    queries = ''.join(
+        f'<tr><td>{i}</td><td>{query["duration"] * 1000:.2f}</td>'
+        f'<td>{html.escape(query["caller"])}<br><small>{html.escape(query["location"])}</small></td>'
+        f'<td><code>{html.escape(query["sql"])}</code><br><small>{html.escape(query["params"])}</small></td></tr>'
+        for i, query in enumerate(profile.queries, 1))
+    return (f'<p><a href="/_debug/queries">&larr; all requests</a></p>'
+            f'<h1>{profile.method} {html.escape(profile.path)} &rarr; {profile.status}</h1>'
+            f'<p>{len(profile.queries)} queries, {profile.query_time * 1000:.1f} ms in SQL, '
+            f'{(profile.duration or 0) * 1000:.1f} ms total</p>'
+            f'<h2>Repeated statements (&ge; {threshold})</h2><ul>{repeated or "<li>none</li>"}</ul>'
+            f'<h2>Statements</h2><table border="1" cellpadding="4">'
+            f'<tr><th>#</th><th>ms</th><th>Call site</th><th>SQL</th></tr>{queries}</table>')
+
+def init_profiler(app):
+    """
+    When QUERY_PROFILER is on: profile every request's SQL, report it in the
+    X-Query-Profile header and serve a dashboard at /_debug/queries (see debug_access_allowed)
+    """
+    for key, value in DEFAULT_SETTINGS.items():
+        app.config.setdefault(key, value)
+    if not app.config['QUERY_PROFILER']:
+        return None
+
+    from flask import abort, request
+    threshold = app.config['QUERY_PROFILER_REPEAT_THRESHOLD']
+    profiler = QueryProfiler(app.config['QUERY_PROFILER_HISTORY'])
+    add_query_hook(profiler.hook)
+
+    @app.before_request
+    def start_query_profile():
+        if not request.path.startswith('/_debug/'):
+            profiler.start(request.method, redact_query(request.full_path.rstrip('?')))
+
+    @app.after_request
+    def finish_query_profile(response):
+        profile = profiler.finish(response.status_code)
+        if profile is not None:
+            response.headers['X-Query-Profile'] = profile.summary(threshold)
+            for group in profile.repeated(threshold):
+                logger.warning("%dx same statement in one request: %s", group['count'], group['sql'][:120],
+                               extra={'repeat_count': group['count'], 'callers': sorted(group['callers'])})
+        return response
+
+    @app.route('/_debug/queries')
+    def query_profiles():
+        if not debug_access_allowed():
+            abort(404)
+        return _render_index(profiler.recent(), threshold)
+
+    @app.route('/_debug/queries/<int:profile_id>')
+    def query_profile(profile_id):
+        profile = profiler.get(profile_id) if debug_access_allowed() else None
+        if profile is None:
+            abort(404)
+        return _render_profile(profile, threshold)
+
+    return profiler
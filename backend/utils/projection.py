@@ -0,0 +1,52 @@
+class ProjectionError(ValueError):
+    """Unknown name in a fields= / include= parameter (surfaced as a 400)"""
+
+def parse_names(raw, allowed, kind='field'):
+    """Split a comma-separated parameter and check every name against the allow-list"""
+    names = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ProjectionError(
+            f"Unknown {kind}(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return names
+
+def parse_fields(raw, allowed, required=()):
+    """
+    Requested field names in allow-list order, plus the required ones, or
+    None when the parameter is absent (meaning the endpoint's default shape).
+    """
+    if not raw:
+        return None
+    requested = set(parse_names(raw, allowed)) | set(required)
+    return [name for name in allowed if name in requested]
+
+def parse_include(raw, allowed, default=()):
+    """Relations to embed: the default when absent, nothing for '' or 'none'"""
+    if raw is None:
+        return set(default)
+    if raw.strip().lower() in ('', 'none'):
+        return set()
+    return set(parse_names(raw, allowed, 'relation'))
+
+def projection_args(args, fields_allowed, required=(), include_allowed=(), include_default=()):
+    """(fields, include) from request.args; raises ProjectionError on unknown names"""
+    fields = parse_fields(args.get('fields'), fields_allowed, required)
+    include = parse_include(args.get('include'), include_allowed, include_default)
+    return fields, include
+
+def build_select(field_map, names, joins=None):
+    """
+    Column list and JOIN clauses for the given field names. field_map values
+    are (SQL expression, name of the join it needs or None); only joins a
+    requested field needs are emitted, in the order they appear in joins.
+    """
+    columns = []
+    needed = set()
+    for name in names:
+        expression, join = field_map[name]
+        columns.append(expression if expression.endswith('.' + name) else f"{expression} as {name}")
+        if join:
+            needed.add(join)
+    join_sql = '\n'.join(sql for join, sql in (joins or {}).items() if join in needed)
+    return ',\n                       '.join(columns), join_sql
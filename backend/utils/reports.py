@@ -0,0 +1,115 @@
+import csv
+from config.db import get_connection
+from models.application import VALID_STATUSES
+
+STREAM_BATCH_SIZE = 2000
+
+def stream_to_csv(context, path, header, count_sql, select_sql, params=(), transform=None):
+    """Stream a query into a CSV file in batches; count_sql (no params) sizes the progress bar"""
+    connection = get_connection()
+    if not connection:
+        raise RuntimeError('Database connection failed')
+    
+    cursor = connection.cursor()
+    try:
+        cursor.execute(count_sql)
+        total = cursor.fetchone()[0]
+        
+        written = 0
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(header)
+            cursor.execute(select_sql, params)
+            while True:
+                batch = cursor.fetchmany(STREAM_BATCH_SIZE)
+                if not batch:
+                    break
+                writer.writerows(map(transform, batch) if transform else batch)
+                written += len(batch)
+                context.progress(written, total)
+        return written
+    finally:
+        cursor.close()
+        connection.close()
+
+def applications_dump(context, path):
+    """Every application with applicant, society and form"""
+    return stream_to_csv(
+        context, path,
+        ['application_id', 'status', 'application_date', 'submitted_at',
+         'user_id', 'user_name', 'user_email', 'society_id', 'society_name', 'form_id', 'form_title'],
+        "SELECT COUNT(*) FROM applications",
+        """
+            SELECT a.application_id, a.status, a.application_date, a.submitted_at,
+                   u.user_id, u.user_name, u.user_email,
+                   s.society_id, s.society_name,
+                   f.form_id, f.title
+            FROM applications a
+            JOIN users u ON a.user_id = u.user_id
+            JOIN societies s ON a.society_id = s.society_id
+            JOIN forms f ON a.form_id = f.form_id
+            ORDER BY a.application_id
+        """
+    )
+
+def acceptance_rates(context, path):
+    """Per-society application counts and acceptance rate (from the rollup table)"""
+    status_sums = ",\n".join(
+        f"COALESCE(SUM(CASE WHEN r.status = '{status}' THEN r.application_count END), 0)"
+        for status in VALID_STATUSES
+    )
+    
+    def with_rates(row):
+        counts = row[2:]
+        total = sum(counts)
+        accepted = counts[VALID_STATUSES.index('accepted')]
+        decided = accepted + counts[VALID_STATUSES.index('rejected')]
+        return list(row) + [
+            total,
+            round(accepted / total, 4) if total else '',
+            round(accepted / decided, 4) if decided else ''
+        ]
+    
+    return stream_to_csv(
+        context, path,
+        ['society_id', 'society_name'] + VALID_STATUSES + ['total', 'acceptance_rate', 'decided_acceptance_rate'],
+        "SELECT COUNT(*) FROM societies",
+        f"""
+            SELECT s.society_id, s.society_name,
+                   {status_sums}
+            FROM societies s
+            LEFT JOIN application_rollups r ON r.society_id = s.society_id AND r.granularity = 'day'
+            GROUP BY s.society_id, s.society_name
+            ORDER BY s.society_id
+        """,
+        transform=with_rates
+    )
+
+def inactive_societies(context, path):
+    """Societies without a submitted application in the last `days` days (default 90)"""
+    days = int(context.params.get('days', 90))
+    return stream_to_csv(
+        context, path,
+        ['society_id', 'society_name', 'category', 'admission_open', 'head_email',
+         'last_application_at', 'last_form_at'],
+        "SELECT COUNT(*) FROM societies",
+        """
+            SELECT s.society_id, s.society_name, s.category, s.admission_open, u.user_email,
+                   MAX(a.submitted_at) as last_application_at,
+                   (SELECT MAX(f.created_at) FROM forms f WHERE f.society_id = s.society_id) as last_form_at
+            FROM societies s
+            LEFT JOIN users u ON s.society_head_id = u.user_id
+            LEFT JOIN applications a ON a.society_id = s.society_id
+            GROUP BY s.society_id, s.society_name, s.category, s.admission_open, u.user_email
+            HAVING last_application_at IS NULL OR last_application_at < NOW() - INTERVAL %s DAY
+            ORDER BY last_application_at
+        """,
+        (days,)
+    )
+
+# report_type -> definition exposed through /api/admin/reports
+REPORTS = {
+    'applications_dump': {'description': applications_dump.__doc__, 'run': applications_dump},
+    'acceptance_rates': {'description': acceptance_rates.__doc__, 'run': acceptance_rates},
+    'inactive_societies': {'description': inactive_societies.__doc__, 'run': inactive_societies},
+}
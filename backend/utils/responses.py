@@ -0,0 +1,49 @@
+from datetime import date, datetime, time
+from flask import current_app, request
+from utils.json_provider import convert_value
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional
+    msgpack = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack')
+
+def msgpack_default(o):
+    """Encode values msgpack doesn't know exactly as the JSON provider does"""
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if np is not None and isinstance(o, (np.generic, np.ndarray)):
+        return o.tolist()
+    return convert_value(o)
+
+def pack(obj):
+    """Serialise to MessagePack with the same schema as the JSON response"""
+    return msgpack.packb(obj, default=msgpack_default, use_bin_type=True, datetime=False)
+
+def wants_msgpack():
+    """True when the client prefers MessagePack over JSON (Accept header, q-values honoured)"""
+    if msgpack is None:
+        return False
+    best = request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES)
+    return best in MSGPACK_MIMETYPES
+
+def respond(*args, **kwargs):
+    """
+    Drop-in replacement for jsonify() that negotiates the body format:
+    MessagePack for clients that ask for it, JSON (via app.json) otherwise.
+    """
+    if not wants_msgpack():
+        response = current_app.json.response(*args, **kwargs)
+    else:
+        obj = current_app.json._prepare_response_obj(args, kwargs)
+        response = current_app.response_class(pack(obj), mimetype=MSGPACK_MIMETYPE)
+    response.vary.add('Accept')
+    return response
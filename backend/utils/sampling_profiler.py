@@ -0,0 +1,312 @@
+"""
+Per-request cProfile / tracemalloc capture, as WSGI middleware.
+
+A request is profiled when it is sampled (PROFILE_SAMPLE_RATE) or carries a
+valid signed X-Collexo-Profile header. Mint one with:
+
+    COLLEXO_PROFILE_SECRET=... python -m utils.sampling_profiler --modes cpu,memory --ttl 600
+
+Each profile is written to PROFILE_DIR as <name>.json (metadata) plus
+<name>.pstats and <name>.collapsed (cpu; the latter for flamegraph.pl /
+speedscope) and/or <name>.alloc.txt (memory: top allocation sites).
+"""
+import argparse
+import cProfile
+import hashlib
+import hmac
+import itertools
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+from utils.instrumentation import redact_query
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'PROFILE_DIR': os.environ.get(
+        'COLLEXO_PROFILE_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profiles')
+    ),
+    'PROFILE_SECRET': os.environ.get('COLLEXO_PROFILE_SECRET'),  # unset: header trigger disabled
+    'PROFILE_SAMPLE_RATE': float(os.environ.get('COLLEXO_PROFILE_SAMPLE_RATE', '0')),
+    'PROFILE_SAMPLE_MODES': ('cpu',),
+    'PROFILE_ALLOC_TOP': 25,
+    'PROFILE_KEEP': 200,  # newest profiles kept on disk
+}
+
+HEADER = 'HTTP_X_COLLEXO_PROFILE'
+MODES = ('cpu', 'memory')
+
+def sign(secret, modes, expires):
+    """Header value 'cpu,memory:<expires>:<hmac>' authorising a profile until expires"""
+    message = f"{','.join(modes)}:{int(expires)}"
+    signature = hmac.new(secret.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).hexdigest()
+    return f'{message}:{signature}'
+
+def verify(secret, value):
+    """Modes authorised by a signed header value, or None if invalid/expired"""
+    try:
+        modes, expires, _ = value.split(':')
+        modes = tuple(mode for mode in modes.split(',') if mode in MODES)
+        if not modes or int(expires) < time.time():
+            return None
+    except ValueError:
+        return None
+    return modes if hmac.compare_digest(sign(secret, modes, int(expires)), value) else None
+
+def collapsed_stacks(stats):
+    """
+    Approximate collapsed stacks ("a;b;c <microseconds>") from cProfile's
+    caller/callee graph: each function's time is split between its callers in
+    proportion to the time each call edge accounts for.
+    """
+    entries = stats.stats
+
+    def label(func):
+        filename, line, name = func
+        return f'{name} ({os.path.basename(filename)}:{line})' if line else name
+
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    lines = {}
+
+    def walk(func, path, share, depth):
+        _, _, self_time, cumulative, _ = entries[func]
+        path = path + (label(func),)
+        if self_time * share > 0:
+            lines[';'.join(path)] = lines.get(';'.join(path), 0) + self_time * share
+        if depth >= 64:
+            return
+        for callee, edge_time in callees.get(func, ()):
+            callee_total = entries[callee][3]
+            if callee_total > 0 and label(callee) not in path:
+                walk(callee, path, share * edge_time / callee_total, depth + 1)
+
+    for func, entry in entries.items():
+        if not entry[4]:
+            walk(func, (), 1.0, 0)
+    return ''.join(f'{stack} {int(seconds * 1_000_000)}\n'
+                   for stack, seconds in sorted(lines.items()) if seconds >= 1e-6)
+
+class ProfilingMiddleware:
+    """
+    Wraps the WSGI app: profiles sampled or signed requests, including any
+    streamed body, and writes the results to PROFILE_DIR. One profile runs at
+    a time (tracemalloc is process-wide), so a request arriving while another
+    is being profiled simply isn't profiled.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, wsgi_app, settings):
+        self.wsgi_app = wsgi_app
+        self.settings = settings
+        self._busy = threading.Lock()
+
+    def _modes(self, environ):
+        header = environ.get(HEADER)
+        if header and self.settings['PROFILE_SECRET']:
+            modes = verify(self.settings['PROFILE_SECRET'], header)
+            if modes:
+                return modes, 'header'
+        rate = self.settings['PROFILE_SAMPLE_RATE']
+        if rate and random.random() < rate:
+            return tuple(self.settings['PROFILE_SAMPLE_MODES']), 'sampled'
+        return None, None
+
+    def __call__(self, environ, start_response):
+        modes, trigger = self._modes(environ)
+        if not modes or not self._busy.acquire(blocking=False):
+            return self.wsgi_app(environ, start_response)
+
+        try:
+            run = _ProfileRun(self, environ, modes, trigger)
+        except Exception:
+            # Serve the request unprofiled rather than leave profiling locked off
+            self._busy.release()
+            logger.exception("Error starting request profile")
+            return self.wsgi_app(environ, start_response)
+        captured = {}
+
+        def capture_status(status, headers, exc_info=None):
+            captured['status'] = status
+            return start_response(status, headers, exc_info)
+
+        try:
+            body = run.during(self.wsgi_app, environ, capture_status)
+        except BaseException:
+            run.finish('500 INTERNAL SERVER ERROR')
+            raise
+        return _ProfiledBody(body, run, captured)
+
+    def write(self, run, status):
+        directory = self.settings['PROFILE_DIR']
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', run.environ.get('PATH_INFO', '')).strip('-')[:60] or 'root'
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{next(self._ids)}-{run.environ.get('REQUEST_METHOD', '')}-{slug}"
+        files = []
+
+        if run.profile is not None:
+            stats = pstats.Stats(run.profile)
+            stats.dump_stats(os.path.join(directory, f'{name}.pstats'))
+            with open(os.path.join(directory, f'{name}.collapsed'), 'w') as f:
+                f.write(collapsed_stacks(stats))
+            files += [f'{name}.pstats', f'{name}.collapsed']
+
+        if run.allocations is not None:
+            with open(os.path.join(directory, f'{name}.alloc.txt'), 'w') as f:
+                f.write(f'peak traced memory: {run.peak / 1024:.1f} KiB\n\n')
+                for stat in run.allocations[:self.settings['PROFILE_ALLOC_TOP']]:
+                    f.write(f'{stat}\n')
+            files.append(f'{name}.alloc.txt')
+
+        metadata = {
+            'name': name,
+            'method': run.environ.get('REQUEST_METHOD'),
+            'path': run.environ.get('PATH_INFO'),
+            'query': redact_query(run.environ.get('QUERY_STRING', '')) or None,
+            'status': status,
+            'duration_ms': round(run.duration * 1000, 1),
+            'modes': list(run.modes),
+            'trigger': run.trigger,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'files': files,
+        }
+        with open(os.path.join(directory, f'{name}.json'), 'w') as f:
+            json.dump(metadata, f)
+        self._prune(directory)
+
+    def _prune(self, directory):
+        index = sorted((entry for entry in os.scandir(directory) if entry.name.endswith('.json')),
+                       key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in index[self.settings['PROFILE_KEEP']:]:
+            base = entry.name[:-len('.json')]
+            for suffix in ('.json', '.pstats', '.collapsed', '.alloc.txt'):
+                try:
+                    os.remove(os.path.join(directory, base + suffix))
+                except FileNotFoundError:
+                    pass
+
+class _ProfileRun:
+    """Profiler state for one request; enabled only while the app or its body is running"""
+
+    def __init__(self, middleware, environ, modes, trigger):
+        self.middleware = middleware
+        self.environ = environ
+        self.modes = modes
+        self.trigger = trigger
+        self.profile = cProfile.Profile() if 'cpu' in modes else None
+        self.allocations = None
+        self.peak = 0
+        self.duration = 0.0
+        self._baseline = None
+        self._started_tracing = False
+        if 'memory' in modes:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                self._started_tracing = True
+            try:
+                tracemalloc.reset_peak()
+                self._baseline = tracemalloc.take_snapshot()
+            except BaseException:
+                if self._started_tracing:
+                    tracemalloc.stop()
+                raise
+
+    def during(self, func, *args):
+        start = time.perf_counter()
+        if self.profile is not None:
+            self.profile.enable()
+        try:
+            return func(*args)
+        finally:
+            if self.profile is not None:
+                self.profile.disable()
+            self.duration += time.perf_counter() - start
+
+    def finish(self, status):
+        try:
+            if self._baseline is not None:
+                self.peak = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot().filter_traces((
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, __file__),
+                ))
+                self.allocations = snapshot.compare_to(self._baseline, 'lineno')
+                if self._started_tracing:
+                    tracemalloc.stop()
+            self.middleware.write(self, status)
+        except Exception:
+            logger.exception("Error writing request profile")
+        finally:
+            self.middleware._busy.release()
+
+class _ProfiledBody:
+    """Response iterable that keeps profiling while a (possibly streamed) body is produced"""
+
+    def __init__(self, body, run, captured):
+        self._body = body
+        self._iterator = None
+        self._run = run
+        self._captured = captured
+        self._finished = False
+
+    def __iter__(self):
+        self._iterator = iter(self._body)
+        return self
+
+    def __next__(self):
+        return self._run.during(next, self._iterator)
+
+    def close(self):
+        if self._finished:
+            return
+        self._finished = True
+        try:
+            if hasattr(self._body, 'close'):
+                self._run.during(self._body.close)
+        finally:
+            self._run.finish(self._captured.get('status'))
+
+def list_profiles(directory, limit=50):
+    """Metadata of the most recent profiles, newest first"""
+    if not os.path.isdir(directory):
+        return []
+    index = sorted((entry for entry in os.scandir(directory) if entry.name.endswith('.json')),
+                   key=lambda entry: entry.stat().st_mtime, reverse=True)
+    profiles = []
+    for entry in index[:limit]:
+        try:
+            with open(entry.path) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+def init_sampling_profiler(app):
+    """Wrap app.wsgi_app with ProfilingMiddleware (inert unless sampled or signed)"""
+    for key, value in DEFAULT_SETTINGS.items():
+        app.config.setdefault(key, value)
+
+    settings = {key: app.config[key] for key in DEFAULT_SETTINGS}
+    app.wsgi_app = ProfilingMiddleware(app.wsgi_app, settings)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Print a signed X-Collexo-Profile header value')
+    parser.add_argument('--modes', default='cpu', help='comma-separated: cpu, memory')
+    parser.add_argument('--ttl', type=int, default=600, help='seconds the header stays valid')
+    args = parser.parse_args()
+    secret = DEFAULT_SETTINGS['PROFILE_SECRET']
+    if not secret:
+        parser.error('COLLEXO_PROFILE_SECRET is not set')
+    modes = [mode for mode in args.modes.split(',') if mode in MODES]
+    print(f'X-Collexo-Profile: {sign(secret, modes, time.time() + args.ttl)}')
@@ -0,0 +1,66 @@
+import html
+import re
+
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+MAX_SEARCH_TOKENS = 8
+SNIPPET_RADIUS = 60
+
+# MySQL errors meaning the search schema isn't there: unknown column, no FULLTEXT index
+SEARCH_SCHEMA_ERRNOS = (1054, 1191)
+
+class SearchUnavailableError(RuntimeError):
+    """The search column/indexes are missing (surfaced as a 503 instead of "no results")"""
+
+def search_tokens(search):
+    """Lower-cased word tokens from free text (capped at MAX_SEARCH_TOKENS)"""
+    if not search:
+        return []
+    return SEARCH_TOKEN_PATTERN.findall(search.lower())[:MAX_SEARCH_TOKENS]
+
+def build_search_query(search):
+    """
+    Turn free text into a MySQL BOOLEAN MODE expression where every word is
+    required and prefix-matched ("robo deb" -> "+robo* +deb*").
+    Returns None when nothing searchable is left.
+    """
+    tokens = search_tokens(search)
+    if not tokens:
+        return None
+    return ' '.join(f'+{token}*' for token in tokens)
+
+def compile_highlighter(tokens):
+    """Regex matching any token as a word prefix, mirroring the BOOLEAN MODE query"""
+    if not tokens:
+        return None
+    alternatives = '|'.join(re.escape(token) for token in sorted(tokens, key=len, reverse=True))
+    return re.compile(rf'\b(?:{alternatives})\w*', re.IGNORECASE | re.UNICODE)
+
+def highlight(text, pattern, radius=SNIPPET_RADIUS):
+    """
+    Return an HTML-escaped snippet of text around the first match with every
+    match wrapped in <mark>, or None if nothing matches.
+    """
+    if not text or pattern is None:
+        return None
+    first = pattern.search(text)
+    if not first:
+        return None
+
+    start = max(0, first.start() - radius)
+    end = min(len(text), first.end() + radius)
+    window = text[start:end]
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(window):
+        parts.append(html.escape(window[position:match.start()]))
+        parts.append(f'<mark>{html.escape(match.group(0))}</mark>')
+        position = match.end()
+    parts.append(html.escape(window[position:]))
+
+    snippet = ''.join(parts)
+    if start > 0:
+        snippet = '…' + snippet
+    if end < len(text):
+        snippet += '…'
+    return snippet
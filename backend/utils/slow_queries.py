@@ -0,0 +1,155 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.instrumentation import add_query_hook
+from utils.profiler import params_shape, statement_shape
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'SLOW_QUERY_MS': float(os.environ.get('COLLEXO_SLOW_QUERY_MS', '200')),
+    'SLOW_QUERY_EXPLAIN_INTERVAL': 300,  # seconds between EXPLAINs of the same fingerprint
+}
+
+# Statements MySQL can EXPLAIN
+EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'WITH')
+
+def fingerprint(shape):
+    return hashlib.sha1(shape.encode('utf-8')).hexdigest()[:12]
+
+def current_route():
+    """Route template of the request being served, or the thread name outside a request"""
+    from flask import has_request_context, request
+    if has_request_context():
+        rule = request.url_rule.rule if request.url_rule else request.path
+        return f'{request.method} {rule}'
+    return threading.current_thread().name
+
+class SlowQueryLog:
+    """
+    Aggregates statements slower than the threshold by fingerprint (the
+    normalised statement shape) and EXPLAINs each fingerprint at most once per
+    explain_interval on a background thread, using the parameters of the
+    execution that triggered it.
+    """
+
+    def __init__(self, threshold_ms=200, explain_interval=300):
+        self.threshold = threshold_ms / 1000
+        self.explain_interval = explain_interval
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._in_flight = 0
+
+    def configure(self, threshold_ms, explain_interval):
+        self.threshold = threshold_ms / 1000
+        self.explain_interval = explain_interval
+
+    def hook(self, sql, params, duration, site):
+        if duration < self.threshold:
+            return
+        if isinstance(sql, (bytes, bytearray)):
+            sql = sql.decode('utf-8', 'replace')
+        shape = statement_shape(sql)
+        if shape.upper().startswith('EXPLAIN'):
+            return
+        key = fingerprint(shape)
+        route = current_route()
+        shape_of_params = params_shape(params)
+        now = time.time()
+
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    'fingerprint': key, 'sql': shape, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'routes': {}, 'callers': {}, 'params': shape_of_params,
+                    'last_seen': None, 'explain': None, 'explained_at': 0.0
+                }
+            entry['count'] += 1
+            entry['total_ms'] += duration * 1000
+            entry['max_ms'] = max(entry['max_ms'], duration * 1000)
+            entry['routes'][route] = entry['routes'].get(route, 0) + 1
+            entry['callers'][site[0]] = entry['callers'].get(site[0], 0) + 1
+            entry['last_seen'] = now
+            explain = (now - entry['explained_at'] >= self.explain_interval
+                       and shape.split(' ', 1)[0].upper() in EXPLAINABLE
+                       and ' x (' not in shape_of_params)
+            if explain:
+                entry['explained_at'] = now
+
+        logger.warning("Slow query %.1fms: %s", duration * 1000, shape[:300], extra={
+            'fingerprint': key, 'duration_ms': round(duration * 1000, 2), 'query_route': route,
+            'caller': site[0], 'location': f'{site[1]}:{site[2]}', 'params_shape': shape_of_params,
+        })
+        if explain:
+            with self._lock:
+                self._in_flight += 1
+            self._pool().submit(self._run_explain, key, sql, params)
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='slow-query-explain')
+        return self._executor
+
+    def queue_depth(self):
+        """EXPLAINs submitted to the background thread and not yet finished"""
+        with self._lock:
+            return self._in_flight
+
+    def _run_explain(self, key, sql, params):
+        try:
+            self._explain(key, sql, params)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _explain(self, key, sql, params):
+        from config.db import get_connection
+        from mysql.connector import Error
+
+        connection = get_connection()
+        if not connection:
+            return
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(f"EXPLAIN {sql}", params or ())
+            plan = cursor.fetchall()
+        except Error as e:
+            plan = [{'error': str(e)}]
+        finally:
+            cursor.close()
+            connection.close()
+
+        with self._lock:
+            if key in self._stats:
+                self._stats[key]['explain'] = plan
+
+    def top(self, limit=20):
+        """Fingerprints ordered by total time spent, slowest first"""
+        with self._lock:
+            entries = sorted(self._stats.values(), key=lambda entry: entry['total_ms'], reverse=True)[:limit]
+            return [{
+                **entry,
+                'total_ms': round(entry['total_ms'], 1),
+                'max_ms': round(entry['max_ms'], 1),
+                'avg_ms': round(entry['total_ms'] / entry['count'], 1),
+                'routes': dict(entry['routes']),
+                'callers': dict(entry['callers']),
+            } for entry in entries]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+slow_query_log = SlowQueryLog()
+
+def init_slow_query_log(app):
+    """Capture statements slower than SLOW_QUERY_MS (log + EXPLAIN, listed at /api/admin/slow-queries)"""
+    for key, value in DEFAULT_SETTINGS.items():
+        app.config.setdefault(key, value)
+    slow_query_log.configure(app.config['SLOW_QUERY_MS'], app.config['SLOW_QUERY_EXPLAIN_INTERVAL'])
+    add_query_hook(slow_query_log.hook)
@@ -0,0 +1,174 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from flask import g, has_request_context, request
+
+def parse_levels(raw):
+    """'models=WARNING,access=INFO' -> {'models': 'WARNING', 'access': 'INFO'}"""
+    levels = {}
+    for item in (raw or '').split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+DEFAULT_SETTINGS = {
+    'LOG_LEVEL': os.environ.get('COLLEXO_LOG_LEVEL', 'INFO'),
+    # Per-logger overrides; loggers are named after their module (models.application, ...)
+    'LOG_LEVELS': parse_levels(os.environ.get('COLLEXO_LOG_LEVELS', 'werkzeug=WARNING')),
+    'LOG_FORMAT': os.environ.get('COLLEXO_LOG_FORMAT', 'json'),  # 'json' or 'text'
+    'LOG_QUEUE_SIZE': 10000,  # records beyond this are dropped rather than blocking a request
+}
+
+# LogRecord attributes that aren't user-supplied extra= fields
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+access_logger = logging.getLogger('access')
+
+# Load balancer probes and metric scrapes: access-logged at DEBUG only
+QUIET_PATHS = {'/healthz', '/readyz', '/metrics'}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, request fields and any extra= fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and value is not None:
+                entry[key] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class TextFormatter(logging.Formatter):
+    """Human-readable variant for local development"""
+
+    def format(self, record):
+        extras = ' '.join(f'{key}={value}' for key, value in record.__dict__.items()
+                          if key not in _RESERVED and value is not None)
+        line = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if extras:
+            line += f'  [{extras}]'
+        if record.exc_text:
+            line += '\n' + record.exc_text
+        return line
+
+class RequestContextFilter(logging.Filter):
+    """Adds request_id, method, route, elapsed_ms and trace_id while serving a request"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            record.method = request.method
+            record.route = request.url_rule.rule if request.url_rule else request.path
+            start = request.environ.get('collexo.start')
+            if start is not None and not hasattr(record, 'elapsed_ms'):
+                record.elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+            server_span = g.get('trace_span')
+            if server_span is not None:
+                record.trace_id = server_span.trace_id
+        return True
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never waits: the record is reduced to plain data on the
+    calling thread and dropped (and counted) when the queue is full. The
+    listener thread does the JSON encoding and the write.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._exc_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        # The queue handler is the only handler, so the record can be reduced in place
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_handler = None
+_listener = None
+
+def dropped_records():
+    return _handler.dropped if _handler else 0
+
+def log_queue_depth():
+    return _handler.queue.qsize() if _handler else 0
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread (registered with atexit)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def configure_logging(level='INFO', levels=None, fmt='json', queue_size=10000):
+    """Route all logging through a bounded queue to a background thread writing stdout"""
+    global _handler, _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+
+    _handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    _handler.addFilter(RequestContextFilter())
+    _listener = logging.handlers.QueueListener(_handler.queue, stream)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(level)
+    for name, logger_level in (levels or {}).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+def init_logging(app):
+    """Structured logging plus a request id and one access log line per request"""
+    for key, value in DEFAULT_SETTINGS.items():
+        app.config.setdefault(key, value)
+    configure_logging(app.config['LOG_LEVEL'], app.config['LOG_LEVELS'],
+                      app.config['LOG_FORMAT'], app.config['LOG_QUEUE_SIZE'])
+
+    @app.before_request
+    def assign_request_id():
+        request.environ.setdefault('collexo.start', time.perf_counter())
+        incoming = request.headers.get('X-Request-ID', '')
+        g.request_id = incoming[:64] if incoming.isprintable() and incoming else uuid.uuid4().hex
+
+    @app.after_request
+    def log_request(response):
+        from utils.instrumentation import request_query_count
+        response.headers['X-Request-ID'] = g.get('request_id', '')
+        level = logging.DEBUG if request.path in QUIET_PATHS else logging.INFO
+        access_logger.log(level, '%s %s %s', request.method, request.path, response.status_code, extra={
+            'status': response.status_code,
+            'elapsed_ms': round((time.perf_counter() - request.environ['collexo.start']) * 1000, 2),
+            'queries': request_query_count(),
+            'bytes': response.content_length,
+        })
+        return response
@@ -0,0 +1,320 @@
+"""
+Lightweight request tracing with the OpenTelemetry span data model (trace
+and span ids, parent, kind, start/end in Unix nanoseconds, attributes,
+status), propagated through the W3C traceparent header.
+
+Spans cover each request (SERVER), the auth decorators, every controller and
+model method (INTERNAL) and each SQL statement (CLIENT). Enable with
+TRACING / COLLEXO_TRACING = 'memory' (recent traces at /_debug/traces,
+see debug_access_allowed) or 'file' (JSON lines in TRACING_FILE). Inspect a file offline:
+
+    python -m utils.tracing traces/spans.jsonl [--trace <trace_id>] [--last 5]
+"""
+import argparse
+import contextvars
+import functools
+import inspect
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from utils.instrumentation import add_query_hook, redact_query
+from utils.profiler import debug_access_allowed, statement_shape
+
+DEFAULT_SETTINGS = {
+    'TRACING': os.environ.get('COLLEXO_TRACING', ''),  # '', 'memory' or 'file'
+    'TRACING_FILE': os.environ.get(
+        'COLLEXO_TRACING_FILE',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'traces', 'spans.jsonl')
+    ),
+    'TRACING_MAX_TRACES': 200,  # kept by the in-memory exporter
+}
+
+TRACEPARENT = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+_current_span = contextvars.ContextVar('collexo_span', default=None)
+_exporter = None
+
+class Span:
+    __slots__ = ('trace_id', 'span_id', 'parent_span_id', 'name', 'kind',
+                 'start_time_unix_nano', 'end_time_unix_nano', 'attributes', 'status', '_token')
+
+    def __init__(self, name, kind='INTERNAL', parent=None, trace_id=None, parent_span_id=None, attributes=None):
+        self.trace_id = trace_id or (parent.trace_id if parent else '%032x' % random.getrandbits(128))
+        self.span_id = '%016x' % random.getrandbits(64)
+        self.parent_span_id = parent_span_id or (parent.span_id if parent else None)
+        self.name = name
+        self.kind = kind
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano = None
+        self.attributes = attributes or {}
+        self.status = {'code': 'UNSET'}
+        self._token = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_error(self, exc):
+        self.status = {'code': 'ERROR', 'message': f'{type(exc).__name__}: {exc}'}
+
+    def end(self, end_time_unix_nano=None):
+        self.end_time_unix_nano = end_time_unix_nano or time.time_ns()
+        if _exporter is not None:
+            _exporter.export(self)
+
+    @property
+    def traceparent(self):
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+    def to_dict(self):
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_span_id,
+            'name': self.name,
+            'kind': f'SPAN_KIND_{self.kind}',
+            'startTimeUnixNano': self.start_time_unix_nano,
+            'endTimeUnixNano': self.end_time_unix_nano,
+            'attributes': self.attributes,
+            'status': self.status,
+        }
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.set_error(exc)
+        _current_span.reset(self._token)
+        self.end()
+        return False
+
+class _NoopSpan:
+    """Stand-in while tracing is off, so call sites never need to check"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+_NOOP = _NoopSpan()
+
+def span(name, kind='INTERNAL', **attributes):
+    """Context manager for a child of the current span (no-op while tracing is off)"""
+    if _exporter is None:
+        return _NOOP
+    return Span(name, kind, parent=_current_span.get(), attributes=attributes)
+
+def traced(name=None):
+    """Decorator running the function inside a span (named after its qualname by default)"""
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _exporter is None:
+                return fn(*args, **kwargs)
+            with Span(span_name, parent=_current_span.get()):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def traced_class(cls):
+    """Class decorator tracing every static/class method (models and controllers)"""
+    for attr, value in list(vars(cls).items()):
+        if isinstance(value, (staticmethod, classmethod)):
+            fn = value.__func__
+            if inspect.isgeneratorfunction(fn):
+                continue  # a span would close before the generator runs
+            setattr(cls, attr, type(value)(traced(f'{cls.__name__}.{attr}')(fn)))
+    return cls
+
+def _query_span(sql, params, duration, site):
+    """Query hook: a CLIENT span for the statement that just finished, under the current span"""
+    parent = _current_span.get()
+    if _exporter is None or parent is None:
+        return
+    end = time.time_ns()
+    shape = statement_shape(sql)
+    statement = Span(shape.split(' ', 1)[0].upper() or 'SQL', 'CLIENT', parent=parent, attributes={
+        'db.system': 'mysql',
+        'db.statement': shape,
+        'code.function': site[0],
+        'code.filepath': site[1],
+        'code.lineno': site[2],
+    })
+    statement.start_time_unix_nano = end - int(duration * 1e9)
+    statement.end(end)
+
+class InMemoryExporter:
+    """Keeps the spans of the most recent max_traces traces"""
+
+    def __init__(self, max_traces=200):
+        self.max_traces = max_traces
+        self._traces = OrderedDict()
+        self._lock = threading.Lock()
+
+    def export(self, finished):
+        with self._lock:
+            spans = self._traces.get(finished.trace_id)
+            if spans is None:
+                spans = self._traces[finished.trace_id] = []
+                if len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            spans.append(finished.to_dict())
+
+    def get(self, trace_id):
+        with self._lock:
+            return list(self._traces.get(trace_id, ()))
+
+    def recent(self, limit=50):
+        with self._lock:
+            items = list(self._traces.items())[-limit:]
+        return [summarize(trace_id, spans) for trace_id, spans in reversed(items)]
+
+class FileExporter:
+    """Appends one JSON span per line to path"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, 'a', buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, finished):
+        line = json.dumps(finished.to_dict(), default=str) + '\n'
+        with self._lock:
+            self._file.write(line)
+
+def summarize(trace_id, spans):
+    root = next((s for s in spans if not s['parentSpanId'] or s['kind'] == 'SPAN_KIND_SERVER'), spans[0])
+    return {
+        'trace_id': trace_id,
+        'name': root['name'],
+        'duration_ms': round((root['endTimeUnixNano'] - root['startTimeUnixNano']) / 1e6, 2),
+        'spans': len(spans),
+        'sql_statements': sum(1 for s in spans if s['kind'] == 'SPAN_KIND_CLIENT'),
+        'status': root['attributes'].get('http.status_code'),
+    }
+
+def format_trace(spans):
+    """Indented tree of a trace's spans with durations and self time"""
+    by_parent = {}
+    ids = {s['spanId'] for s in spans}
+    for s in sorted(spans, key=lambda s: s['startTimeUnixNano']):
+        parent = s['parentSpanId'] if s['parentSpanId'] in ids else None
+        by_parent.setdefault(parent, []).append(s)
+
+    lines = []
+
+    def walk(node, depth):
+        duration = (node['endTimeUnixNano'] - node['startTimeUnixNano']) / 1e6
+        children = by_parent.get(node['spanId'], ())
+        self_time = max(0.0, duration - sum((c['endTimeUnixNano'] - c['startTimeUnixNano']) / 1e6 for c in children))
+        label = node['attributes']['db.statement'][:120] if node['kind'] == 'SPAN_KIND_CLIENT' else node['name']
+        status = ' !' + node['status'].get('message', 'ERROR') if node['status']['code'] == 'ERROR' else ''
+        lines.append(f"{duration:9.2f}ms {self_time:9.2f}ms  {'  ' * depth}{label}{status}")
+        for child in children:
+            walk(child, depth + 1)
+
+    lines.append(f"{'total':>11} {'self':>11}  span")
+    for root in by_parent.get(None, ()):
+        walk(root, 0)
+    return '\n'.join(lines)
+
+def init_tracing(app):
+    """Trace every request when TRACING is 'memory' or 'file'"""
+    global _exporter
+    for key, value in DEFAULT_SETTINGS.items():
+        app.config.setdefault(key, value)
+    mode = app.config['TRACING']
+    if mode == 'memory':
+        _exporter = InMemoryExporter(app.config['TRACING_MAX_TRACES'])
+    elif mode == 'file':
+        _exporter = FileExporter(app.config['TRACING_FILE'])
+    else:
+        return None
+
+    from flask import abort, g, request
+    add_query_hook(_query_span)
+
+    @app.before_request
+    def start_server_span():
+        if request.path.startswith('/_debug/'):
+            return
+        incoming = TRACEPARENT.match(request.headers.get('traceparent', ''))
+        server = Span(f'{request.method} {request.url_rule.rule if request.url_rule else request.path}', 'SERVER',
+                      trace_id=incoming.group(1) if incoming else None,
+                      parent_span_id=incoming.group(2) if incoming else None,
+                      attributes={'http.method': request.method, 'http.target': redact_query(request.full_path.rstrip('?')),
+                                  'http.route': request.url_rule.rule if request.url_rule else None,
+                                  'code.function': request.endpoint})
+        server.__enter__()
+        g.trace_span = server
+
+    @app.after_request
+    def tag_server_span(response):
+        server = g.get('trace_span')
+        if server is not None:
+            server.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                server.status = {'code': 'ERROR'}
+            response.headers['traceparent'] = server.traceparent
+        return response
+
+    @app.teardown_request
+    def end_server_span(exc):
+        server = g.pop('trace_span', None)
+        if server is not None:
+            server.__exit__(type(exc) if exc else None, exc, None)
+
+    if mode == 'memory':
+        @app.route('/_debug/traces')
+        def recent_traces():
+            if not debug_access_allowed():
+                abort(404)
+            return {'traces': _exporter.recent(request.args.get('limit', 50, type=int))}
+
+        @app.route('/_debug/traces/<trace_id>')
+        def trace_detail(trace_id):
+            spans = _exporter.get(trace_id) if debug_access_allowed() else None
+            if not spans:
+                abort(404)
+            return app.response_class(format_trace(spans), mimetype='text/plain')
+
+    return _exporter
+
+def _load(path):
+    traces = OrderedDict()
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                traces.setdefault(entry['traceId'], []).append(entry)
+    return traces
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Print traces recorded by the file exporter')
+    parser.add_argument('path', nargs='?', default=DEFAULT_SETTINGS['TRACING_FILE'])
+    parser.add_argument('--trace', help='trace id to print')
+    parser.add_argument('--last', type=int, default=5, help='print the most recent N traces')
+    args = parser.parse_args()
+
+    traces = _load(args.path)
+    selected = [args.trace] if args.trace else list(traces)[-args.last:]
+    for trace_id in selected:
+        spans = traces.get(trace_id)
+        if not spans:
+            print(f'trace {trace_id} not found')
+            continue
+        summary = summarize(trace_id, spans)
+        print(f"\ntrace {trace_id}  {summary['name']}  {summary['duration_ms']}ms  "
+              f"{summary['spans']} spans, {summary['sql_statements']} SQL")
+        print(format_trace(spans))
@@ -1,16 +1,29 @@
 import re
 
+# Precompiled patterns shared by auth validation and form response validation
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_PATTERN = re.compile(r'^\+?[0-9][0-9 ()-]{5,18}[0-9]$')
+NUMBER_PATTERN = re.compile(r'^[+-]?(\d+(\.\d*)?|\.\d+)$')
+LETTER_PATTERN = re.compile(r'[a-zA-Z]')
+
 def validate_email(email):
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
+
+def validate_phone(phone):
+    """Validate phone number format"""
+    return PHONE_PATTERN.match(phone) is not None
+
+def validate_number(value):
+    """Validate numeric input"""
+    return NUMBER_PATTERN.match(value) is not None
 
 def validate_password(password):
     """Validate password strength"""
     if len(password) < 6:
         return 'Password must be at least 6 characters long'
     
-    if not re.search(r'[a-zA-Z]', password):
+    if not LETTER_PATTERN.search(password):
         return 'Password must contain at least one letter'
     
     return None
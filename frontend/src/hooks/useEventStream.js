@@ -0,0 +1,52 @@
+import { useEffect, useRef } from "react";
+import axiosClient from "../api/axiosClient";
+
+// Delay before reopening a stream the server refused (503 when a worker is at its stream limit)
+const REOPEN_DELAY_MS = 3000;
+
+// EventSource can't send an Authorization header, so the token goes in the query string.
+// The browser reconnects on its own and resumes from Last-Event-ID. It gives up after an
+// error response, though, so then the stream is reopened here from the last id seen.
+const useEventStream = (path, handlers) => {
+	const handlersRef = useRef(handlers);
+	handlersRef.current = handlers;
+
+	useEffect(() => {
+		const token = localStorage.getItem("token");
+		if (!path || !token) {
+			return undefined;
+		}
+
+		let source = null;
+		let reopenTimer = null;
+		let lastEventId = "";
+
+		const open = () => {
+			const resume = lastEventId
+				? `&last_event_id=${encodeURIComponent(lastEventId)}`
+				: "";
+			source = new EventSource(
+				`${axiosClient.defaults.baseURL}${path}?jwt=${encodeURIComponent(token)}${resume}`
+			);
+			Object.keys(handlersRef.current).forEach((type) =>
+				source.addEventListener(type, (event) => {
+					lastEventId = event.lastEventId;
+					handlersRef.current[type]?.(JSON.parse(event.data), event);
+				})
+			);
+			source.onerror = () => {
+				if (source.readyState === EventSource.CLOSED) {
+					reopenTimer = setTimeout(open, REOPEN_DELAY_MS);
+				}
+			};
+		};
+		open();
+
+		return () => {
+			clearTimeout(reopenTimer);
+			source.close();
+		};
+	}, [path]);
+};
+
+export default useEventStream;
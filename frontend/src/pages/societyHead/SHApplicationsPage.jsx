@@ -3,6 +3,7 @@ import DashboardLayout from "../../components/Layout/DashboardLayout";
 import StatusPill from "../../components/StatusPill";
 import ApplicationDetailModal from "../../components/ApplicationDetailModal";
 import axiosClient from "../../api/axiosClient";
+import useEventStream from "../../hooks/useEventStream";
 
 const SHApplicationsPage = () => {
 	const [applications, setApplications] = useState([]);
@@ -15,17 +16,22 @@ const SHApplicationsPage = () => {
 		fetchData();
 	}, [filter]);
 
+	// Submissions and status changes are pushed in batches instead of polling
+	useEventStream(
+		society ? `/applications/society/${society.society_id}/stream` : null,
+		{
+			applications: applyBatch,
+			resync: () => fetchData(),
+		}
+	);
+
 	const fetchData = async () => {
 		try {
 			const societyRes = await axiosClient.get("/societies/my-society");
 			setSociety(societyRes.data.society);
 
 			if (societyRes.data.society) {
-				const params = filter ? `?status=${filter}` : "";
-				const appsRes = await axiosClient.get(
-					`/applications/society/${societyRes.data.society.society_id}${params}`
-				);
-				setApplications(appsRes.data.applications || []);
+				await fetchApplications(societyRes.data.society.society_id);
 			}
 		} catch (error) {
 			console.error("Error fetching applications:", error);
@@ -34,6 +40,52 @@ const SHApplicationsPage = () => {
 		}
 	};
 
+	const fetchApplications = async (societyId) => {
+		const params = filter ? `?status=${filter}` : "";
+		const appsRes = await axiosClient.get(
+			`/applications/society/${societyId}${params}`
+		);
+		setApplications(appsRes.data.applications || []);
+	};
+
+	// Apply a pushed batch to the list in place; refetch only when it can't be
+	const applyBatch = (batch) => {
+		const entering = batch.status_changes.some(
+			(change) =>
+				filter === change.status &&
+				!applications.some((app) => app.application_id === change.application_id)
+		);
+		if (batch.truncated || entering) {
+			fetchApplications(batch.society_id).catch((error) =>
+				console.error("Error fetching applications:", error)
+			);
+			return;
+		}
+
+		setApplications((current) => {
+			const changes = new Map(
+				batch.status_changes.map((change) => [change.application_id, change.status])
+			);
+			const deleted = new Set(batch.deleted);
+			const known = new Set(current.map((app) => app.application_id));
+			const submitted = batch.submitted.filter(
+				(app) =>
+					!known.has(app.application_id) &&
+					!deleted.has(app.application_id) &&
+					(!filter || filter === app.status)
+			);
+			const updated = current
+				.map((app) =>
+					changes.has(app.application_id)
+						? { ...app, status: changes.get(app.application_id) }
+						: app
+				)
+				.filter((app) => !deleted.has(app.application_id))
+				.filter((app) => !filter || app.status === filter);
+			return [...submitted.reverse(), ...updated];
+		});
+	};
+
 	const updateStatus = async (appId, newStatus) => {
 		try {
 			await axiosClient.put(`/applications/${appId}/status`, {
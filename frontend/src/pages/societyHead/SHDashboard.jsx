@@ -2,6 +2,7 @@ import { useState, useEffect } from "react";
 import DashboardLayout from "../../components/Layout/DashboardLayout";
 import StatCard from "../../components/StatCard";
 import axiosClient from "../../api/axiosClient";
+import useEventStream from "../../hooks/useEventStream";
 
 const SHDashboard = () => {
 	const [society, setSociety] = useState(null);
@@ -14,6 +15,15 @@ const SHDashboard = () => {
 		fetchData();
 	}, []);
 
+	// Counters are pushed at most about once a second while applications come in
+	useEventStream(
+		society ? `/applications/society/${society.society_id}/stream` : null,
+		{
+			applications: (batch) => setStats(batch.statistics),
+			resync: () => fetchData(),
+		}
+	);
+
 	const fetchData = async () => {
 		try {
 			const societyRes = await axiosClient.get("/societies/my-society");
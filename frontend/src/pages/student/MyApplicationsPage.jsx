@@ -2,6 +2,7 @@ import { useState, useEffect } from "react";
 import DashboardLayout from "../../components/Layout/DashboardLayout";
 import StatusPill from "../../components/StatusPill";
 import axiosClient from "../../api/axiosClient";
+import useEventStream from "../../hooks/useEventStream";
 
 const MyApplicationsPage = () => {
 	const [applications, setApplications] = useState([]);
@@ -11,6 +12,19 @@ const MyApplicationsPage = () => {
 		fetchApplications();
 	}, []);
 
+	// Status changes are pushed as they happen; "resync" means events were missed
+	useEventStream("/applications/my-applications/stream", {
+		status: (change) =>
+			setApplications((current) =>
+				current.map((app) =>
+					app.application_id === change.application_id
+						? { ...app, status: change.status }
+						: app
+				)
+			),
+		resync: () => fetchApplications(),
+	});
+
 	const fetchApplications = async () => {
 		try {
 			const response = await axiosClient.get("/applications/my-applications");